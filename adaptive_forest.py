@@ -0,0 +1,95 @@
+# Adaptive Forest Sizing - Crop Recommendation System
+# Forest ko warm_start ke saath step-by-step badhate hain, har step par OOB accuracy aur
+# single-row predict_proba latency note karte hain. Gain chhota ho gaya ya latency budget
+# cross hua to ruk jaate hain - har extra tree apps ki har prediction ko slow karta hai.
+
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+# Latency itne sample rows par measure hoti hai (median)
+LATENCY_ROWS = 30
+
+
+def _single_row_latency_ms(model, X_rows):
+    """Ek-ek row par predict_proba ki median latency (ms)"""
+    timings = []
+    for i in range(len(X_rows)):
+        start = time.perf_counter()
+        model.predict_proba(X_rows[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def fit_adaptive_forest(X_train, y_train, step=10, max_estimators=300, min_gain=0.0005,
+                        latency_budget_ms=None, random_state=42, n_jobs=-1):
+    """
+    RandomForest ko `step` trees ke increments mein train karta hai
+
+    Rukne ki conditions:
+      - OOB accuracy ka gain < min_gain ('saturated')
+      - single-row latency > latency_budget_ms ('latency_budget') - pichla size rakha jata hai
+      - max_estimators pahunch gaye ('max_estimators')
+    Returns (model, sizing) - sizing mein chosen size, stop reason aur poora curve hai
+    """
+    X_train = np.asarray(X_train)
+    y_train = np.asarray(y_train)
+    latency_rows = X_train[:LATENCY_ROWS]
+
+    model = RandomForestClassifier(n_estimators=step, warm_start=True, oob_score=True,
+                                   random_state=random_state, n_jobs=n_jobs)
+    curve = []
+    stop_reason = 'max_estimators'
+    # Pichle size ke OOB attributes - latency stop par forest kaata jaye to wahi wapas lagte hain
+    previous_oob = None
+
+    while True:
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        point = {
+            'n_estimators': model.n_estimators,
+            'oob_accuracy': float(model.oob_score_),
+            'single_row_ms': _single_row_latency_ms(model, latency_rows),
+            'increment_fit_s': fit_time,
+        }
+        curve.append(point)
+
+        if latency_budget_ms is not None and point['single_row_ms'] > latency_budget_ms and len(curve) > 1:
+            # Budget cross - aakhri increment hata do
+            keep = curve[-2]['n_estimators']
+            model.estimators_ = model.estimators_[:keep]
+            model.n_estimators = keep
+            model.oob_score_, model.oob_decision_function_ = previous_oob
+            stop_reason = 'latency_budget'
+            break
+        if len(curve) > 1 and point['oob_accuracy'] - curve[-2]['oob_accuracy'] < min_gain:
+            stop_reason = 'saturated'
+            break
+        if model.n_estimators + step > max_estimators:
+            break
+        previous_oob = (model.oob_score_, model.oob_decision_function_)
+        model.n_estimators += step
+
+    model.set_params(warm_start=False)
+    chosen = next(point for point in curve if point['n_estimators'] == model.n_estimators)
+    sizing = {
+        'n_estimators': model.n_estimators,
+        'oob_accuracy': chosen['oob_accuracy'],
+        'single_row_ms': chosen['single_row_ms'],
+        'stop_reason': stop_reason,
+        'settings': {'step': step, 'max_estimators': max_estimators, 'min_gain': min_gain,
+                     'latency_budget_ms': latency_budget_ms},
+        'curve': curve,
+    }
+    return model, sizing
+
+
+def print_sizing_curve(sizing):
+    """Sizing curve ka chhota table"""
+    print(f"{'trees':>6} {'OOB acc':>9} {'1-row ms':>9}")
+    for point in sizing['curve']:
+        marker = '  <- chosen' if point['n_estimators'] == sizing['n_estimators'] else ''
+        print(f"{point['n_estimators']:>6} {point['oob_accuracy']:9.4f} {point['single_row_ms']:9.2f}{marker}")
+    print(f"Stop reason: {sizing['stop_reason']}")
@@ -0,0 +1,496 @@
+# Bulk Scoring CLI - Crop Recommendation System
+# State-level soil health card exports (lakhon rows, CSV ya JSONL) ke liye batch entry point:
+#   python bulk_score.py cards.csv recommendations.csv --top-k 3 --workers 4
+# Input fixed-size chunks mein stream hota hai, har chunk validate + features + model score (process pool
+# mein), aur top-k crops yield/duration ke saath output mein append. Memory input size se independent hai -
+# ek waqt mein sirf kuch chunks (workers ke hisaab se) memory mein rehte hain.
+# Har likhe gaye chunk ke baad checkpoint (input byte offset + output size) - --resume wahi se shuru karta hai.
+# --record-store ke saath lat/lon wale model-scored rows field_index ke store mein record hote hain;
+# --reuse-radius par store mein pehle se maujood padosi near-duplicate plot ka result use hota hai aur model skip
+# (reuse wale rows record nahi hote - har record model ka apna answer hai).
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import multiprocessing
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from model_artifact import load_model_components, DEFAULT_ARTIFACT_DIR
+from feature_engineering import FIELD_COLUMNS, build_features, validate_fields
+from field_index import FieldRecordStore, DEFAULT_REUSE_RADIUS_KM
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_TOP_K = 3
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+# JSONL ki jo line parse na ho uska error message is column mein aata hai (output mein invalid row banti hai)
+PARSE_ERROR_COLUMN = '_parse_error'
+
+# Fork se pehle parent isme model rakhta hai (worker_pool jaisa) - workers copy-on-write share karte hain
+_WORKER_MODEL = None
+
+
+def detect_format(path, fmt=None):
+    """'csv' ya 'jsonl' - explicit fmt, warna file extension se"""
+    fmt = fmt or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported format '{fmt}' (use csv or jsonl)")
+    return fmt
+
+
+def iter_chunks(path, fmt, chunk_size=DEFAULT_CHUNK_SIZE, start_offset=None):
+    """
+    Input ko chunk_size lines ke DataFrames mein padhta hai - yields (frame, end byte offset)
+    Line-based chunking: byte offset checkpoint mein jata hai, resume seedha seek karta hai.
+    CSV mein quoted newlines support nahi (soil card exports plain numeric rows hain).
+    JSONL ki kharab line job nahi rokti - uski jagah PARSE_ERROR_COLUMN wali row aati hai
+    """
+    with open(path, 'rb') as f:
+        header = f.readline() if fmt == 'csv' else b''
+        if start_offset is not None:
+            f.seek(start_offset)
+        while True:
+            raw = list(itertools.islice(f, chunk_size))
+            if not raw:
+                return
+            offset = f.tell()
+            lines = [line for line in raw if line.strip()]
+            if not lines:
+                continue
+            if fmt == 'csv':
+                frame = pd.read_csv(io.BytesIO(header + b''.join(lines)), dtype=str, keep_default_na=False)
+            else:
+                frame = pd.DataFrame([_parse_json_line(line) for line in lines], dtype=object)
+            yield frame, offset
+
+
+def _parse_json_line(line):
+    """Ek JSONL line -> record dict; invalid JSON ya non-object par sirf PARSE_ERROR_COLUMN"""
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        return {PARSE_ERROR_COLUMN: f"Invalid JSON: {error}"}
+    if not isinstance(record, dict):
+        return {PARSE_ERROR_COLUMN: "Invalid JSON: expected an object"}
+    return record
+
+
+def read_fields(frame):
+    """
+    Chunk DataFrame -> (n x 8) float array; non-numeric / missing values NaN (validate_fields pakad leta hai)
+    Column hi na ho (CSV header mein) to ValueError - JSONL frames pehle hi saare columns par reindex hote hain
+    """
+    missing = [column for column in FIELD_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    return np.column_stack([pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float64)
+                            for column in FIELD_COLUMNS])
+
+
+def read_coordinates(frame, latitude_column, longitude_column):
+    """(latitudes, longitudes) - missing, non-numeric ya range ke bahar values NaN (wo rows record nahi hote)"""
+    for column in (latitude_column, longitude_column):
+        if column not in frame.columns:
+            raise ValueError(f"Input is missing column: {column}")
+    latitudes = np.array(pd.to_numeric(frame[latitude_column], errors='coerce'), dtype=np.float64)
+    longitudes = np.array(pd.to_numeric(frame[longitude_column], errors='coerce'), dtype=np.float64)
+    outside = ~((np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180))
+    latitudes[outside] = longitudes[outside] = np.nan
+    return latitudes, longitudes
+
+
+def read_ids(frame, id_column):
+    """--id-column ki values list mein (missing = None); column na ho to ValueError (read_coordinates jaisa)"""
+    if id_column not in frame.columns:
+        raise ValueError(f"Input is missing column: {id_column}")
+    ids = frame[id_column].astype(object)
+    return ids.where(ids.notna(), None).tolist()
+
+
+def _init_worker(artifact_dir):
+    """Spawn workers (fork na ho) apna model khud load karte hain"""
+    global _WORKER_MODEL
+    _WORKER_MODEL = load_model_components(artifact_dir)['model']
+    _WORKER_MODEL.n_jobs = 1
+
+
+def score_chunk(values, top_k):
+    """
+    (n x 8) valid fields -> (top class indices, confidences) - dono (n x top_k)
+    recommend_crop jaisa order: confidence descending, barabar ho to class order
+    """
+    if len(values) == 0:
+        return np.empty((0, top_k), dtype=np.intp), np.empty((0, top_k))
+    proba = _WORKER_MODEL.predict_proba(build_features(values))
+    top_idx = np.argsort(-proba, axis=1, kind='stable')[:, :top_k]
+    return top_idx, np.take_along_axis(proba, top_idx, axis=1)
+
+
+class ChunkScorer:
+    """
+    Chunks ko process pool mein score karta hai, order bana ke; n_workers=0 = isi process mein
+    Pool.imap poora input pehle hi padh leta - yahan max_pending chunks se zyada kabhi in flight nahi
+    """
+
+    def __init__(self, artifact_dir=DEFAULT_ARTIFACT_DIR, n_workers=0):
+        global _WORKER_MODEL
+        self.n_workers = n_workers
+        self._pool = None
+        if n_workers and 'fork' in multiprocessing.get_all_start_methods():
+            _WORKER_MODEL = load_model_components(artifact_dir)['model']
+            _WORKER_MODEL.n_jobs = 1
+            self._pool = multiprocessing.get_context('fork').Pool(n_workers)
+        elif n_workers:
+            self._pool = multiprocessing.get_context('spawn').Pool(n_workers, initializer=_init_worker,
+                                                                  initargs=(artifact_dir,))
+        else:
+            _init_worker(artifact_dir)
+
+    def map(self, jobs, top_k):
+        """jobs: (valid values, context) iterator -> (context, top_idx, confidence) input order mein"""
+        if self._pool is None:
+            for values, context in jobs:
+                yield (context, *score_chunk(values, top_k))
+            return
+        pending = deque()
+        max_pending = 2 * self.n_workers
+        for values, context in jobs:
+            pending.append((context, self._pool.apply_async(score_chunk, (values, top_k))))
+            if len(pending) >= max_pending:
+                context, result = pending.popleft()
+                yield (context, *result.get())
+        while pending:
+            context, result = pending.popleft()
+            yield (context, *result.get())
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+
+
+def format_chunk(fields, errors, start_row, top_idx, confidence, crop_index, top_k, fmt, id_values=None):
+    """Ek chunk ke output records - invalid rows ke saath error message, crops khali"""
+    valid = errors == ''
+    n_rows = len(fields)
+    names = np.full((n_rows, top_k), '', dtype=object)
+    conf = np.full((n_rows, top_k), np.nan)
+    yields = np.full((n_rows, top_k), np.nan)
+    durations = np.full((n_rows, top_k), np.nan)
+    if len(top_idx):
+        info = crop_index.take(top_idx)
+        names[valid] = crop_index.crop_names[top_idx]
+        conf[valid] = confidence
+        yields[valid] = info['expected_yield']
+        durations[valid] = info['crop_duration']
+    season = np.zeros(n_rows, dtype=np.int64)
+    soil_type = np.zeros(n_rows, dtype=np.int64)
+    if valid.any():
+        features = build_features(fields[valid])
+        season[valid], soil_type[valid] = features[:, 8], features[:, 9]
+
+    rows = np.arange(start_row, start_row + n_rows)
+    if fmt == 'csv':
+        columns = {'row': rows}
+        if id_values is not None:
+            columns['id'] = pd.Series(id_values, dtype=object)
+        columns.update({'status': np.where(valid, 'ok', errors), 'season': season, 'soil_type': soil_type})
+        for j in range(top_k):
+            columns[f'crop_{j + 1}'] = names[:, j]
+            columns[f'confidence_{j + 1}'] = conf[:, j].round(4)
+            columns[f'expected_yield_{j + 1}'] = yields[:, j]
+            columns[f'crop_duration_{j + 1}'] = durations[:, j]
+        return pd.DataFrame(columns)
+
+    records = []
+    for i in range(n_rows):
+        record = {'row': int(rows[i])}
+        if id_values is not None:
+            record['id'] = id_values[i]
+        if valid[i]:
+            record.update(status='ok', season=int(season[i]), soil_type=int(soil_type[i]), recommendations=[{
+                'crop': str(names[i, j]),
+                'confidence': round(float(conf[i, j]), 4),
+                'suitability_score': round(float(conf[i, j]) * 100, 2),
+                'expected_yield': float(yields[i, j]),
+                'crop_duration': float(durations[i, j]),
+            } for j in range(top_k)])
+        else:
+            record.update(status=str(errors[i]), recommendations=[])
+        records.append(record)
+    return records
+
+
+def _write_checkpoint(path, state):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def score_file(input_path, output_path, top_k=DEFAULT_TOP_K, chunk_size=DEFAULT_CHUNK_SIZE, n_workers=0,
+               input_format=None, output_format=None, id_column=None, resume=False,
+               artifact_dir=DEFAULT_ARTIFACT_DIR, checkpoint_path=None, max_chunks=None, progress=None,
+               latitude_column=None, longitude_column=None, record_store=None, reuse_radius_km=0):
+    """
+    Poori file score karta hai; returns summary dict (rows, invalid, reused, chunks, seconds, resumed_from)
+    resume=True aur matching checkpoint ho to wahi se; warna output shuru se likha jata hai
+    max_chunks: itne chunks ke baad ruk jao (interruption simulate karne ke liye)
+    record_store: field_index store ka path - lat/lon wale model-scored rows wahan record (source = file#row, resume
+    par dobara nahi); reuse_radius_km > 0: job shuru hone tak ke records mein se padosi near-duplicate ka result
+    """
+    # chunk_size 0 par islice kuch nahi deta - job 'successfully' khali output likh ke checkpoint mita deta
+    if chunk_size < 1:
+        raise ValueError(f"--chunk-size must be at least 1, got {chunk_size}")
+    if (n_workers or 0) < 0:
+        raise ValueError(f"--workers must be 0 or more, got {n_workers}")
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    checkpoint_path = checkpoint_path or output_path + CHECKPOINT_SUFFIX
+    components = load_model_components(artifact_dir)
+    crop_index = components['crop_index']
+    n_classes = len(crop_index.crop_names)
+    if not 1 <= top_k <= n_classes:
+        raise ValueError(f"--top-k must be between 1 and {n_classes}")
+    job = {'input': os.path.abspath(input_path), 'input_size': os.path.getsize(input_path),
+           'model_version': components.version, 'top_k': top_k, 'output_format': output_format,
+           'id_column': id_column, 'reuse_radius_km': reuse_radius_km}
+    if record_store is not None and not (latitude_column and longitude_column):
+        raise ValueError("--record-store needs --latitude-column and --longitude-column")
+    if reuse_radius_km and record_store is None:
+        raise ValueError("--reuse-radius needs --record-store")
+    records = FieldRecordStore(record_store) if record_store is not None else None
+
+    state = None
+    if resume and os.path.exists(checkpoint_path) and os.path.exists(output_path):
+        with open(checkpoint_path) as f:
+            state = json.load(f)
+        if {key: state.get(key) for key in job} != job:
+            raise ValueError(f"Checkpoint {checkpoint_path} was written for a different input, model or options")
+    if state is None:
+        # Reuse sirf job shuru hone tak ke records se - resume par bhi wahi snapshot
+        state = dict(job, input_offset=None, output_bytes=0, rows=0, invalid=0, reused=0, chunks=0,
+                     reuse_max_id=records.last_id if records is not None else 0)
+    resumed_from = state['rows']
+
+    out = open(output_path, 'r+b' if state['output_bytes'] else 'wb')
+    # Aakhri checkpoint ke baad ka adhoora likha hua hissa hata do
+    out.truncate(state['output_bytes'])
+    out.seek(state['output_bytes'])
+
+    scorer = ChunkScorer(artifact_dir, n_workers)
+    start = time.perf_counter()
+
+    record_columns = FIELD_COLUMNS + [column for column in (id_column, latitude_column, longitude_column) if column]
+
+    def jobs():
+        row = state['rows']
+        chunks = iter_chunks(input_path, input_format, chunk_size, state['input_offset'])
+        for frame, offset in itertools.islice(chunks, max_chunks):
+            parse_errors = frame.pop(PARSE_ERROR_COLUMN) if PARSE_ERROR_COLUMN in frame.columns else None
+            if input_format == 'jsonl':
+                # JSONL mein har record ki apni keys - gayab key sirf us row ki NaN (invalid row), taaki result
+                # chunk boundaries par depend na kare. Hard column check sirf CSV header ka
+                frame = frame.reindex(columns=record_columns)
+            fields = read_fields(frame)
+            errors = validate_fields(fields)
+            if parse_errors is not None:
+                failed = parse_errors.notna().to_numpy()
+                errors = errors.astype(object)
+                errors[failed] = parse_errors[failed].to_numpy()
+            ids = read_ids(frame, id_column) if id_column else None
+            valid = errors == ''
+            coordinates = reused = None
+            if records is not None:
+                coordinates = read_coordinates(frame, latitude_column, longitude_column)
+            if reuse_radius_km:
+                located = np.flatnonzero(valid & np.isfinite(coordinates[0]))
+                matched, crops, confidences, _ = records.find_reusable(
+                    components.version, coordinates[0][located], coordinates[1][located], fields[located], top_k,
+                    reuse_radius_km, max_id=state['reuse_max_id'])
+                reused = (located[matched], crops, confidences)
+                valid[reused[0]] = False
+            yield fields[valid], (fields, errors, ids, row, offset, coordinates, valid, reused)
+            row += len(frame)
+
+    try:
+        for (fields, errors, ids, row, offset, coordinates, scored, reused), top_idx, confidence in \
+                scorer.map(jobs(), top_k):
+            if reused is not None:
+                # Model wale aur reuse wale rows ko valid rows ke order mein jodo
+                valid = errors == ''
+                merged_idx = np.empty((len(fields), top_k), dtype=np.intp)
+                merged_conf = np.empty((len(fields), top_k))
+                merged_idx[scored], merged_conf[scored] = top_idx, confidence
+                merged_idx[reused[0]], merged_conf[reused[0]] = reused[1], reused[2]
+                top_idx, confidence = merged_idx[valid], merged_conf[valid]
+            formatted = format_chunk(fields, errors, row, top_idx, confidence, crop_index, top_k,
+                                     output_format, ids)
+            if output_format == 'csv':
+                out.write(formatted.to_csv(index=False, header=state['output_bytes'] == 0).encode())
+            else:
+                out.write(''.join(json.dumps(record) + '\n' for record in formatted).encode())
+            out.flush()
+            os.fsync(out.fileno())
+            if records is not None:
+                # Sirf model se score hue rows record - reuse wale copies record hon to agla job unhe phir reuse
+                # karke result ko har baar ek radius/step aage khiskata
+                valid = np.flatnonzero(errors == '')
+                located = np.isfinite(coordinates[0][valid]) & scored[valid]
+                rows = valid[located]
+                records.add(components.version, coordinates[0][rows], coordinates[1][rows], fields[rows],
+                            top_idx[located], confidence[located],
+                            sources=[f"{components.version}:{job['input']}#{i}" for i in (rows + row).tolist()])
+            state.update(input_offset=offset, output_bytes=out.tell(), rows=row + len(fields),
+                         invalid=state['invalid'] + int((errors != '').sum()),
+                         reused=state['reused'] + (len(reused[0]) if reused is not None else 0),
+                         chunks=state['chunks'] + 1)
+            _write_checkpoint(checkpoint_path, state)
+            if progress is not None:
+                progress(state)
+    finally:
+        scorer.close()
+        out.close()
+
+    finished = max_chunks is None or state['input_offset'] is None or state['input_offset'] >= job['input_size']
+    if finished and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return {'rows': state['rows'], 'invalid': state['invalid'], 'reused': state['reused'], 'chunks': state['chunks'],
+            'seconds': time.perf_counter() - start, 'resumed_from': resumed_from, 'finished': finished}
+
+
+def write_sample_input(path, n_rows, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Benchmark ke liye soil-card jaisi CSV - thode invalid rows ke saath, chunks mein likhi"""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w') as f:
+        f.write(','.join(['card_id'] + FIELD_COLUMNS) + '\n')
+        for start in range(0, n_rows, chunk_size):
+            n = min(chunk_size, n_rows - start)
+            frame = pd.DataFrame({
+                'card_id': [f'SHC{i:09d}' for i in range(start, start + n)],
+                'soil_ph': rng.uniform(4, 9, n).round(1), 'temperature': rng.integers(5, 46, n),
+                'rainfall': rng.integers(100, 3001, n), 'nitrogen': rng.integers(0, 301, n),
+                'phosphorus': rng.integers(0, 201, n), 'potassium': rng.integers(0, 251, n),
+                'humidity': rng.integers(30, 101, n), 'month': rng.integers(1, 13, n),
+            })
+            frame.loc[rng.random(n) < 0.001, 'month'] = 13
+            f.write(frame.to_csv(index=False, header=False))
+
+
+def _peak_rss_run(queue, input_path, output_path, chunk_size, artifact_dir):
+    import resource
+    score_file(input_path, output_path, chunk_size=chunk_size, artifact_dir=artifact_dir, id_column='card_id')
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def benchmark(n_rows=1_000_000, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Throughput (workers ke saath), peak memory chhoti vs badi file, aur resume ka byte-for-byte check"""
+    import tempfile
+    import subprocess
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        big = os.path.join(tmp_dir, 'cards.csv')
+        small = os.path.join(tmp_dir, 'cards_small.csv')
+        write_sample_input(big, n_rows)
+        write_sample_input(small, n_rows // 10)
+        print(f"Input: {n_rows:,} rows ({os.path.getsize(big) / 1e6:.0f} MB)")
+
+        # CLI jaisa hi - alag process mein
+        def run(input_path, output_path, n_workers, *extra):
+            command = [sys.executable, os.path.abspath(__file__), input_path, output_path, '--workers', str(n_workers),
+                       '--chunk-size', str(chunk_size), '--artifact-dir', os.path.abspath(DEFAULT_ARTIFACT_DIR),
+                       '--id-column', 'card_id', '--quiet', *extra]
+            start = time.perf_counter()
+            subprocess.run(command, check=True)
+            return time.perf_counter() - start
+
+        for n_workers in sorted({0, 1, 2, os.cpu_count()}):
+            elapsed = run(big, os.path.join(tmp_dir, f'out_{n_workers}.csv'), n_workers)
+            print(f"workers={n_workers}: {n_rows / elapsed:,.0f} rows/s ({elapsed:.1f}s)")
+
+        # Peak RSS - har size ka run ek fresh process mein (workers=0, sab kuch isi process mein)
+        context = multiprocessing.get_context('spawn')
+        for input_path, n in ((small, n_rows // 10), (big, n_rows)):
+            queue = context.Queue()
+            process = context.Process(target=_peak_rss_run, args=(queue, input_path, os.path.join(tmp_dir, 'rss.csv'),
+                                                                  chunk_size, os.path.abspath(DEFAULT_ARTIFACT_DIR)))
+            process.start()
+            peak = queue.get()
+            process.join()
+            print(f"Peak RSS scoring {n:,} rows: {peak / 1024:.0f} MB")
+
+        # Interruption + resume == ek hi baar mein poora run
+        partial = os.path.join(tmp_dir, 'resumed.csv')
+        run(big, partial, 0, '--max-chunks', '3')
+        with open(partial + CHECKPOINT_SUFFIX) as f:
+            print(f"Interrupted after {json.load(f)['rows']:,} rows; resuming")
+        with open(partial, 'ab') as f:
+            f.write(b'partially written chunk')   # crash beech mein likhte waqt
+        run(big, partial, 0, '--resume')
+        with open(partial, 'rb') as f, open(os.path.join(tmp_dir, 'out_0.csv'), 'rb') as g:
+            assert f.read() == g.read()
+        print("✅ Resumed output is byte-identical to an uninterrupted run")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score soil health card exports (CSV/JSONL) with top-k crops")
+    parser.add_argument('input', nargs='?', help="Input .csv or .jsonl (columns: " + ', '.join(FIELD_COLUMNS) + ")")
+    parser.add_argument('output', nargs='?', help="Output .csv or .jsonl")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Scoring processes (0 = score in this process)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--id-column', help="Input column copied to the output (e.g. card number)")
+    parser.add_argument('--resume', action='store_true', help="Continue from the checkpoint of an interrupted run")
+    parser.add_argument('--latitude-column', help="Input column with the field latitude")
+    parser.add_argument('--longitude-column', help="Input column with the field longitude")
+    parser.add_argument('--record-store', metavar='PATH',
+                        help="Record located results in this field record store (e.g. prediction_cache.sqlite3)")
+    parser.add_argument('--reuse-radius', type=float, default=0, metavar='KM',
+                        help="Reuse stored results of near-duplicate fields within KM (e.g. "
+                             f"{DEFAULT_REUSE_RADIUS_KM}) instead of running the model")
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR)
+    parser.add_argument('--max-chunks', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Throughput, peak memory and resume check on a generated 1M-row file")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+    if not args.input or not args.output:
+        parser.error("input and output are required")
+
+    def progress(state):
+        print(f"\r{state['rows']:,} rows scored ({state['invalid']:,} invalid)", end='', file=sys.stderr)
+
+    try:
+        summary = score_file(args.input, args.output, args.top_k, args.chunk_size, args.workers, args.input_format,
+                             args.output_format, args.id_column, args.resume, args.artifact_dir,
+                             max_chunks=args.max_chunks, progress=None if args.quiet else progress,
+                             latitude_column=args.latitude_column, longitude_column=args.longitude_column,
+                             record_store=args.record_store, reuse_radius_km=args.reuse_radius)
+    except (ValueError, FileNotFoundError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(2)
+    except KeyboardInterrupt:
+        print("\nInterrupted - run again with --resume to continue", file=sys.stderr)
+        sys.exit(130)
+    if not args.quiet:
+        reused = f", {summary['reused']:,} reused from nearby fields" if args.reuse_radius else ''
+        print(f"\n✅ {summary['rows']:,} rows ({summary['invalid']:,} invalid{reused}) in {summary['seconds']:.1f}s "
+              f"-> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
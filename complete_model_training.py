@@ -1,16 +1,21 @@
 # Complete Model Training Script - Crop Recommendation System
 # Ye complete script hai jo model train karta hai from scratch!
+#
+# Pipeline stages: database -> synthetic data -> split -> scaler -> candidate models -> final model -> artifact
+# Har stage ka output .pipeline_cache/ mein cache hota hai (key = hash of stage code + helper modules + params
+# + upstream keys), isliye koi setting ya helper badalne par sirf wo stage aur uske baad wale stages dobara chalte hain.
 
 import pandas as pd
 import numpy as np
+import os
 import pickle
-import random
 import warnings
 from datetime import datetime
 
 # Machine Learning Libraries
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.svm import SVC
@@ -18,6 +23,21 @@ from sklearn.naive_bayes import GaussianNB
 from sklearn.linear_model import LogisticRegression
 import joblib
 
+import synthetic_data
+import shard_dataset
+import model_comparison
+import kernel_approx
+import adaptive_forest
+import sharded_forest
+from synthetic_data import generate_compact_data, decode_labels, FEATURE_NAMES
+from shard_dataset import write_shards, ShardedDataset, MANIFEST_FILE
+from model_comparison import compare_models, summarize_results
+from pipeline_cache import StageCache, DEFAULT_CACHE_DIR
+from kernel_approx import ApproxKernelClassifier
+from model_artifact import save_artifact, DEFAULT_ARTIFACT_DIR
+from adaptive_forest import fit_adaptive_forest, print_sizing_curve
+from sharded_forest import fit_sharded_forest
+
 # Visualization libraries
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -25,13 +45,47 @@ import seaborn as sns
 # Warning se pareshani mat lena bhai
 warnings.filterwarnings('ignore')
 
-print("🌾 Crop Recommendation Model Training Script 🌾")
-print("="*60)
+# PIPELINE SETTINGS
+# =================
+
+# Generation settings - bade regional retrains ke liye SAMPLES_PER_CROP aur DATA_WORKERS badha do
+# Output DATA_WORKERS se independent hai (same seed + chunk size = same data, bit-for-bit)
+SAMPLES_PER_CROP = 300
+DATA_WORKERS = 1
+DATA_CHUNK_SIZE = 10000
+SEED = 42
+
+# Streaming mode - STREAMING_DIR set karo to data RAM ki jagah disk par .npy shards mein likha jayega
+# (har shard = DATA_CHUNK_SIZE rows per crop, memory peak ek shard jitna)
+STREAMING_DIR = None
+
+# Saare models parallel processes mein train hote hain - har model ka apna time budget
+# Budget cross hua to wo model cancel ho jata hai aur comparison se bahar
+MODEL_WORKERS = None          # None = min(models, CPU cores)
+MODEL_TIME_BUDGET = 600       # seconds per model
+
+# Final model - 'Random Forest', koi aur unscaled candidate ka naam, ya 'best' (Step 4 ka winner)
+# Apps raw (unscaled) features bhejte hain, isliye 'best' sirf unscaled candidates mein se chunta hai
+# aur SCALED_MODELS ka naam dene par training shuru hone se pehle hi ValueError
+FINAL_MODEL = 'Random Forest'
+
+# Adaptive forest sizing (sirf Random Forest ke liye) - None = fixed 100 trees
+# Set karo to forest step-by-step badhta hai jab tak OOB gain < min_gain ya latency budget cross na ho
+ADAPTIVE_FOREST = None   # e.g. {'step': 10, 'max_estimators': 300, 'min_gain': 0.0005, 'latency_budget_ms': 20}
+
+# Sharded forest training (sirf Random Forest ke liye) - None = ek process mein normal fit
+# Number do to utne worker processes disjoint shards par sub-forests train karke merge karte hain
+FOREST_SHARDS = None
 
-# STEP 1: CROP DATABASE CREATION
-# =============================
+# Stage cache - None karo to har run sab kuch dobara compute karega
+PIPELINE_CACHE_DIR = DEFAULT_CACHE_DIR
 
-print("\nSTEP 1: Creating Crop Database...")
+MODEL_PATH = 'crop_recommendation_model.pkl'
+# Lazily loadable artifact directory (manifest + crop table + model) - apps isko pickle se pehle dhoondhte hain
+ARTIFACT_DIR = DEFAULT_ARTIFACT_DIR
+
+# Feature names define kar diye hain
+feature_names = list(FEATURE_NAMES)
 
 # Crop database - Indian agriculture ke liye specially designed
 crop_data = {
@@ -84,254 +138,394 @@ crop_data = {
     'crop_duration': [120, 120, 120, 115, 365, 110, 100, 180, 110, 120, 120, 180, 110, 90, 120, 110, 85, 120, 90, 120]
 }
 
-# DataFrame banate hain
-crop_df = pd.DataFrame(crop_data)
-
-print(f"✅ Crop database created with {len(crop_df)} crops")
 
-# STEP 2: SYNTHETIC DATA GENERATION
-# =================================
-
-print("\nSTEP 2: Generating Synthetic Training Data...")
+# Ye models compare honge - SVM, Approx Kernel SVM aur Logistic Regression ko scaled features milte hain
+SCALED_MODELS = ['SVM', 'Approx Kernel SVM', 'Logistic Regression']
+
+
+def build_candidate_models():
+    """Multiple models test kar rahe hain - best wala choose karenge"""
+    return {
+        'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'Gradient Boosting': GradientBoostingClassifier(random_state=42),
+        # Histogram-binned boosting - features 255 bins mein, multi-threaded (OpenMP),
+        # validation slice par early stopping. Bade SAMPLES_PER_CROP par exact GB se kaafi tez
+        'Hist Gradient Boosting': HistGradientBoostingClassifier(
+            max_iter=200, early_stopping=True, validation_fraction=0.1,
+            n_iter_no_change=10, random_state=42),
+        'SVM': SVC(random_state=42, probability=True),  # probability=True for predict_proba
+        # Nystroem features + mini-batch linear SVM + calibrated predict_proba - million rows par bhi chalta hai
+        'Approx Kernel SVM': ApproxKernelClassifier(kernel_map='nystroem', random_state=42),
+        'Naive Bayes': GaussianNB(),
+        'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000)
+    }
 
-# Random seed set kar diya - same results ke liye
-np.random.seed(42)
-random.seed(42)
 
-def generate_synthetic_data(crop_df, samples_per_crop=300):
+def check_final_model(final_model):
     """
-    Har crop ke liye realistic synthetic data banata hai
-    Thoda noise add kar dete hain taaki real world conditions mimic ho
+    FINAL_MODEL setting validate karta hai - 'best' ya koi unscaled candidate
+    Scaled models ka scaler apps mein apply nahi hota (wo raw features bhejte hain), isliye ValueError
     """
-    data = []
-    labels = []
-    
-    for idx, crop in crop_df.iterrows():
-        for _ in range(samples_per_crop):
-            # Parameters generate kar rahe hain suitable ranges ke andar with some noise
-            
-            # Soil pH - crop ke around normal distribution
-            soil_ph = np.random.normal((crop['soil_ph_min'] + crop['soil_ph_max'])/2, 0.3)
-            soil_ph = np.clip(soil_ph, crop['soil_ph_min']-0.5, crop['soil_ph_max']+0.5)
-            
-            # Temperature - seasonal variation ke saath
-            temperature = np.random.normal((crop['temp_min'] + crop['temp_max'])/2, 3)
-            temperature = np.clip(temperature, crop['temp_min']-5, crop['temp_max']+5)
-            
-            # Rainfall - monsoon pattern consider karke
-            rainfall = np.random.normal((crop['rainfall_min'] + crop['rainfall_max'])/2, 100)
-            rainfall = np.clip(rainfall, crop['rainfall_min']-200, crop['rainfall_max']+200)
-            
-            # Nitrogen - soil fertility ke hisaab se
-            nitrogen = np.random.normal((crop['nitrogen_min'] + crop['nitrogen_max'])/2, 10)
-            nitrogen = np.clip(nitrogen, crop['nitrogen_min']-20, crop['nitrogen_max']+20)
-            
-            # Phosphorus - balanced nutrition ke liye
-            phosphorus = np.random.normal((crop['phosphorus_min'] + crop['phosphorus_max'])/2, 5)
-            phosphorus = np.clip(phosphorus, crop['phosphorus_min']-10, crop['phosphorus_max']+10)
-            
-            # Potassium - crop quality ke liye important
-            potassium = np.random.normal((crop['potassium_min'] + crop['potassium_max'])/2, 5)
-            potassium = np.clip(potassium, crop['potassium_min']-10, crop['potassium_max']+10)
-            
-            # Humidity - climate conditions
-            humidity = np.random.normal((crop['humidity_min'] + crop['humidity_max'])/2, 5)
-            humidity = np.clip(humidity, crop['humidity_min']-10, crop['humidity_max']+10)
-            
-            # Month - planting season ke andar randomly select
-            month = np.random.randint(crop['plant_month_start'], crop['plant_month_end']+1)
-            
-            # Sab data array mein daal diya
-            data.append([
-                soil_ph, temperature, rainfall, nitrogen, phosphorus, potassium,
-                humidity, month, crop['season'], crop['soil_type']
-            ])
-            labels.append(crop['crop_name'])
-    
-    return np.array(data), np.array(labels)
-
-# Training data generate kar lete hain
-X, y = generate_synthetic_data(crop_df, samples_per_crop=300)
-
-# Feature names define kar diye hain
-feature_names = ['soil_ph', 'temperature', 'rainfall', 'nitrogen', 'phosphorus',
-                'potassium', 'humidity', 'month', 'season', 'soil_type']
-
-# DataFrame mein convert kar diya
-train_df = pd.DataFrame(X, columns=feature_names)
-train_df['crop'] = y
-
-print(f"✅ Generated {train_df.shape[0]} training samples")
-print(f"✅ Features: {len(feature_names)}")
-
-# STEP 3: DATA PREPARATION
-# ========================
-
-print("\nSTEP 3: Preparing Data for Machine Learning...")
-
-# Features aur target separate kar diya
-X = train_df.drop('crop', axis=1)
-y = train_df['crop']
-
-# Data split kar diya - 80% training, 20% testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-# Features ko scale kar diya
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-print(f"✅ Training set size: {X_train.shape}")
-print(f"✅ Test set size: {X_test.shape}")
-
-
-print("\nSTEP 4: Training Multiple Models...")
-
-# Multiple models test kar rahe hain - best wala choose karenge
-models = {
-    'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
-    'Gradient Boosting': GradientBoostingClassifier(random_state=42),
-    'SVM': SVC(random_state=42, probability=True),  # probability=True for predict_proba
-    'Naive Bayes': GaussianNB(),
-    'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000)
-}
-
-results = {}
-
-for name, model in models.items():
-    print(f"Training {name}...")
-    
-    if name in ['SVM', 'Logistic Regression']:
-        model.fit(X_train_scaled, y_train)
-        y_pred = model.predict(X_test_scaled)
+    if final_model == 'best':
+        return
+    if final_model in SCALED_MODELS:
+        raise ValueError(f"FINAL_MODEL '{final_model}' is trained on scaled features, but the apps send "
+                         f"raw features - choose an unscaled model or 'best'")
+    if final_model not in build_candidate_models():
+        raise ValueError(f"Unknown FINAL_MODEL '{final_model}'")
+
+
+# PIPELINE STAGES
+# ===============
+
+def stage_database(crop_data):
+    """STEP 1: crop_data dict se DataFrame"""
+    return pd.DataFrame(crop_data)
+
+
+def stage_synthetic_data(crop_df, samples_per_crop, chunk_size, seed, streaming_dir, n_workers=1):
+    """STEP 2: synthetic training data - in-memory compact DataFrame ya disk par shards"""
+    if streaming_dir:
+        dataset = write_shards(crop_df, streaming_dir, samples_per_crop=samples_per_crop,
+                               chunk_size=chunk_size, seed=seed)
+        return {'dataset_root': streaming_dir, 'class_names': dataset.manifest['classes'],
+                'total_samples': len(dataset)}
+
+    # Compact dtypes: float32 continuous, int8 categorical, int16 crop codes (class_names[code] = crop)
+    train_df, y_codes, class_names = generate_compact_data(
+        crop_df, samples_per_crop=samples_per_crop, seed=seed,
+        n_workers=n_workers, chunk_size=chunk_size)
+    train_df['crop'] = y_codes
+    return {'train_df': train_df, 'class_names': class_names, 'total_samples': len(train_df)}
+
+
+def stage_split(data, test_size, random_state):
+    """STEP 3a: train/test split - streaming mode mein shard row ranges par"""
+    if 'dataset_root' in data:
+        # Har shard ke aakhri test_size rows test set - shard ke rows already shuffled hain
+        dataset = ShardedDataset(data['dataset_root'])
+        train_ranges, test_ranges = dataset.split(test_size=test_size)
+        X_train, y_train = dataset.materialize(train_ranges, os.path.join(data['dataset_root'], 'train'))
+        X_test, y_test = dataset.materialize(test_ranges, os.path.join(data['dataset_root'], 'test'))
     else:
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
-    
-    accuracy = accuracy_score(y_test, y_pred)
-    results[name] = {'model': model, 'accuracy': accuracy, 'predictions': y_pred}
-    
-    print(f"  ✅ {name} Accuracy: {accuracy:.4f}")
-
-# Best model find kar lete hain
-best_model_name = max(results, key=lambda x: results[x]['accuracy'])
-best_model = results[best_model_name]['model']
-best_accuracy = results[best_model_name]['accuracy']
-
-print(f"\n🏆 Best Model: {best_model_name} with accuracy: {best_accuracy:.4f}")
+        # Features aur target separate kar diya
+        train_df = data['train_df']
+        X = train_df.drop('crop', axis=1)
+        y = train_df['crop']
 
-# STEP 5: FINAL MODEL SELECTION (Random Forest)
-# ==============================================
+        # Data split kar diya - 80% training, 20% testing
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y)
 
-print("\nSTEP 5: Training Final Random Forest Model...")
+    split = {'X_train': X_train, 'X_test': X_test, 'y_train': y_train, 'y_test': y_test}
+    if 'dataset_root' in data:
+        # Scaler stage isi folder mein apne out-of-core arrays likhta hai
+        split['dataset_root'] = data['dataset_root']
+    return split
 
-# Random Forest usually best perform karta hai agricultural data ke liye
-rf_model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
-rf_model.fit(X_train, y_train)
 
-y_pred = rf_model.predict(X_test)
-final_accuracy = accuracy_score(y_test, y_pred)
+def _transform_to_memmap(scaler, X, path, chunk_rows):
+    """X ko chunk-by-chunk scale karke on-disk .npy memmap mein likhta hai"""
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=X.shape)
+    for start in range(0, len(X), chunk_rows):
+        out[start:start + chunk_rows] = scaler.transform(X[start:start + chunk_rows])
+    out.flush()
+    del out
+    return np.load(path, mmap_mode='r')
 
-print(f"✅ Final Random Forest Accuracy: {final_accuracy:.4f}")
 
-feature_importance = pd.DataFrame({
-    'feature': feature_names,
-    'importance': rf_model.feature_importances_
-}).sort_values('importance', ascending=False)
-
-print("\n📊 Feature Importance:")
-print(feature_importance)
-
-# STEP 6: MODEL EVALUATION
-# ========================
+def stage_scaler(split, chunk_rows):
+    """
+    STEP 3b: features ko scale kar diya
+    Streaming mode mein scaler chunk-by-chunk partial_fit hota hai aur scaled
+    arrays disk par memmap mein likhe jaate hain - poora training set kabhi RAM mein nahi aata
+    """
+    scaler = StandardScaler()
+    X_train, X_test = split['X_train'], split['X_test']
+    if 'dataset_root' not in split:
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        return {'scaler': scaler, 'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled}
 
-print("\nSTEP 6: Model Evaluation...")
+    for start in range(0, len(X_train), chunk_rows):
+        scaler.partial_fit(X_train[start:start + chunk_rows])
 
-# Classification report generate kar lete hain
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred))
+    # Scaled arrays materialized split ke bagal mein: <root>/train_scaled.npy, <root>/test_scaled.npy
+    root = split['dataset_root']
+    X_train_scaled = _transform_to_memmap(scaler, X_train, os.path.join(root, 'train_scaled.npy'), chunk_rows)
+    X_test_scaled = _transform_to_memmap(scaler, X_test, os.path.join(root, 'test_scaled.npy'), chunk_rows)
+    return {'scaler': scaler, 'X_train_scaled': X_train_scaled, 'X_test_scaled': X_test_scaled}
 
-# STEP 7: MODEL SAVING
-# ====================
 
-print("\nSTEP 7: Saving the Trained Model...")
+def stage_candidates(split, scaled, models, scaled_models, time_budget, n_workers=None):
+    """STEP 4: saare candidate models parallel train + compare"""
+    results, best_model_name = compare_models(
+        models, split['X_train'], split['y_train'], split['X_test'], split['y_test'],
+        X_train_scaled=scaled['X_train_scaled'], X_test_scaled=scaled['X_test_scaled'],
+        scaled_models=scaled_models, time_budget=time_budget, n_workers=n_workers)
+    return {'results': results, 'best_model_name': best_model_name}
 
-# Model aur sab components save kar dete hain
-model_components = {
-    'model': rf_model,
-    'scaler': scaler,
-    'crop_database': crop_df,
-    'feature_names': feature_names,
-    'accuracy': final_accuracy,
-    'training_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-    'total_samples': len(train_df),
-    'num_crops': len(crop_df),
-    'feature_importance': feature_importance
-}
 
-# File mein save kar diya
-with open('crop_recommendation_model.pkl', 'wb') as f:
-    pickle.dump(model_components, f)
-
-print(f"✅ Model saved successfully to 'crop_recommendation_model.pkl'")
-
-# STEP 8: MODEL TESTING
-# =====================
-
-print("\nSTEP 8: Testing the Model with Sample Data...")
-
-# Test cases banate hain
-test_cases = [
-    {
-        'name': 'Wheat-friendly conditions (November)',
-        'params': [6.5, 18, 750, 140, 60, 60, 65, 11, 2, 2]  # season=2 (Rabi), soil_type=2 (Loamy)
-    },
-    {
-        'name': 'Rice-friendly conditions (July)', 
-        'params': [6.2, 28, 1200, 100, 50, 50, 80, 7, 1, 3]  # season=1 (Kharif), soil_type=3 (Clay)
-    },
-    {
-        'name': 'High rainfall monsoon (August)',
-        'params': [7.0, 26, 1500, 120, 70, 80, 85, 8, 1, 4]  # season=1 (Kharif), soil_type=4 (Alluvial)
+def stage_final_model(split, candidates, final_model, n_estimators, random_state, adaptive=None, shards=None):
+    """
+    STEP 5: final model
+    Step 4 mein same settings wala RF already train ho chuka hai - usi ko reuse karte hain
+    final_model='best' ya kisi candidate ka naam ho to wahi fitted candidate use hota hai
+    adaptive settings diye hon to RF ka size OOB accuracy / latency curve se decide hota hai
+    shards diye hon to RF sub-forests mein parallel train hokar merge hota hai
+    """
+    check_final_model(final_model)
+    results = candidates['results']
+    if final_model == 'best':
+        unscaled = [name for name in results
+                    if name not in SCALED_MODELS and results[name]['status'] == 'ok']
+        final_model = max(unscaled, key=lambda name: (results[name]['accuracy'], -unscaled.index(name)))
+
+    result = results.get(final_model, {})
+    model = result.get('model')
+    sizing = None
+    if final_model == 'Random Forest' and adaptive:
+        model, sizing = fit_adaptive_forest(split['X_train'], split['y_train'],
+                                            random_state=random_state, **adaptive)
+        y_pred = model.predict(split['X_test'])
+    elif final_model == 'Random Forest' and shards:
+        model, _ = fit_sharded_forest(split['X_train'], split['y_train'], n_shards=shards,
+                                      n_estimators=n_estimators, random_state=random_state)
+        y_pred = model.predict(split['X_test'])
+    elif final_model != 'Random Forest':
+        if result.get('status') != 'ok':
+            raise RuntimeError(f"Final model '{final_model}' did not finish in Step 4")
+        y_pred = result['predictions']
+    elif (result.get('status') == 'ok'
+            and model.get_params()['n_estimators'] == n_estimators
+            and model.get_params()['random_state'] == random_state):
+        y_pred = result['predictions']
+    else:
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state)
+        model.fit(split['X_train'], split['y_train'])
+        y_pred = model.predict(split['X_test'])
+
+    # n_jobs=-1 se result nahi badalta, sirf prediction parallel hoti hai
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=-1)
+    final_accuracy = accuracy_score(split['y_test'], y_pred)
+
+    importances = getattr(model, 'feature_importances_', None)
+    if importances is None:
+        # Boosting models mein feature_importances_ nahi hota - test sample par permutation importance
+        X_test, y_test = split['X_test'][:2000], split['y_test'][:2000]
+        importances = permutation_importance(model, X_test, y_test, n_repeats=3,
+                                             random_state=random_state).importances_mean
+
+    feature_importance = pd.DataFrame({
+        'feature': feature_names,
+        'importance': importances
+    }).sort_values('importance', ascending=False)
+
+    # Training ka waqt model ke saath cache hota hai - cache hit par bhi asli training date
+    return {'name': final_model, 'model': model, 'accuracy': final_accuracy, 'predictions': y_pred,
+            'feature_importance': feature_importance, 'sizing': sizing,
+            'training_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def stage_artifact(crop_df, data, scaled, final, feature_names, model_version):
+    """
+    STEP 7: model aur sab components ek dict mein
+    model_version = is stage ki cache key (data + params + code ka hash) - same inputs par har run mein same
+    """
+    return {
+        'model': final['model'],
+        'scaler': scaled['scaler'],
+        'crop_database': crop_df,
+        'feature_names': feature_names,
+        'class_names': data['class_names'],  # model.classes_ int16 codes hain - class_names[code] = crop name
+        'accuracy': final['accuracy'],
+        'model_name': final['name'],
+        'forest_sizing': final['sizing'],  # adaptive mode mein chosen size + OOB/latency curve, warna None
+        'training_date': final['training_date'],
+        'model_version': model_version,
+        'total_samples': data['total_samples'],
+        'num_crops': len(crop_df),
+        'feature_importance': final['feature_importance']
     }
-]
 
-for test_case in test_cases:
-    print(f"\n🧪 Test: {test_case['name']}")
-    
-    # Prediction banate hain
-    input_data = np.array([test_case['params']])
-    probabilities = rf_model.predict_proba(input_data)[0]
-    crop_names = rf_model.classes_
-    
-    # Top 3 recommendations nikaal rhe hain
-    recommendations = []
-    for i, crop in enumerate(crop_names):
-        recommendations.append({
-            'crop': crop,
-            'confidence': probabilities[i],
-            'score': probabilities[i] * 100
-        })
-    
-    # Sort by confidence
-    recommendations = sorted(recommendations, key=lambda x: x['confidence'], reverse=True)
-    
-    print("Top 3 Recommendations:")
-    for i, rec in enumerate(recommendations[:3], 1):
-        print(f"  {i}. {rec['crop']} - {rec['score']:.1f}% confidence")
-
-print("\n" + "="*60)
-print("🎉 MODEL TRAINING COMPLETED SUCCESSFULLY! 🎉")
-print("="*60)
-
-print(f"\n📊 Final Statistics:")
-print(f"Model Accuracy: {final_accuracy:.4f}")
-print(f"Total Training Samples: {len(train_df)}")
-print(f"Number of Crops: {len(crop_df)}")
-print(f"Number of Features: {len(feature_names)}")
-print(f"Model Type: Random Forest Classifier")
-print(f"Training Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-print(f"\n📁 Files Created:")
-print(f"✅ crop_recommendation_model.pkl - Trained model")
-print(f"✅ crop_database.csv - Crop database")
\ No newline at end of file
+
+def run_test_cases(model, class_names):
+    """STEP 8: sample inputs par top-3 recommendations print karta hai"""
+    # Test cases banate hain
+    test_cases = [
+        {
+            'name': 'Wheat-friendly conditions (November)',
+            'params': [6.5, 18, 750, 140, 60, 60, 65, 11, 2, 2]  # season=2 (Rabi), soil_type=2 (Loamy)
+        },
+        {
+            'name': 'Rice-friendly conditions (July)',
+            'params': [6.2, 28, 1200, 100, 50, 50, 80, 7, 1, 3]  # season=1 (Kharif), soil_type=3 (Clay)
+        },
+        {
+            'name': 'High rainfall monsoon (August)',
+            'params': [7.0, 26, 1500, 120, 70, 80, 85, 8, 1, 4]  # season=1 (Kharif), soil_type=4 (Alluvial)
+        }
+    ]
+
+    for test_case in test_cases:
+        print(f"\n🧪 Test: {test_case['name']}")
+
+        # Prediction banate hain
+        input_data = np.array([test_case['params']])
+        probabilities = model.predict_proba(input_data)[0]
+        crop_names = decode_labels(model.classes_, class_names)
+
+        # Top 3 recommendations nikaal rhe hain
+        recommendations = []
+        for i, crop in enumerate(crop_names):
+            recommendations.append({
+                'crop': crop,
+                'confidence': probabilities[i],
+                'score': probabilities[i] * 100
+            })
+
+        # Sort by confidence
+        recommendations = sorted(recommendations, key=lambda x: x['confidence'], reverse=True)
+
+        print("Top 3 Recommendations:")
+        for i, rec in enumerate(recommendations[:3], 1):
+            print(f"  {i}. {rec['crop']} - {rec['score']:.1f}% confidence")
+
+
+def main():
+    print("🌾 Crop Recommendation Model Training Script 🌾")
+    print("="*60)
+
+    # Galat FINAL_MODEL Step 4 ki lambi training ke baad nahi, shuru mein hi pakda jaye
+    check_final_model(FINAL_MODEL)
+    cache = StageCache(PIPELINE_CACHE_DIR or DEFAULT_CACHE_DIR, enabled=PIPELINE_CACHE_DIR is not None)
+
+    # STEP 1: CROP DATABASE CREATION
+    print("\nSTEP 1: Creating Crop Database...")
+    db_key, crop_df = cache.run('database', stage_database, {'crop_data': crop_data})
+    print(f"✅ Crop database created with {len(crop_df)} crops")
+
+    # STEP 2: SYNTHETIC DATA GENERATION
+    print("\nSTEP 2: Generating Synthetic Training Data...")
+    data_key, data = cache.run(
+        'synthetic_data', stage_synthetic_data,
+        {'samples_per_crop': SAMPLES_PER_CROP, 'chunk_size': DATA_CHUNK_SIZE,
+         'seed': SEED, 'streaming_dir': STREAMING_DIR},
+        inputs={'crop_df': crop_df, 'n_workers': DATA_WORKERS}, upstream=[db_key],
+        deps=[synthetic_data, shard_dataset],
+        # Streaming shards disk par alag rehte hain - delete ho gaye to stage dobara chalao
+        validate=lambda out: 'dataset_root' not in out or os.path.exists(
+            os.path.join(out['dataset_root'], MANIFEST_FILE)))
+    class_names = data['class_names']
+    total_samples = data['total_samples']
+    print(f"✅ Generated {total_samples} training samples")
+    print(f"✅ Features: {len(feature_names)}")
+
+    # STEP 3: DATA PREPARATION
+    print("\nSTEP 3: Preparing Data for Machine Learning...")
+    split_key, split = cache.run('split', stage_split, {'test_size': 0.2, 'random_state': 42},
+                                 inputs={'data': data}, upstream=[data_key], deps=[shard_dataset])
+    scaler_key, scaled = cache.run('scaler', stage_scaler, {'chunk_rows': DATA_CHUNK_SIZE},
+                                    inputs={'split': split}, upstream=[split_key], deps=[_transform_to_memmap])
+    print(f"✅ Training set size: {split['X_train'].shape}")
+    print(f"✅ Test set size: {split['X_test'].shape}")
+
+    # STEP 4: MULTIPLE MODELS
+    print("\nSTEP 4: Training Multiple Models...")
+    candidates_key, candidates = cache.run(
+        'candidates', stage_candidates,
+        {'models': build_candidate_models(), 'scaled_models': SCALED_MODELS, 'time_budget': MODEL_TIME_BUDGET},
+        inputs={'split': split, 'scaled': scaled, 'n_workers': MODEL_WORKERS},
+        upstream=[split_key, scaler_key], deps=[model_comparison, kernel_approx])
+    results = candidates['results']
+
+    for name, result in results.items():
+        if result['status'] == 'ok':
+            print(f"  ✅ {name} Accuracy: {result['accuracy']:.4f}")
+        else:
+            print(f"  ❌ {name} {result['status']} after {result['wall_time']:.1f}s")
+
+    print("\n⏱️ Model comparison timings:")
+    print(summarize_results(results).round(4).to_string())
+
+    # Best model - compare_models ne deterministically choose kar diya
+    best_model_name = candidates['best_model_name']
+    best_accuracy = results[best_model_name]['accuracy']
+    print(f"\n🏆 Best Model: {best_model_name} with accuracy: {best_accuracy:.4f}")
+
+    # STEP 5: FINAL MODEL SELECTION (Random Forest by default)
+    print(f"\nSTEP 5: Training Final Model ({FINAL_MODEL})...")
+    final_key, final = cache.run('final_model', stage_final_model,
+                                 {'final_model': FINAL_MODEL, 'n_estimators': 100, 'random_state': 42,
+                                  'adaptive': ADAPTIVE_FOREST, 'shards': FOREST_SHARDS},
+                                 inputs={'split': split, 'candidates': candidates},
+                                 upstream=[split_key, candidates_key],
+                                 deps=[check_final_model, adaptive_forest, sharded_forest])
+    model = final['model']
+    final_accuracy = final['accuracy']
+    print(f"✅ Final {final['name']} Accuracy: {final_accuracy:.4f}")
+
+    if final['sizing'] is not None:
+        print("\n🌲 Adaptive forest sizing:")
+        print_sizing_curve(final['sizing'])
+
+    print("\n📊 Feature Importance:")
+    print(final['feature_importance'])
+
+    # STEP 6: MODEL EVALUATION
+    print("\nSTEP 6: Model Evaluation...")
+
+    # Classification report generate kar lete hain
+    print("\nClassification Report:")
+    print(classification_report(split['y_test'], final['predictions'],
+                                labels=np.arange(len(class_names)), target_names=class_names))
+
+    # STEP 7: MODEL SAVING
+    print("\nSTEP 7: Saving the Trained Model...")
+    # Version pickle bytes ka hash nahi (wo har run mein badal jaate hain) - stage ki key, jo sirf
+    # upstream keys, params aur code se banti hai; isliye key pehle nikal ke stage ko di jaati hai
+    artifact_params = {'feature_names': feature_names}
+    artifact_upstream = [db_key, data_key, scaler_key, final_key]
+    model_version = cache.stage_key('artifact', stage_artifact, artifact_params, artifact_upstream)[:16]
+    _, model_components = cache.run('artifact', stage_artifact, artifact_params,
+                                    inputs={'crop_df': crop_df, 'data': data, 'scaled': scaled, 'final': final,
+                                            'model_version': model_version},
+                                    upstream=artifact_upstream)
+
+    # File mein save kar diya
+    with open(MODEL_PATH, 'wb') as f:
+        pickle.dump(model_components, f)
+
+    print(f"✅ Model saved successfully to '{MODEL_PATH}'")
+
+    manifest = save_artifact(model_components, ARTIFACT_DIR)
+    print(f"✅ Model artifact saved to '{ARTIFACT_DIR}/' (version {manifest['model_version']})")
+
+    # STEP 8: MODEL TESTING
+    print("\nSTEP 8: Testing the Model with Sample Data...")
+    run_test_cases(model, class_names)
+
+    print("\n" + "="*60)
+    print("🎉 MODEL TRAINING COMPLETED SUCCESSFULLY! 🎉")
+    print("="*60)
+
+    print(f"\n📊 Final Statistics:")
+    print(f"Model Accuracy: {final_accuracy:.4f}")
+    print(f"Total Training Samples: {total_samples}")
+    print(f"Number of Crops: {len(crop_df)}")
+    print(f"Number of Features: {len(feature_names)}")
+    print(f"Model Type: {type(model).__name__}")
+    print(f"Training Date: {model_components['training_date']}")
+
+    print(f"\n🗂️ Pipeline stages:")
+    print(cache.summary())
+
+    print(f"\n📁 Files Created:")
+    print(f"✅ {MODEL_PATH} - Trained model")
+    print(f"✅ {ARTIFACT_DIR}/ - Versioned model artifact (lazy loading)")
+    print(f"✅ crop_database.csv - Crop database")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Crop Metadata Index - Crop Recommendation System
+# Model load par ek baar crop_database ko model.classes_ ke order mein NumPy arrays mein badal dete hain.
+# Har recommendation par crop_db[crop_db['crop_name'] == crop] (poora scan + DataFrame) ki jagah
+# class index se seedha fancy indexing - ek row ho ya lakhon.
+
+import numpy as np
+import pandas as pd
+
+# Field input -> crop_database ke (min, max) columns - feature_engineering.FIELD_COLUMNS wale naam
+RANGE_COLUMNS = {
+    'soil_ph': ('soil_ph_min', 'soil_ph_max'),
+    'temperature': ('temp_min', 'temp_max'),
+    'rainfall': ('rainfall_min', 'rainfall_max'),
+    'nitrogen': ('nitrogen_min', 'nitrogen_max'),
+    'phosphorus': ('phosphorus_min', 'phosphorus_max'),
+    'potassium': ('potassium_min', 'potassium_max'),
+    'humidity': ('humidity_min', 'humidity_max'),
+    'month': ('plant_month_start', 'plant_month_end'),
+}
+
+
+class CropMetadataIndex:
+    """
+    crop_database ke saare numeric columns, model ke class order mein aligned arrays
+    index['expected_yield'][class_idx] - kisi bhi shape ke class index array ke saath chalta hai
+    known[i] False ho to us class ki crop database mein nahi hai (values NaN)
+    """
+
+    def __init__(self, crop_df, crop_names):
+        self.crop_names = np.asarray(crop_names)
+        aligned = crop_df.set_index('crop_name').reindex(self.crop_names)
+        self.known = aligned.notna().all(axis=1).to_numpy()
+        self.columns = {column: aligned[column].to_numpy() for column in aligned.columns
+                        if pd.api.types.is_numeric_dtype(aligned[column])}
+
+        # (crops x params) range matrices - suitability/feasibility checks ke liye
+        self.range_params = list(RANGE_COLUMNS)
+        self.range_min = np.column_stack([self.columns[low] for low, _ in RANGE_COLUMNS.values()])
+        self.range_max = np.column_stack([self.columns[high] for _, high in RANGE_COLUMNS.values()])
+
+    def __len__(self):
+        return len(self.crop_names)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def take(self, class_idx, columns=('expected_yield', 'crop_duration')):
+        """Kisi bhi shape ke class indices ke liye columns - {column: array}"""
+        return {column: self.columns[column][class_idx] for column in columns}
+
+    def row(self, class_idx):
+        """Ek crop ki saari values dict mein (pandas Series ki jagah, same keys)"""
+        row = {column: values[class_idx].item() for column, values in self.columns.items()}
+        row['crop_name'] = self.crop_names[class_idx]
+        return row
+
+
+if __name__ == "__main__":
+    import time
+
+    crop_df = pd.read_csv('crop_database.csv')
+    crop_names = crop_df['crop_name'].to_numpy()[::-1]   # model classes_ ka order database se alag ho sakta hai
+    start = time.perf_counter()
+    index = CropMetadataIndex(crop_df, crop_names)
+    print(f"Index built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Ek request - har class ke liye DataFrame scan vs ek fancy index
+    classes = np.arange(len(index))
+    start = time.perf_counter()
+    for _ in range(100):
+        scanned = [crop_df[crop_df['crop_name'] == crop].iloc[0]['expected_yield'] for crop in crop_names]
+    scan_ms = (time.perf_counter() - start) * 10
+    start = time.perf_counter()
+    for _ in range(100):
+        joined = index.take(classes)['expected_yield']
+    take_ms = (time.perf_counter() - start) * 10
+    assert np.array_equal(scanned, joined)
+    print(f"Per request (all {len(index)} classes): DataFrame scans {scan_ms:.2f} ms, index {take_ms:.4f} ms")
+
+    # Batch - 100k fields ke top-3
+    top_idx = np.random.default_rng(0).integers(0, len(index), (100_000, 3))
+    start = time.perf_counter()
+    info = index.take(top_idx)
+    print(f"100,000 x 3 join: {(time.perf_counter() - start) * 1000:.1f} ms")
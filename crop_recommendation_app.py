@@ -1,11 +1,15 @@
 
 import pandas as pd
 import numpy as np
-import pickle
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import warnings
+
+from model_artifact import load_model_components
+from feature_engineering import season_from_month, soil_type_from_nutrients
+from prediction_cache import PredictionCache, FINE_QUANTIZATION_STEPS
+from prediction_store import SharedPredictionStore
 warnings.filterwarnings('ignore')
 
 class CropRecommendationGUI:
@@ -15,27 +19,53 @@ class CropRecommendationGUI:
         self.root.geometry("800x700")
         self.root.configure(bg='#f0f0f0')
 
+        # Typed inputs free-form hain - fine grid, taaki cache results na badle; on-disk store app restart
+        # ke baad bhi kaam aata hai (Streamlit processes ke saath same file, alag namespace)
+        self.prediction_cache = PredictionCache(steps=FINE_QUANTIZATION_STEPS, store=SharedPredictionStore())
         self.load_model()
 
         self.create_widgets()
 
     def load_model(self):
-        """Load the pre-trained model and components"""
+        """Load the model artifact - model khud pehli prediction par hi load hota hai"""
         try:
-            with open('crop_recommendation_model.pkl', 'rb') as f:
-                components = pickle.load(f)
-
-            self.model = components['model']
-            self.scaler = components['scaler'] 
-            self.crop_db = components['crop_database']
-            self.feature_names = components['feature_names']
-            self.accuracy = components['accuracy']
+            # Artifact directory lazily load hoti hai; sirf purana pickle ho to wahi eager load
+            self.components = load_model_components()
+            self.feature_names = self.components['feature_names']
+            self.accuracy = self.components['accuracy']
 
             print(f"Model loaded successfully! Accuracy: {self.accuracy:.4f}")
 
         except FileNotFoundError:
             messagebox.showerror("Error", "Model file not found. Please train the model first.")
 
+    @property
+    def model(self):
+        return self.components['model']
+
+    @property
+    def predictor(self):
+        # Forest ka generated single-row module (sklearn predict_proba ka per-call overhead nahi), warna model khud
+        return self.components['row_predictor']
+
+    @property
+    def scaler(self):
+        return self.components['scaler']
+
+    @property
+    def crop_db(self):
+        return self.components['crop_database']
+
+    @property
+    def crop_index(self):
+        # Class order mein crop metadata arrays - display ke liye DataFrame scan nahi
+        return self.components['crop_index']
+
+    @property
+    def crop_names(self):
+        # Model int16 label codes par train hota hai - class_names se crop names wapas milte hain
+        return self.components['crop_names']
+
     def create_widgets(self):
         """Create the GUI interface"""
         
@@ -156,30 +186,6 @@ class CropRecommendationGUI:
 
             self.entries[key] = entry
 
-    def get_season_from_month(self, month):
-        """Convert month to season"""
-        if month in [6, 7, 8, 9]:
-            return 1  # Kharif
-        elif month in [10, 11, 12, 1]:
-            return 2  # Rabi
-        elif month in [3, 4, 5]:
-            return 3  # Zaid
-        else:
-            return 2  # Default to Rabi
-
-    def determine_soil_type(self, soil_ph, nitrogen, phosphorus, potassium):
-        """Determine soil type based on nutrient content"""
-        if nitrogen > 150 and phosphorus > 80 and potassium > 100:
-            return 4  # Alluvial (very fertile)
-        elif nitrogen > 100 and phosphorus > 60:
-            return 5  # Black soil (cotton belt)
-        elif nitrogen < 80 and phosphorus < 40:
-            return 1  # Sandy (low nutrients)
-        elif soil_ph > 7.0:
-            return 3  # Clay (alkaline)
-        else:
-            return 2  # Loamy (balanced)
-
     def predict_crop(self):
         """Make crop prediction based on input values"""
         try:
@@ -199,21 +205,18 @@ class CropRecommendationGUI:
             if not (0 <= humidity <= 100):
                 raise ValueError("Humidity must be between 0 and 100")
 
-            season = self.get_season_from_month(month)
-            soil_type = self.determine_soil_type(soil_ph, nitrogen, phosphorus, potassium)
+            season = season_from_month(month)
+            soil_type = soil_type_from_nutrients(soil_ph, nitrogen, phosphorus, potassium)
 
-            input_data = np.array([[
-                soil_ph, temperature, rainfall, nitrogen, phosphorus, 
-                potassium, humidity, month, season, soil_type
-            ]])
-
-            probabilities = self.model.predict_proba(input_data)[0]
-            crop_names = self.model.classes_
+            field = [soil_ph, temperature, rainfall, nitrogen, phosphorus, potassium, humidity, month]
+            probabilities = self.prediction_cache.predict_proba(self.components, field)[0]
+            crop_names = self.crop_names
 
             recommendations = []
             for i, crop in enumerate(crop_names):
                 recommendations.append({
                     'crop': crop,
+                    'class_index': i,
                     'confidence': probabilities[i],
                     'suitability_score': probabilities[i] * 100
                 })
@@ -254,11 +257,10 @@ class CropRecommendationGUI:
         self.results_text.insert(tk.END, "🏆 TOP CROP RECOMMENDATIONS:\n")
         self.results_text.insert(tk.END, "-"*40 + "\n\n")
 
+        crop_index = self.crop_index
         for i, rec in enumerate(recommendations, 1):
-            crop_info = self.crop_db[self.crop_db['crop_name'] == rec['crop']]
-
-            if not crop_info.empty:
-                crop_info = crop_info.iloc[0]
+            if crop_index.known[rec['class_index']]:
+                crop_info = crop_index.row(rec['class_index'])
 
                 self.results_text.insert(tk.END, f"{i}. {rec['crop'].replace('_', ' ').upper()}\n")
                 self.results_text.insert(tk.END, f"   🎯 Suitability Score: {rec['suitability_score']:.1f}%\n")
@@ -0,0 +1,176 @@
+# Feasibility Prefilter - Crop Recommendation System
+# Crop database ke (min, max) ranges ko hard constraints ki tarah use karte hain. pH 4.5 par Jowar ya
+# 3000mm rainfall par Mustard ka model se score karwana bekaar hai - aur jis field ke liye koi bhi crop
+# envelope mein nahi aati, us par model chalana hi nahi chahiye.
+#
+# Har parameter ke liye ek interval index: saari crops ke boundaries sorted, har elementary interval
+# (do boundaries ke beech, ya theek boundary par) ke liye un crops ka bitmask jo use cover karti hain.
+# Ek value ka lookup = ek searchsorted + ek gather; field ka feasibility mask = params ke masks ka AND.
+# (fields x crops x params) comparisons ki jagah (fields x params) lookups.
+
+import numpy as np
+
+from crop_metadata import RANGE_COLUMNS
+from synthetic_data import CONTINUOUS_SPECS
+
+# Training data har crop ke range se itne margin tak clip hota hai (synthetic_data.CONTINUOUS_SPECS,
+# RANGE_COLUMNS ke pehle 7 params ke order mein) - iske bahar model ne us crop ka ek bhi sample nahi dekha.
+# Month window training mein bhi exact hai.
+TRAINING_MARGINS = dict(zip(RANGE_COLUMNS, [margin for _, _, margin in CONTINUOUS_SPECS]))
+TRAINING_MARGINS['month'] = 0
+
+NO_VIABLE_CROP = "No viable crop"
+
+_WORD_BITS = 64
+
+
+def _pack(bits):
+    """(..., crops) bool -> (..., words) uint64 bitmask, crop i = word i // 64 ka bit i % 64"""
+    n_crops = bits.shape[-1]
+    n_words = -(-n_crops // _WORD_BITS)
+    padded = np.zeros(bits.shape[:-1] + (n_words * _WORD_BITS,), dtype=bool)
+    padded[..., :n_crops] = bits
+    return np.packbits(padded, axis=-1, bitorder='little').view('<u8')
+
+
+def _unpack(words, n_crops):
+    """_pack ka ulta - (..., words) uint64 -> (..., crops) bool"""
+    return np.unpackbits(words.view(np.uint8), axis=-1, count=n_crops, bitorder='little').astype(bool)
+
+
+class IntervalIndex:
+    """
+    Ek parameter ke closed intervals [low_c, high_c] (har crop c ka ek) par stabbing queries
+    Slot 2i+1 = value theek points[i] par, slot 2i = points[i-1] aur points[i] ke beech,
+    slot 0 / slot 2m = saare points ke neeche / upar. masks[slot] = us slot ko cover karne wali crops.
+    """
+
+    def __init__(self, low, high):
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        points = np.unique(np.concatenate([low, high]))
+        self.points = points[~np.isnan(points)]   # database mein na hone wali crop (NaN) kisi slot mein nahi
+        if len(self.points) == 0:
+            self.points = np.zeros(1)
+
+        # Har slot ka ek representative value - slot ke andar har value ka answer same hota hai
+        probes = np.empty(2 * len(self.points) + 1)
+        probes[1::2] = self.points
+        probes[2:-1:2] = (self.points[:-1] + self.points[1:]) / 2
+        probes[0], probes[-1] = self.points[0] - 1, self.points[-1] + 1
+        self.masks = _pack((low <= probes[:, None]) & (probes[:, None] <= high))
+
+    def slots(self, values):
+        index = np.searchsorted(self.points, values)
+        exact = self.points[np.minimum(index, len(self.points) - 1)] == values
+        return 2 * index + exact
+
+    def lookup(self, values):
+        """(n,) values -> (n x words) bitmask of crops whose interval contains the value"""
+        return self.masks[self.slots(values)]
+
+
+class FeasibilityIndex:
+    """
+    Saari crops ke hard-constraint envelopes (crop_index ke ranges +/- margins), model ke class order mein
+    values: (fields x 8) - FIELD_COLUMNS / RANGE_COLUMNS order
+    """
+
+    def __init__(self, crop_index, margins=None):
+        margins = TRAINING_MARGINS if margins is None else margins
+        self.crop_names = crop_index.crop_names
+        self.params = list(crop_index.range_params)
+        margin = np.array([margins.get(param, 0) for param in self.params], dtype=np.float64)
+        self.low = crop_index.range_min - margin
+        self.high = crop_index.range_max + margin
+        self.indexes = [IntervalIndex(self.low[:, p], self.high[:, p]) for p in range(len(self.params))]
+
+    def __len__(self):
+        return len(self.crop_names)
+
+    def mask_words(self, values):
+        """(fields x words) bitmask - har param ke lookup ka AND"""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.params))
+        words = self.indexes[0].lookup(values[:, 0])
+        for p in range(1, len(self.params)):
+            words &= self.indexes[p].lookup(values[:, p])
+        return words
+
+    def feasible(self, values):
+        """(fields x crops) bool - crop ke saare params envelope ke andar"""
+        return _unpack(self.mask_words(values), len(self))
+
+    def viable(self, values):
+        """(fields,) bool - kam se kam ek crop feasible (unpack ki zaroorat nahi)"""
+        return self.mask_words(values).any(axis=1)
+
+
+def prefilter_stats(feasible):
+    """Ek batch par prefilter ne model ka kitna kaam bachaya - (fields x crops) feasibility mask se"""
+    n_fields, n_crops = feasible.shape
+    rows_scored = int(feasible.any(axis=1).sum())
+    pairs_feasible = int(feasible.sum())
+    return {
+        'fields': n_fields,
+        'fields_scored': rows_scored,
+        'fields_skipped': n_fields - rows_scored,
+        'skipped_fraction': (n_fields - rows_scored) / max(n_fields, 1),
+        'pairs_feasible': pairs_feasible,
+        'pairs_pruned_fraction': 1 - pairs_feasible / max(n_fields * n_crops, 1),
+    }
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from feature_engineering import build_features
+    from model_artifact import load_model_components
+    from synthetic_data import generate_compact_data, random_fields
+
+    components = load_model_components()
+    model = components['model']
+    crop_df = pd.read_csv('crop_database.csv')
+    index = FeasibilityIndex(components['crop_index'])
+
+    rng = np.random.default_rng(0)
+    n_fields = 100_000
+    # (a) Sliders wali ranges mein uniform random fields, (b) kisi na kisi crop ke envelope se aaye fields
+    uniform = random_fields(rng, n_fields)
+    X_eval, _, _ = generate_compact_data(crop_df, samples_per_crop=n_fields // len(crop_df), seed=7)
+    realistic = X_eval.to_numpy(dtype=np.float64)[:, :8]
+
+    # Brute-force (fields x crops x params) comparison se exact match
+    for values in (uniform[:20_000], realistic[:20_000]):
+        v = values[:, None, :]
+        expected = ((index.low <= v) & (v <= index.high)).all(axis=2)
+        assert np.array_equal(index.feasible(values), expected)
+    boundaries = np.stack([index.low, index.high]).reshape(-1, len(index.params))
+    v = boundaries[:, None, :]
+    assert np.array_equal(index.feasible(boundaries), ((index.low <= v) & (v <= index.high)).all(axis=2))
+    print("✅ Interval index matches the brute-force range check (including exact boundaries)")
+
+    for label, values in (("uniform slider ranges", uniform), ("crop-envelope fields", realistic)):
+        start = time.perf_counter()
+        feasible = index.feasible(values)
+        mask_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        v = values[:, None, :]
+        ((index.low <= v) & (v <= index.high)).all(axis=2)
+        brute_ms = (time.perf_counter() - start) * 1000
+        stats = prefilter_stats(feasible)
+
+        features = build_features(values)
+        start = time.perf_counter()
+        model.predict_proba(features)
+        full = time.perf_counter() - start
+        start = time.perf_counter()
+        if stats['fields_scored']:
+            model.predict_proba(features[feasible.any(axis=1)])
+        scored = time.perf_counter() - start
+
+        print(f"\n{label}: {n_fields:,} fields, mask in {mask_ms:.0f} ms "
+              f"(brute-force range check {brute_ms:.0f} ms)")
+        print(f"  fields skipped: {stats['fields_skipped']:,} ({stats['skipped_fraction']:.1%}), "
+              f"crop pairs pruned: {stats['pairs_pruned_fraction']:.1%} "
+              f"(avg {stats['pairs_feasible'] / n_fields:.2f} feasible crops per field)")
+        print(f"  predict_proba: all rows {full:.2f}s, feasible rows only {scored:.2f}s")
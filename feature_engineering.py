@@ -0,0 +1,146 @@
+# Feature Engineering - Crop Recommendation System
+# Season aur soil type ke derived features - Tk app, Streamlit app aur CropRecommendationSystem
+# sab yahi use karte hain. Scalar aur million-row arrays dono par bina Python loop ke chalta hai.
+
+import numpy as np
+import pandas as pd
+
+# User se aane wale field inputs (ndarray mein isi order mein)
+FIELD_COLUMNS = ['soil_ph', 'temperature', 'rainfall', 'nitrogen', 'phosphorus',
+                 'potassium', 'humidity', 'month']
+
+# Month -> season lookup (index = month, 0 aur 2 = default Rabi)
+# 6-9 Kharif (1), 10-1 Rabi (2), 3-5 Zaid (3)
+SEASON_BY_MONTH = np.array([2, 2, 2, 3, 3, 3, 1, 1, 1, 1, 2, 2, 2], dtype=np.int64)
+
+SEASON_NAMES = {1: "Kharif (Monsoon)", 2: "Rabi (Winter)", 3: "Zaid (Summer)"}
+SOIL_TYPE_NAMES = {1: "Sandy", 2: "Loamy", 3: "Clay", 4: "Alluvial", 5: "Black"}
+
+
+def _scalar_or_array(result, *inputs):
+    """Saare inputs scalar hon to Python int, warna array"""
+    if all(np.ndim(value) == 0 for value in inputs):
+        return int(result)
+    return result
+
+
+def season_from_month(month):
+    """
+    Month (1-12) se season code - lookup table se
+    Table ke bahar ka month (0, 13, 7.5, ...) default Rabi (2) deta hai, purane if/elif jaisa
+    """
+    months = np.asarray(month)
+    valid = (months >= 1) & (months <= 12) & (np.floor(months) == months)
+    index = np.where(valid, months, 0).astype(np.intp)
+    return _scalar_or_array(SEASON_BY_MONTH[index], month)
+
+
+def soil_type_from_nutrients(soil_ph, nitrogen, phosphorus, potassium):
+    """
+    Nutrient levels se soil type code - pehli matching condition jeet-ti hai
+    4 Alluvial (very fertile), 5 Black (cotton belt), 1 Sandy (low nutrients), 3 Clay (alkaline), 2 Loamy
+    """
+    ph, n, p, k = (np.asarray(value) for value in (soil_ph, nitrogen, phosphorus, potassium))
+    soil_type = np.select(
+        [(n > 150) & (p > 80) & (k > 100),
+         (n > 100) & (p > 60),
+         (n < 80) & (p < 40),
+         ph > 7.0],
+        [4, 5, 1, 3], default=2)
+    return _scalar_or_array(soil_type, soil_ph, nitrogen, phosphorus, potassium)
+
+
+def validate_fields(values):
+    """
+    (n x 8) fields (FIELD_COLUMNS order) -> (n,) error messages, '' = valid row
+    Tk app aur service wale hi checks, lekin poore chunk par ek saath; pehli failing check ka message
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(-1, len(FIELD_COLUMNS))
+    soil_ph, humidity, month = (values[:, FIELD_COLUMNS.index(name)] for name in ('soil_ph', 'humidity', 'month'))
+    with np.errstate(invalid='ignore'):
+        return np.select(
+            [~np.isfinite(values).all(axis=1),
+             ~((month >= 1) & (month <= 12) & (np.floor(month) == month)),
+             ~((soil_ph >= 0) & (soil_ph <= 14)),
+             ~((humidity >= 0) & (humidity <= 100))],
+            ["Missing or non-numeric value", "Month must be between 1 and 12",
+             "Soil pH must be between 0 and 14", "Humidity must be between 0 and 100"], default='')
+
+
+def build_features(fields):
+    """
+    Fields (DataFrame with FIELD_COLUMNS, ya n x 8 array same order mein) -> model ka (n x 10) feature matrix
+    Season aur soil type aakhri do columns hain (FEATURE_NAMES order)
+    """
+    if isinstance(fields, pd.DataFrame):
+        values = fields[FIELD_COLUMNS].to_numpy(dtype=np.float64)
+    else:
+        values = np.asarray(fields, dtype=np.float64).reshape(-1, len(FIELD_COLUMNS))
+    soil_ph, nitrogen, phosphorus, potassium, month = (values[:, FIELD_COLUMNS.index(name)] for name in
+                                                        ('soil_ph', 'nitrogen', 'phosphorus', 'potassium', 'month'))
+    season = season_from_month(month)
+    soil_type = soil_type_from_nutrients(soil_ph, nitrogen, phosphorus, potassium)
+    return np.column_stack([values, season, soil_type])
+
+
+if __name__ == "__main__":
+    import time
+
+    # Purane scalar if/elif versions (apps aur script_4 se) - equivalence check ke liye
+    def legacy_season(month):
+        if month in [6, 7, 8, 9]:
+            return 1
+        elif month in [10, 11, 12, 1]:
+            return 2
+        elif month in [3, 4, 5]:
+            return 3
+        else:
+            return 2
+
+    def legacy_soil_type(soil_ph, nitrogen, phosphorus, potassium):
+        if nitrogen > 150 and phosphorus > 80 and potassium > 100:
+            return 4
+        elif nitrogen > 100 and phosphorus > 60:
+            return 5
+        elif nitrogen < 80 and phosphorus < 40:
+            return 1
+        elif soil_ph > 7.0:
+            return 3
+        else:
+            return 2
+
+    # Season - har valid month, bahar ke values aur non-integer months
+    months = list(range(-1, 15)) + [0.5, 6.5, 7.0, 12.0, 13.5]
+    for month in months:
+        assert season_from_month(month) == legacy_season(month), month
+    assert np.array_equal(season_from_month(np.array(months)), [legacy_season(m) for m in months])
+
+    # Soil type - thresholds ke aas-paas ke saare combinations (boundary values zaroori hain)
+    ph_values = [4.0, 6.9, 7.0, 7.1, 9.0]
+    n_values = [0, 79, 80, 81, 100, 101, 150, 151, 300]
+    p_values = [0, 39, 40, 41, 60, 61, 80, 81, 200]
+    k_values = [0, 99, 100, 101, 250]
+    grid = np.array(np.meshgrid(ph_values, n_values, p_values, k_values)).reshape(4, -1).T
+    expected = [legacy_soil_type(*row) for row in grid]
+    assert np.array_equal(soil_type_from_nutrients(*grid.T), expected)
+    for row, value in zip(grid[::37], expected[::37]):
+        assert soil_type_from_nutrients(*row) == value
+    print(f"✅ Matches the old scalar heuristics on {len(months)} months and {len(grid)} nutrient combinations")
+
+    # Million rows - vectorized vs purana Python loop
+    rng = np.random.default_rng(0)
+    n_rows = 1_000_000
+    fields = np.column_stack([rng.uniform(4, 9, n_rows), rng.uniform(5, 45, n_rows), rng.uniform(100, 3000, n_rows),
+                              rng.integers(0, 301, n_rows), rng.integers(0, 201, n_rows),
+                              rng.integers(0, 251, n_rows), rng.uniform(30, 100, n_rows),
+                              rng.integers(1, 13, n_rows)])
+    start = time.perf_counter()
+    features = build_features(fields)
+    vectorized = time.perf_counter() - start
+
+    n_loop = 100_000
+    start = time.perf_counter()
+    for ph, _, _, n, p, k, _, month in fields[:n_loop].tolist():
+        legacy_season(month), legacy_soil_type(ph, n, p, k)
+    loop = (time.perf_counter() - start) * n_rows / n_loop
+    print(f"{n_rows:,} rows: vectorized {vectorized * 1000:.0f} ms, scalar loop ~{loop * 1000:.0f} ms (extrapolated)")
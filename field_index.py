@@ -0,0 +1,478 @@
+# Field Record Index - Crop Recommendation System
+# Latitude/longitude ke saath score hue fields ka history, shared store ki SQLite file mein (field_records
+# table), aur uske upar in-memory spatial index:
+#   - "is jagah ke aas-paas kya recommend hua tha" - radius aur k-nearest queries
+#   - padosi plots jinke inputs lagbhag same hain unka result dobara use (bulk scoring mein model skip)
+# Index lat/lon grid buckets hai (cell_deg degree ke cells): har record ki cell key = row * n_cols + col,
+# arrays key par sorted. Ek cell row ke cells key mein lagataar hain - isliye radius query har cell row ke
+# liye ek searchsorted range hai, phir sirf un candidates par haversine distance.
+# Naye records pehle chhote unsorted delta mein jaate hain (queries usko brute-force dekhti hain), delta bada
+# hone par sorted merge - bulk scoring ke har chunk par poora index dobara sort nahi hota.
+# Doosre processes ke likhe records refresh() se aate hain (id > aakhri dekha hua id).
+
+import os
+import time
+import threading
+import numpy as np
+
+from feature_engineering import FIELD_COLUMNS
+from prediction_cache import QUANTIZATION_STEPS
+from prediction_store import DEFAULT_STORE_PATH, open_connection
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+# ~1.1 km cells - reuse radius (0.5 km) ek query mein 2-3 cell rows hi dekhta hai
+DEFAULT_CELL_DEG = 0.01
+DEFAULT_MERGE_THRESHOLD = 65_536
+# Delta ko brute-force dekhne ki limit (queries x delta records) - isse zyada ho to pehle merge
+BRUTE_FORCE_PAIRS = 2_000_000
+# Batch queries itne points ke tukdon mein - candidate pairs ki memory bounded
+QUERY_BATCH = 4096
+
+DEFAULT_REUSE_RADIUS_KM = 0.5
+# Near-duplicate: har field ek slider step ke andar, month bilkul same
+REUSE_TOLERANCE = dict(QUANTIZATION_STEPS, month=0)
+
+FIELD_RECORDS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS field_records (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    model_version TEXT NOT NULL,
+    fields BLOB NOT NULL,
+    crops BLOB NOT NULL,
+    confidences BLOB NOT NULL,
+    created REAL NOT NULL
+)
+'''
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance (km) - arrays broadcast hote hain"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def valid_coordinates(latitudes, longitudes):
+    """Finite aur range ([-90, 90], [-180, 180]) ke andar lat/lon ka mask"""
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)
+
+
+class SpatialIndex:
+    """
+    Lat/lon points + unke saath aligned columns (add(**columns)) ka grid-bucket index
+    Queries columns ke gathered arrays lautati hain (distance ke order mein) - positions merge par badalti hain
+    Antimeridian (180 degree) ke aar-paar wrap nahi hota - India ke data ke liye zaroorat nahi
+    """
+
+    def __init__(self, cell_deg=DEFAULT_CELL_DEG, merge_threshold=DEFAULT_MERGE_THRESHOLD):
+        self.cell_deg = cell_deg
+        self.merge_threshold = merge_threshold
+        self.n_cols = int(np.ceil(360 / cell_deg)) + 1
+        self._main = None     # key par sorted columns
+        self._delta = None    # naye records, insertion order mein
+        self.merges = 0
+
+    def __len__(self):
+        return sum(len(part['key']) for part in (self._main, self._delta) if part is not None)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for part in (self._main, self._delta) if part is not None for values in part.values())
+
+    def _cells(self, latitudes, longitudes):
+        rows = np.floor((latitudes + 90) / self.cell_deg).astype(np.int64)
+        cols = np.floor((longitudes + 180) / self.cell_deg).astype(np.int64)
+        return rows, cols
+
+    def add(self, latitudes, longitudes, **columns):
+        """Naye points (aur har column ki utni hi rows) - delta mein, threshold par merge"""
+        latitudes = np.asarray(latitudes, dtype=np.float64).ravel()
+        longitudes = np.asarray(longitudes, dtype=np.float64).ravel()
+        if not valid_coordinates(latitudes, longitudes).all():
+            raise ValueError("Latitude must be within [-90, 90] and longitude within [-180, 180]")
+        rows, cols = self._cells(latitudes, longitudes)
+        batch = {'key': rows * self.n_cols + cols, 'latitude': latitudes, 'longitude': longitudes}
+        batch.update({name: np.asarray(values) for name, values in columns.items()})
+        existing = self._main or self._delta
+        if existing is not None and existing.keys() != batch.keys():
+            raise ValueError(f"Columns must be {sorted(set(existing) - {'key', 'latitude', 'longitude'})}")
+        if self._delta is None:
+            self._delta = batch
+        else:
+            self._delta = {name: np.concatenate([self._delta[name], values]) for name, values in batch.items()}
+        if len(self._delta['key']) >= self.merge_threshold:
+            self.merge()
+
+    def merge(self):
+        """Delta ko sorted main mein - har delta entry apni jagah (barabar keys ke baad), poora re-sort nahi"""
+        if self._delta is None:
+            return
+        order = np.argsort(self._delta['key'], kind='stable')
+        delta = {name: values[order] for name, values in self._delta.items()}
+        if self._main is None:
+            self._main = delta
+        else:
+            n_main, n_delta = len(self._main['key']), len(delta['key'])
+            slots = np.searchsorted(self._main['key'], delta['key'], side='right') + np.arange(n_delta)
+            from_main = np.ones(n_main + n_delta, dtype=bool)
+            from_main[slots] = False
+            merged = {}
+            for name, values in self._main.items():
+                out = np.empty((n_main + n_delta,) + values.shape[1:], dtype=values.dtype)
+                out[slots] = delta[name]
+                out[from_main] = values
+                merged[name] = out
+            self._main = merged
+        self._delta = None
+        self.merges += 1
+
+    def _main_candidates(self, latitudes, longitudes, radius_km):
+        """Har query ke bounding box ki cell rows -> main mein (query, position) candidates"""
+        keys = self._main['key']
+        dlat = radius_km / KM_PER_DEGREE
+        # Longitude ka degree poles ki taraf chhota - band ke sabse door (pole wale) kinaare par
+        far_lat = np.minimum(np.abs(latitudes) + dlat, 89.999)
+        dlon = np.minimum(dlat / np.cos(np.radians(far_lat)), 360)
+        row_lo, col_lo = self._cells(np.maximum(latitudes - dlat, -90), np.maximum(longitudes - dlon, -180))
+        row_hi, col_hi = self._cells(np.minimum(latitudes + dlat, 90), np.minimum(longitudes + dlon, 180))
+        n_bands = int((row_hi - row_lo).max()) + 1
+        rows = row_lo[:, None] + np.arange(n_bands)
+        starts = np.searchsorted(keys, rows * self.n_cols + col_lo[:, None], side='left')
+        ends = np.searchsorted(keys, rows * self.n_cols + col_hi[:, None], side='right')
+        lengths = np.where(rows <= row_hi[:, None], ends - starts, 0).ravel()
+        # Ranges ko ek flat positions array mein (har range start se lagataar)
+        total = int(lengths.sum())
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts.ravel() - offsets, lengths) + np.arange(total)
+        queries = np.repeat(np.repeat(np.arange(len(latitudes)), n_bands), lengths)
+        return queries, positions
+
+    def pairs(self, latitudes, longitudes, radius_km, columns=None, ordered=True):
+        """
+        Har query point ke radius_km ke andar ke saare points - dict: query (input index), distance_km aur
+        columns (None = saare), (query, distance) order mein (ordered=False: bina sort, caller khud filter karke)
+        """
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+        if self._delta is not None and len(self._delta['key']) * len(latitudes) > BRUTE_FORCE_PAIRS:
+            self.merge()
+        parts = []
+        if self._main is not None:
+            queries, positions = self._main_candidates(latitudes, longitudes, radius_km)
+            parts.append((self._main, queries, positions))
+        if self._delta is not None:
+            dlat = radius_km / KM_PER_DEGREE
+            near = np.abs(self._delta['latitude'][None, :] - latitudes[:, None]) <= dlat
+            parts.append((self._delta, *np.nonzero(near)))
+
+        found = {'query': [], 'distance_km': []}
+        for part, queries, positions in parts:
+            distances = haversine_km(latitudes[queries], longitudes[queries],
+                                     part['latitude'][positions], part['longitude'][positions])
+            within = distances <= radius_km
+            queries, positions = queries[within], positions[within]
+            found['query'].append(queries)
+            found['distance_km'].append(distances[within])
+            names = [name for name in part if name != 'key'] if columns is None else columns
+            for name in names:
+                found.setdefault(name, []).append(part[name][positions])
+        if not parts:
+            return dict({name: np.empty(0) for name in columns or []}, query=np.empty(0, dtype=np.intp),
+                        distance_km=np.empty(0))
+        found = {name: np.concatenate(values) for name, values in found.items()}
+        if not ordered:
+            return found
+        order = np.lexsort((found['distance_km'], found['query']))
+        return {name: values[order] for name, values in found.items()}
+
+    def radius(self, latitude, longitude, radius_km, columns=None):
+        """Ek point ke radius_km ke andar ke records, nazdeek pehle"""
+        found = self.pairs(latitude, longitude, radius_km, columns)
+        del found['query']
+        return found
+
+    def nearest(self, latitude, longitude, k, columns=None):
+        """
+        k nazdeek records - radius badha-badha ke: radius ke andar k mil gaye to baahar ka koi unse
+        nazdeek nahi ho sakta, isliye jawab exact hai
+        """
+        radius_km = self.cell_deg * KM_PER_DEGREE
+        while True:
+            found = self.radius(latitude, longitude, radius_km, columns)
+            if len(found['distance_km']) >= min(k, len(self)) or radius_km > np.pi * EARTH_RADIUS_KM:
+                return {name: values[:k] for name, values in found.items()}
+            radius_km *= 4
+
+
+class FieldRecordStore:
+    """
+    Score hue fields ka history (location, inputs, ranked crops) - SQLite table + SpatialIndex
+    Shared prediction store wali file (default) mein; har process apna index refresh() se incremental
+    update karta hai. Index mein har record ke ~70 bytes (id, lat/lon, top crop, confidence, fields float32).
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, cell_deg=DEFAULT_CELL_DEG):
+        self.path = path
+        self.index = SpatialIndex(cell_deg)
+        self.versions = {}    # model_version -> index ka small int code
+        self.last_id = 0
+        self.skipped = 0      # refresh mein chhodi gayi invalid-location rows
+        self._local = threading.local()
+        self._lock = threading.Lock()   # index merge queries ke beech bhi hota hai - ek thread ek waqt
+        self.refresh()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = open_connection(self.path)
+            connection.execute(FIELD_RECORDS_SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def __len__(self):
+        return len(self.index)
+
+    def refresh(self):
+        """Store mein aaye naye records (kisi bhi process ke) index mein - returns kitne aaye"""
+        with self._lock:
+            rows = self._connect().execute(
+                'SELECT id, latitude, longitude, model_version, fields, crops, confidences '
+                'FROM field_records WHERE id > ? ORDER BY id', [self.last_id]).fetchall()
+            if not rows:
+                return 0
+            self.last_id = rows[-1][0]
+            # Range ke bahar lat/lon wali rows (purane ya bahar se likhe records) skip - warna har refresh unpar
+            # atakta aur last_id kabhi aage nahi badhta
+            keep = valid_coordinates([row[1] for row in rows], [row[2] for row in rows])
+            self.skipped += int((~keep).sum())
+            rows = [row for row, ok in zip(rows, keep.tolist()) if ok]
+            if not rows:
+                return 0
+            ids, latitudes, longitudes, versions, fields, crops, confidences = zip(*rows)
+            codes = np.array([self.versions.setdefault(version, len(self.versions)) for version in versions],
+                             dtype=np.int16)
+            self.index.add(latitudes, longitudes, id=np.array(ids, dtype=np.int64), version=codes,
+                           fields=np.frombuffer(b''.join(fields), dtype=np.float64)
+                           .reshape(-1, len(FIELD_COLUMNS)).astype(np.float32),
+                           # Ranked arrays ka pehla element = top crop
+                           crop=np.frombuffer(b''.join(blob[:2] for blob in crops), dtype=np.int16),
+                           confidence=np.frombuffer(b''.join(blob[:4] for blob in confidences), dtype=np.float32))
+            return len(rows)
+
+    def add(self, model_version, latitudes, longitudes, fields, crops, confidences, sources=None):
+        """
+        Score hue fields record karta hai aur index update; returns naye records ki ginti
+        crops/confidences: (n x k) ranked (crop index, confidence); sources: optional unique ids (jaise
+        file#row) - same source dobara aaye to ignore (resume par duplicate records nahi)
+        """
+        fields = np.asarray(fields, dtype=np.float64).reshape(-1, len(FIELD_COLUMNS))
+        if not len(fields):
+            return 0
+        crops = np.asarray(crops, dtype=np.int16).reshape(len(fields), -1)
+        confidences = np.asarray(confidences, dtype=np.float32).reshape(len(fields), -1)
+        if len(latitudes) != len(fields) or len(longitudes) != len(fields) or \
+                not valid_coordinates(latitudes, longitudes).all():
+            raise ValueError("Latitude must be within [-90, 90] and longitude within [-180, 180]")
+        sources = [None] * len(fields) if sources is None else sources
+        now = time.time()
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            added = connection.executemany(
+                'INSERT OR IGNORE INTO field_records (source, latitude, longitude, model_version, fields, crops, '
+                'confidences, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(source, float(latitude), float(longitude), model_version, row.tobytes(), ranked.tobytes(),
+                  conf.tobytes(), now)
+                 for source, latitude, longitude, row, ranked, conf in zip(
+                     sources, latitudes, longitudes, fields, crops, confidences)]).rowcount
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self.refresh()
+        return added
+
+    def near(self, latitude, longitude, radius_km):
+        """Radius ke andar ke records (id, distance_km, latitude, longitude, crop, confidence), nazdeek pehle"""
+        with self._lock:
+            return self.index.radius(latitude, longitude, radius_km,
+                                     ['id', 'latitude', 'longitude', 'crop', 'confidence'])
+
+    def nearest(self, latitude, longitude, k):
+        """k nazdeek records, near() jaise columns"""
+        with self._lock:
+            return self.index.nearest(latitude, longitude, k, ['id', 'latitude', 'longitude', 'crop', 'confidence'])
+
+    def recommendations(self, ids):
+        """Record ids -> {id: (ranked crop indices, confidences)} SQLite se"""
+        ids = [int(record_id) for record_id in ids]
+        connection = self._connect()
+        found = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for record_id, crops, confidences in connection.execute(
+                    f'SELECT id, crops, confidences FROM field_records WHERE id IN ({",".join("?" * len(chunk))})',
+                    chunk):
+                found[record_id] = (np.frombuffer(crops, dtype=np.int16), np.frombuffer(confidences, dtype=np.float32))
+        return found
+
+    def find_reusable(self, model_version, latitudes, longitudes, fields, top_k=1,
+                      radius_km=DEFAULT_REUSE_RADIUS_KM, tolerance=None, max_id=None):
+        """
+        Har field ke liye radius ke andar sabse nazdeek record jo usi model version ka ho, jiske saare inputs
+        tolerance ke andar hon aur jisme kam se kam top_k crops hon
+        max_id: sirf is id tak ke records (job shuru hone ka snapshot - result workers/resume par depend na kare)
+        Returns (matched input indices, crops (m x top_k), confidences (m x top_k), distances km)
+        """
+        tolerance = REUSE_TOLERANCE if tolerance is None else tolerance
+        # float32 mein rakhe fields - step ke barabar farq bhi andar gine
+        slack = np.array([tolerance[column] for column in FIELD_COLUMNS]) * (1 + 1e-6) + 1e-6
+        fields = np.asarray(fields, dtype=np.float64).reshape(-1, len(FIELD_COLUMNS))
+        latitudes, longitudes = np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64)
+        matched, record_ids, distances = [], [], []
+        code = self.versions.get(model_version)
+        for start in range(0, len(fields) if code is not None else 0, QUERY_BATCH):
+            stop = start + QUERY_BATCH
+            with self._lock:
+                found = self.index.pairs(latitudes[start:stop], longitudes[start:stop], radius_km,
+                                         ['id', 'version', 'fields'], ordered=False)
+            close = (found['version'] == code) & \
+                (np.abs(found['fields'] - fields[start:stop][found['query']]) <= slack).all(axis=1)
+            if max_id is not None:
+                close &= found['id'] <= max_id
+            queries, ids, distance = found['query'][close], found['id'][close], found['distance_km'][close]
+            # Sirf close pairs sort - (query, distance, id) order mein har query ka pehla sabse nazdeek
+            order = np.lexsort((ids, distance, queries))
+            first = order[np.unique(queries[order], return_index=True)[1]]
+            matched.append(queries[first] + start)
+            record_ids.append(ids[first])
+            distances.append(distance[first])
+        if not matched:
+            return np.empty(0, dtype=np.intp), np.empty((0, top_k), dtype=np.intp), np.empty((0, top_k)), np.empty(0)
+        matched, record_ids, distances = (np.concatenate(values) for values in (matched, record_ids, distances))
+        stored = self.recommendations(record_ids)
+        keep = np.array([len(stored[record_id][0]) >= top_k for record_id in record_ids.tolist()], dtype=bool)
+        crops = np.array([stored[record_id][0][:top_k] for record_id in record_ids[keep].tolist()],
+                         dtype=np.intp).reshape(-1, top_k)
+        confidences = np.array([stored[record_id][1][:top_k] for record_id in record_ids[keep].tolist()],
+                               dtype=np.float64).reshape(-1, top_k)
+        return matched[keep], crops, confidences, distances[keep]
+
+    def stats(self):
+        return {'records': len(self.index), 'skipped': self.skipped, 'index_mb': self.index.nbytes / 1e6, 'merges': self.index.merges,
+                'model_versions': len(self.versions)}
+
+
+def sample_locations(n, n_villages=2000, spread_km=2.0, seed=0):
+    """Benchmark ke liye India jaise bounding box mein village clusters ke aas-paas field locations"""
+    rng = np.random.default_rng(seed)
+    centers = np.column_stack([rng.uniform(8, 34, n_villages), rng.uniform(69, 96, n_villages)])
+    village = rng.integers(0, n_villages, n)
+    offsets = rng.normal(0, spread_km / KM_PER_DEGREE, (n, 2))
+    offsets[:, 1] /= np.cos(np.radians(centers[village, 0]))
+    return centers[village, 0] + offsets[:, 0], centers[village, 1] + offsets[:, 1]
+
+
+def _brute_force(latitudes, longitudes, latitude, longitude):
+    return haversine_km(latitude, longitude, latitudes, longitudes)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    n_records = 2_000_000
+    latitudes, longitudes = sample_locations(n_records)
+    rng = np.random.default_rng(1)
+    crops = rng.integers(0, 20, n_records).astype(np.int16)
+
+    # Bulk scorer jaisa - 50k ke chunks mein incremental add
+    index = SpatialIndex()
+    start = time.perf_counter()
+    for chunk in range(0, n_records, 50_000):
+        index.add(latitudes[chunk:chunk + 50_000], longitudes[chunk:chunk + 50_000],
+                  id=np.arange(chunk, min(chunk + 50_000, n_records)), crop=crops[chunk:chunk + 50_000])
+    index.merge()
+    print(f"Indexed {n_records:,} records in {time.perf_counter() - start:.2f}s incrementally "
+          f"({index.merges} merges, {index.nbytes / 1e6:.0f} MB)")
+
+    def latency(query, n_queries=500):
+        picks = rng.integers(0, n_records, n_queries)
+        times = []
+        for i in picks:
+            start = time.perf_counter()
+            query(latitudes[i] + 0.003, longitudes[i] - 0.002)
+            times.append(time.perf_counter() - start)
+        return np.median(times) * 1e3, np.percentile(times, 99) * 1e3
+
+    for radius_km in (1, 5):
+        sizes = [len(index.radius(latitudes[i], longitudes[i], radius_km)['id']) for i in range(0, 5000, 50)]
+        median, p99 = latency(lambda lat, lon: index.radius(lat, lon, radius_km))
+        print(f"radius {radius_km} km ({np.mean(sizes):.0f} fields on average): median {median:.2f} ms, p99 {p99:.2f} ms")
+    median, p99 = latency(lambda lat, lon: index.nearest(lat, lon, 10))
+    print(f"10 nearest: median {median:.2f} ms, p99 {p99:.2f} ms")
+    brute_times = []
+    for i in range(5):
+        start = time.perf_counter()
+        np.argpartition(_brute_force(latitudes, longitudes, latitudes[i], longitudes[i]), 10)
+        brute_times.append(time.perf_counter() - start)
+    print(f"(brute-force scan over all records: {np.median(brute_times) * 1e3:.0f} ms per query)")
+
+    # Exactness - brute force se match
+    for i in rng.integers(0, n_records, 20):
+        lat, lon = latitudes[i] + 0.004, longitudes[i] + 0.004
+        distances = _brute_force(latitudes, longitudes, lat, lon)
+        assert set(index.radius(lat, lon, 3)['id'].tolist()) == set(np.flatnonzero(distances <= 3).tolist())
+        assert np.allclose(index.nearest(lat, lon, 10)['distance_km'], np.sort(distances)[:10])
+    # Naya record turant dikhta hai (delta), merge ke bina
+    index.add([20.0001], [80.0001], id=[n_records], crop=[np.int16(3)])
+    start = time.perf_counter()
+    assert index.nearest(20.0, 80.0, 1)['id'][0] == n_records
+    print(f"✅ Queries match brute force; a new record is visible immediately "
+          f"(query with delta: {(time.perf_counter() - start) * 1e3:.2f} ms)")
+
+    # Store: SQLite + incremental refresh + reuse of near-duplicate neighbours
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'store.sqlite3')
+        n_store = 200_000
+        defaults = np.array([6.5, 25, 800, 120, 60, 60, 70, 7], dtype=np.float64)
+        steps = np.array([QUANTIZATION_STEPS[column] for column in FIELD_COLUMNS])
+        fields = defaults + rng.integers(-3, 4, (n_store, len(FIELD_COLUMNS))) * steps
+        fields[:, 7] = 7
+        ranked = np.argsort(rng.random((n_store, 20)), axis=1)[:, :3]
+        writer = FieldRecordStore(path)
+        start = time.perf_counter()
+        for chunk in range(0, n_store, 50_000):
+            part = slice(chunk, chunk + 50_000)
+            writer.add('v1', latitudes[part], longitudes[part], fields[part], ranked[part],
+                       np.full((len(fields[part]), 3), 0.5), sources=[f'bench#{i}' for i in range(chunk, chunk + 50_000)])
+        print(f"Stored {n_store:,} records in {time.perf_counter() - start:.1f}s")
+        assert writer.add('v1', latitudes[:10], longitudes[:10], fields[:10], ranked[:10], np.ones((10, 3)),
+                          sources=[f'bench#{i}' for i in range(10)]) == 0
+
+        start = time.perf_counter()
+        reader = FieldRecordStore(path)
+        print(f"Another process loads the index from the store in {time.perf_counter() - start:.2f}s: {reader.stats()}")
+        writer.add('v1', [26.85], [80.95], defaults[None, :], ranked[:1], [[0.9, 0.05, 0.05]])
+        assert reader.refresh() == 1 and reader.nearest(26.85, 80.95, 1)['distance_km'][0] == 0
+
+        # Padosi plots: 100 m door, inputs ek step ke andar
+        n_queries = 50_000
+        picks = rng.integers(0, n_store, n_queries)
+        query_fields = fields[picks] + rng.integers(-1, 2, (n_queries, len(FIELD_COLUMNS))) * steps
+        query_fields[:, 7] = 7
+        start = time.perf_counter()
+        matched, reused_crops, _, distances = reader.find_reusable(
+            'v1', latitudes[picks] + 0.0009, longitudes[picks], query_fields, top_k=3)
+        elapsed = time.perf_counter() - start
+        print(f"Reusable neighbours for {len(matched):,} of {n_queries:,} plots in {elapsed:.2f}s "
+              f"({n_queries / elapsed:,.0f} plots/s), mean distance {distances.mean() * 1000:.0f} m")
+        assert len(reader.find_reusable('v2', latitudes[picks], longitudes[picks], query_fields)[0]) == 0
+        print("✅ Duplicate sources ignored, other processes' records picked up by refresh(), "
+              "no reuse across model versions")
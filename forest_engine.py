@@ -0,0 +1,307 @@
+# Flattened Forest Inference Engine - Crop Recommendation System
+# Trained forest ko ek baar contiguous NumPy node arrays mein compile karte hain
+# (feature, threshold, children, leaf class distribution) - saare trees ek hi table mein.
+# Prediction mein poora batch saare trees par vectorized NumPy se level-by-level neeche utarta hai,
+# sklearn ka per-call validation aur per-estimator Python/thread overhead nahi lagta.
+# Ye fayda chhote batches (single row se kuch sau rows) tak hi hai - bade batches par sklearn ka Cython
+# traversal aage nikal jata hai, isliye wahan engine fallback model (sklearn forest) ko de deta hai.
+
+import os
+import json
+import time
+import numpy as np
+
+# Ek baar mein itne rows traverse hote hain - (rows x trees) node arrays L2 cache mein rehte hain
+DEFAULT_BATCH_SIZE = 1024
+
+# Itne levels ke baad hi leaf par pahunche (row, tree) pairs hataye jaate hain - har level par
+# compaction ka kharcha traversal se zyada padta hai
+COMPACT_EVERY = 4
+
+# Isse zyada rows par predict_proba fallback (sklearn) model se - 1 core par crossover ~700 rows tha
+# (100 rows: 4.8x, 500: 1.5x, 1000: 0.9x, 10k: 0.5x); zyada cores par sklearn n_jobs se aur jaldi aage
+SKLEARN_FALLBACK_ROWS = 512
+
+ENGINE_ARRAYS = ('feature', 'threshold', 'first_child', 'is_leaf', 'roots',
+                 'leaf_ptr', 'leaf_class', 'leaf_value', 'classes')
+
+
+def _float32_floor(threshold):
+    """
+    float64 threshold ke neeche wala sabse bada float32
+    sklearn float32 X ko float64 threshold se compare karta hai; float32 x ke liye
+    x <= t  aur  x <= floor32(t)  same hain, isliye compare float32 mein hi ho jata hai
+    """
+    rounded = threshold.astype(np.float32)
+    too_big = rounded.astype(np.float64) > threshold
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+
+class FlatForest:
+    """
+    Forest ke saare trees ek node table mein (breadth-first, siblings adjacent):
+      feature[i], threshold[i]   - split: X[feature] > threshold ho to right child
+      first_child[i]             - left child; right child = first_child + 1. Leaf apne aap ko point karta hai
+      is_leaf[i]
+      roots[t]                   - tree t ka root node
+      leaf_ptr/leaf_class/leaf_value - leaves ki non-zero class probabilities (CSR) -
+                                   fully grown forest mein har leaf ek hi class ka hota hai
+    fallback: bade batches (> fallback_rows) ke liye sklearn model, ya use load karne wala zero-arg callable
+              (artifact se lazy - single-row path par model kabhi unpickle nahi hota). None = hamesha engine
+    """
+
+    def __init__(self, feature, threshold, first_child, is_leaf, roots,
+                 leaf_ptr, leaf_class, leaf_value, classes, n_features_in,
+                 fallback=None, fallback_rows=SKLEARN_FALLBACK_ROWS):
+        self.feature = feature
+        self.threshold = threshold
+        self.first_child = first_child
+        self.is_leaf = is_leaf
+        self.roots = roots
+        self.leaf_ptr = leaf_ptr
+        self.leaf_class = leaf_class
+        self.leaf_value = leaf_value
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features_in)
+        # Sab leaves pure hon to aggregation ek seedha bincount hai
+        self._single_entry_leaves = bool(np.all(np.diff(leaf_ptr)[is_leaf] == 1))
+        self.fallback = fallback
+        self.fallback_rows = fallback_rows
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """
+        RandomForest / ExtraTrees / DecisionTree classifier ko compile karta hai
+        Dusre models ke liye TypeError - caller sklearn predict_proba par wapas ja sakta hai
+        """
+        estimators = getattr(model, 'estimators_', None)
+        if estimators is None and hasattr(model, 'tree_'):
+            estimators = [model]
+        if not estimators or not all(hasattr(tree, 'tree_') for tree in estimators):
+            raise TypeError(f"{type(model).__name__} is not a tree ensemble classifier")
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise TypeError("Multi-output forests are not supported")
+
+        trees = [estimator.tree_ for estimator in estimators]
+
+        # Breadth-first numbering: pehle saare roots, phir har internal node ke dono children saath-saath
+        # (tree id, sklearn node id) -> naya global id
+        order = [(t, 0) for t in range(len(trees))]
+        first_child = []
+        head = 0
+        while head < len(order):
+            t, node = order[head]
+            head += 1
+            left = trees[t].children_left[node]
+            if left == -1:
+                first_child.append(head - 1)
+            else:
+                first_child.append(len(order))
+                order.append((t, left))
+                order.append((t, trees[t].children_right[node]))
+
+        tree_ids = np.array([t for t, _ in order])
+        node_ids = np.array([node for _, node in order])
+        n_nodes = len(order)
+
+        feature = np.empty(n_nodes, dtype=np.int32)
+        threshold = np.empty(n_nodes, dtype=np.float64)
+        is_leaf = np.empty(n_nodes, dtype=bool)
+        proba = np.empty((n_nodes, len(model.classes_)))
+        for t, tree in enumerate(trees):
+            mine = tree_ids == t
+            nodes = node_ids[mine]
+            feature[mine] = tree.feature[nodes]
+            threshold[mine] = tree.threshold[nodes]
+            is_leaf[mine] = tree.children_left[nodes] == -1
+            proba[mine] = tree.value[nodes, 0, :]
+
+        # Leaf par X kuch bhi ho, wahin ruka rahe (feature 0, threshold +inf)
+        feature[is_leaf] = 0
+        threshold[is_leaf] = np.inf
+
+        # tree_.value weighted counts ya fractions ho sakta hai - har leaf normalize karte hain
+        totals = proba.sum(axis=1, keepdims=True)
+        proba = np.divide(proba, totals, out=np.zeros_like(proba), where=totals > 0)
+        proba[~is_leaf] = 0.0
+        rows, leaf_class = np.nonzero(proba)
+        leaf_ptr = np.zeros(n_nodes + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=n_nodes), out=leaf_ptr[1:])
+
+        return cls(
+            feature=feature,
+            threshold=_float32_floor(threshold),
+            first_child=np.asarray(first_child, dtype=np.int32),
+            is_leaf=is_leaf,
+            roots=np.arange(len(trees), dtype=np.int32),
+            leaf_ptr=leaf_ptr,
+            leaf_class=leaf_class.astype(np.int32),
+            leaf_value=proba[rows, leaf_class],
+            classes=np.asarray(model.classes_),
+            n_features_in=model.n_features_in_,
+            fallback=model,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _check_input(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected shape (n_rows, {self.n_features_in_}), got {X.shape}")
+        return X
+
+    def _apply(self, X):
+        """Float32 batch ke har (row, tree) ka leaf node - flat array, row-major (row * n_trees + tree)"""
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        leaves = np.tile(self.roots, n_rows)
+        # Har (row, tree) pair ka flat_X mein row offset
+        offset = np.repeat(np.arange(0, n_rows * n_features, n_features, dtype=np.int64), self.n_trees)
+        position = np.arange(len(leaves))
+        node = leaves.copy()
+
+        while len(position):
+            for _ in range(COMPACT_EVERY):
+                column = np.take(self.feature, node) + offset
+                go_right = np.take(flat_X, column) > np.take(self.threshold, node)
+                node = np.take(self.first_child, node)
+                node += go_right
+            leaves[position] = node
+            active = ~np.take(self.is_leaf, node)
+            position, node, offset = position[active], node[active], offset[active]
+        return leaves
+
+    def apply(self, X):
+        """Har row aur har tree ka leaf node (engine ke global node ids) - shape (n_rows, n_trees)"""
+        X = self._check_input(X)
+        return self._apply(X).reshape(len(X), self.n_trees)
+
+    def _aggregate(self, leaves, n_rows):
+        """Leaf distributions ka har row par sum - bincount trees ko order mein jodta hai (sklearn jaisa)"""
+        n_classes = len(self.classes_)
+        row_base = np.repeat(np.arange(0, n_rows * n_classes, n_classes), self.n_trees)
+        if self._single_entry_leaves:
+            entries = self.leaf_ptr[leaves]
+        else:
+            counts = self.leaf_ptr[leaves + 1] - self.leaf_ptr[leaves]
+            starts = np.repeat(self.leaf_ptr[leaves] - np.cumsum(counts) + counts, counts)
+            entries = starts + np.arange(counts.sum())
+            row_base = np.repeat(row_base, counts)
+        sums = np.bincount(row_base + self.leaf_class[entries], weights=self.leaf_value[entries],
+                           minlength=n_rows * n_classes)
+        return sums.reshape(n_rows, n_classes)
+
+    def fallback_model(self):
+        """Bade batches wala sklearn model (callable ho to pehli baar yahin load hota hai)"""
+        if self.fallback is not None and not hasattr(self.fallback, 'predict_proba'):
+            self.fallback = self.fallback()
+        return self.fallback
+
+    def predict_proba(self, X, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        sklearn forest.predict_proba jaisa output - har tree ki leaf distribution ka average
+        fallback_rows se bade batch fallback model par (wahi probabilities, sklearn ka tez bulk path)
+        """
+        if self.fallback is not None and self.fallback_rows is not None and len(X) > self.fallback_rows:
+            return self.fallback_model().predict_proba(X)
+        return self.engine_proba(X, batch_size)
+
+    def engine_proba(self, X, batch_size=DEFAULT_BATCH_SIZE):
+        """Sirf flat engine se predict_proba - batch size kuch bhi ho, fallback nahi"""
+        X = self._check_input(X)
+        proba = np.empty((len(X), len(self.classes_)))
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            proba[start:start + len(batch)] = self._aggregate(self._apply(batch), len(batch))
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X, batch_size=DEFAULT_BATCH_SIZE):
+        return self.classes_[np.argmax(self.predict_proba(X, batch_size), axis=1)]
+
+    def save(self, directory):
+        """Har array alag .npy file mein - load(mmap_mode='r') se bina copy ke khulte hain"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ENGINE_ARRAYS:
+            value = self.classes_ if name == 'classes' else getattr(self, name)
+            np.save(os.path.join(directory, f'{name}.npy'), value, allow_pickle=False)
+        with open(os.path.join(directory, 'engine.json'), 'w') as f:
+            json.dump({'n_features_in': self.n_features_in_, 'n_trees': self.n_trees,
+                       'n_nodes': self.n_nodes}, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r', fallback=None):
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in ENGINE_ARRAYS}
+        with open(os.path.join(directory, 'engine.json')) as f:
+            info = json.load(f)
+        arrays['classes'] = np.asarray(arrays['classes'])
+        return cls(n_features_in=info['n_features_in'], fallback=fallback, **arrays)
+
+
+def check_equivalence(model, engine, X, atol=1e-9):
+    """Engine aur sklearn ke probabilities ka max difference; atol se zyada ho to AssertionError"""
+    expected = model.predict_proba(X)
+    actual = engine.engine_proba(X)
+    max_diff = float(np.abs(expected - actual).max())
+    if max_diff > atol:
+        raise AssertionError(f"Engine probabilities differ from sklearn by {max_diff:.3g}")
+    if not np.array_equal(model.classes_[expected.argmax(axis=1)], engine.classes_[actual.argmax(axis=1)]):
+        raise AssertionError("Engine predicted classes differ from sklearn")
+    return max_diff
+
+
+def _median_ms(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def benchmark(model, engine, X, batch_sizes=(1, 10, 100, 1000, 10000), repeats=20):
+    """
+    sklearn vs engine - single-row latency aur batch throughput (rows/sec)
+    'engine' = sirf flat traversal, 'predictor' = predict_proba (fallback_rows ke upar sklearn)
+    """
+    print(f"{'rows':>7} {'sklearn ms':>11} {'engine ms':>10} {'predictor ms':>13} {'sklearn rows/s':>15} "
+          f"{'predictor rows/s':>17} {'engine':>7} {'predictor':>10}")
+    for n in batch_sizes:
+        rows = X[:n]
+        n_repeats = repeats if n < 1000 else max(3, repeats // 5)
+        sklearn_ms = _median_ms(lambda: model.predict_proba(rows), n_repeats)
+        engine_ms = _median_ms(lambda: engine.engine_proba(rows), n_repeats)
+        predictor_ms = _median_ms(lambda: engine.predict_proba(rows), n_repeats)
+        print(f"{n:>7} {sklearn_ms:11.2f} {engine_ms:10.2f} {predictor_ms:13.2f} {n / sklearn_ms * 1000:15,.0f} "
+              f"{n / predictor_ms * 1000:17,.0f} {sklearn_ms / engine_ms:6.1f}x {sklearn_ms / predictor_ms:9.1f}x")
+
+
+if __name__ == "__main__":
+    import pickle
+    import pandas as pd
+    from synthetic_data import generate_compact_data
+
+    with open('crop_recommendation_model.pkl', 'rb') as f:
+        model = pickle.load(f)['model']
+
+    start = time.perf_counter()
+    engine = FlatForest.from_sklearn(model)
+    print(f"Compiled {engine.n_trees} trees / {engine.n_nodes:,} nodes "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    # Held-out jaisa data - training seed se alag seed
+    crop_df = pd.read_csv('crop_database.csv')
+    X_eval, _, _ = generate_compact_data(crop_df, samples_per_crop=1000, seed=7)
+    X_eval = X_eval.to_numpy()
+    max_diff = check_equivalence(model, engine, X_eval)
+    print(f"✅ Engine matches sklearn on {len(X_eval):,} rows (max |diff| = {max_diff:.2e})")
+
+    benchmark(model, engine, X_eval)
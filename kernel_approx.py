@@ -0,0 +1,158 @@
+# Approximate Kernel Classifier - Crop Recommendation System
+# SVC(probability=True) O(n^2) kernel fit + 5-fold Platt calibration karta hai - million rows par khatam nahi hota.
+# Yahan RBF kernel ko Nystroem / random Fourier features se approximate karke linear model
+# mini-batches mein train hota hai, aur ek chhote calibration slice par probabilities calibrate hoti hain.
+
+import time
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.linear_model import SGDClassifier, LogisticRegression
+
+
+class ApproxKernelClassifier(ClassifierMixin, BaseEstimator):
+    """
+    RBF-kernel classifier jo bounded memory mein train hota hai
+
+    kernel_map: 'nystroem' (landmark rows se) ya 'rff' (random Fourier features)
+    batch_size: ek baar mein itne rows transform + partial_fit hote hain (memory isi par depend karti hai)
+    calibration_size: itne held-out rows par multinomial calibration fit hoti hai (predict_proba ke liye)
+    Input already scaled hona chahiye (X_train_scaled) - gamma usi hisaab se hai.
+    """
+
+    def __init__(self, kernel_map='nystroem', n_components=300, gamma=0.1, alpha=1e-5,
+                 n_epochs=5, batch_size=10000, calibration_size=20000, random_state=None):
+        self.kernel_map = kernel_map
+        self.n_components = n_components
+        self.gamma = gamma
+        self.alpha = alpha
+        self.n_epochs = n_epochs
+        self.batch_size = batch_size
+        self.calibration_size = calibration_size
+        self.random_state = random_state
+
+    def _make_feature_map(self):
+        if self.kernel_map == 'nystroem':
+            return Nystroem(gamma=self.gamma, n_components=self.n_components, random_state=self.random_state)
+        if self.kernel_map == 'rff':
+            return RBFSampler(gamma=self.gamma, n_components=self.n_components, random_state=self.random_state)
+        raise ValueError(f"Unknown kernel_map: {self.kernel_map}")
+
+    def _iter_batches(self, n_rows):
+        for start in range(0, n_rows, self.batch_size):
+            yield slice(start, min(start + self.batch_size, n_rows))
+
+    def fit(self, X, y):
+        """Mini-batch training - X numpy array ya memmap dono chalega"""
+        rng = np.random.default_rng(self.random_state)
+        y = np.asarray(y)
+        n_rows = len(y)
+        self.classes_ = np.unique(y)
+
+        # Calibration slice alag rakhte hain - linear model isko kabhi nahi dekhta
+        calib_idx, train_idx = self._calibration_split(y, rng)
+
+        # Feature map sirf ek chhote sample par fit hota hai (Nystroem landmarks)
+        sample_idx = np.sort(train_idx[:max(self.n_components * 10, 1000)])
+        self.feature_map_ = self._make_feature_map().fit(np.asarray(X[sample_idx], dtype=np.float64))
+
+        self.linear_ = SGDClassifier(loss='hinge', alpha=self.alpha, random_state=self.random_state)
+        for _ in range(self.n_epochs):
+            rng.shuffle(train_idx)
+            for batch in self._iter_batches(len(train_idx)):
+                idx = np.sort(train_idx[batch])
+                features = self.feature_map_.transform(np.asarray(X[idx], dtype=np.float64))
+                self.linear_.partial_fit(features, y[idx], classes=self.classes_)
+
+        # Calibration - decision scores par multinomial logistic regression
+        calib_scores = self._decision_scores(X[calib_idx])
+        self.calibrator_ = LogisticRegression(max_iter=1000).fit(calib_scores, y[calib_idx])
+        return self
+
+    def _calibration_split(self, y, rng):
+        """
+        Stratified calibration slice - har class ke rows ka utna hi hissa (kam se kam 1, agar class ke
+        2+ rows hon). Random slice mein chhoti classes chhoot jaati thi aur calibrator unhe jaanta hi nahi tha
+        Returns (calib_idx sorted, train_idx)
+        """
+        n_rows = len(y)
+        n_calib = min(self.calibration_size, max(1, n_rows // 10))
+        # Random order mein class-wise groups - har group ke pehle rows calibration mein
+        order = rng.permutation(n_rows)
+        order = order[np.argsort(np.searchsorted(self.classes_, y[order]), kind='stable')]
+        counts = np.bincount(np.searchsorted(self.classes_, y), minlength=len(self.classes_))
+        take = np.where(counts > 1, np.maximum(1, np.round(counts * n_calib / n_rows)), 0).astype(np.intp)
+        starts = np.cumsum(counts) - counts
+        in_calib = np.zeros(n_rows, dtype=bool)
+        in_calib[np.concatenate([np.arange(start, start + k) for start, k in zip(starts, take)])] = True
+        return np.sort(order[in_calib]), order[~in_calib]
+
+    def _decision_scores(self, X):
+        """Batch-wise kernel features -> linear decision scores"""
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.empty((len(X), len(self.classes_)))
+        for batch in self._iter_batches(len(X)):
+            scores[batch] = self.linear_.decision_function(self.feature_map_.transform(X[batch]))
+        return scores
+
+    def decision_function(self, X):
+        return self._decision_scores(X)
+
+    def predict_proba(self, X):
+        """Calibrated class probabilities - ranking UI ke liye"""
+        scores = self._decision_scores(X)
+        # Jo class calibration mein nahi thi (sirf ek row wali) uska column 0 - shape hamesha classes_ jaisa
+        columns = np.searchsorted(self.classes_, self.calibrator_.classes_)
+        proba = np.zeros_like(scores)
+        for batch in self._iter_batches(len(scores)):
+            proba[batch, columns] = self.calibrator_.predict_proba(scores[batch])
+        return proba
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+if __name__ == "__main__":
+    import tracemalloc
+    import pandas as pd
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.metrics import accuracy_score, log_loss
+    from synthetic_data import generate_compact_data
+
+    crop_df = pd.read_csv('crop_database.csv')
+
+    # Chhota data (200 rows, 20 classes) - random 20-row calibration slice mein classes chhoot jaati thi
+    # aur predict_proba shape mismatch par crash hota tha. Ek class ka sirf ek row (calibration mein nahi aa sakta)
+    small_df, small_y, _ = generate_compact_data(crop_df, samples_per_crop=10, seed=1)
+    X_small = StandardScaler().fit_transform(small_df)
+    small_y = np.asarray(small_y).copy()
+    small_y[small_y == 19] = 18
+    small_y[0] = 19
+    small = ApproxKernelClassifier(n_components=50, random_state=0).fit(X_small, small_y)
+    assert set(small.calibrator_.classes_) == set(small.classes_) - {19}
+    small_proba = small.predict_proba(X_small)
+    assert small_proba.shape == (len(X_small), 20) and np.allclose(small_proba.sum(axis=1), 1)
+    assert (small_proba[:, -1] == 0).all()
+    print("✅ Calibration slice covers every class with 2+ rows; missing classes get probability 0")
+    train_df, y, _ = generate_compact_data(crop_df, samples_per_crop=50000, seed=42)
+    X = StandardScaler().fit_transform(train_df).astype(np.float32)
+    del train_df
+    n_test = 100000
+    perm = np.random.default_rng(0).permutation(len(X))
+    X, y = X[perm], y[perm]
+    X_train, y_train, X_test, y_test = X[n_test:], y[n_test:], X[:n_test], y[:n_test]
+
+    for kernel_map in ('nystroem', 'rff'):
+        model = ApproxKernelClassifier(kernel_map=kernel_map, random_state=42)
+        tracemalloc.start()
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        proba = model.predict_proba(X_test)
+        accuracy = accuracy_score(y_test, model.classes_[proba.argmax(axis=1)])
+        print(f"{kernel_map:>9}: {len(X_train):,} rows, fit {fit_time:.1f}s, "
+              f"fit memory peak {peak / 1e6:.0f} MB, accuracy {accuracy:.4f}, "
+              f"log loss {log_loss(y_test, proba, labels=model.classes_):.4f}")
@@ -0,0 +1,296 @@
+# Model Artifact Directory - Crop Recommendation System
+# Ek monolithic pickle ki jagah ek directory:
+#   manifest.json         - metadata, feature names, class list, accuracy, training date, version
+#   crop_database.npz     - crop table, ek array per column (columnar)
+#   model.pkl             - trained model (pickle protocol 5)
+#   scaler.pkl            - StandardScaler
+#   forest/*.npy          - tree ensembles ka flattened inference engine (forest_engine.FlatForest), mmap se khulta hai
+#   forest_predictor.py   - wahi forest generated Python code mein (forest_codegen) - single-row fastest path,
+#                           sirf MAX_CODEGEN_NODES tak ke forests ke liye
+# Har part pehli baar access hone par hi load hota hai - accuracy padhne ke liye model unpickle nahi hota.
+
+import os
+import json
+import time
+import pickle
+import shutil
+import hashlib
+import functools
+import numpy as np
+import pandas as pd
+
+from forest_engine import FlatForest
+from forest_codegen import write_module, load_module, MAX_CODEGEN_NODES
+from crop_metadata import CropMetadataIndex
+
+FORMAT_VERSION = 1
+DEFAULT_ARTIFACT_DIR = 'crop_recommendation_model'
+LEGACY_PICKLE_PATH = 'crop_recommendation_model.pkl'
+MANIFEST_FILE = 'manifest.json'
+
+# Manifest mein seedhe rakhe jaane wale chhote fields
+METADATA_KEYS = ['feature_names', 'class_names', 'accuracy', 'model_name', 'training_date',
+                 'total_samples', 'num_crops', 'forest_sizing']
+
+
+def _json_default(value):
+    """numpy scalars/arrays ko JSON mein likhne ke liye"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(components, artifact_dir=DEFAULT_ARTIFACT_DIR, codegen_max_nodes=MAX_CODEGEN_NODES):
+    """
+    Training script ka model_components dict artifact directory mein likhta hai
+    Pehle temp directory mein likh ke rename hota hai - readers ko kabhi adhoora artifact nahi dikhta
+    codegen_max_nodes: isse bade forest ka generated module nahi banta (0 = kabhi nahi, None = koi limit nahi)
+    """
+    tmp_dir = f'{artifact_dir}.tmp-{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    # joblib.load(mmap_mode) yahan faayda nahi deta - sklearn Tree load par node arrays copy kar leta hai,
+    # aur 100 trees ke 200 chhote arrays joblib se plain pickle ke mukable ~6x slow load hote hain
+    model_path = os.path.join(tmp_dir, 'model.pkl')
+    for name in ('model', 'scaler'):
+        with open(os.path.join(tmp_dir, f'{name}.pkl'), 'wb') as f:
+            pickle.dump(components[name], f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Version caches invalidate karta hai - training pipeline deterministic version deta hai (inputs ka hash);
+    # purane pickles mein wo nahi, tab model file ka hash
+    model_version = components.get('model_version') or _file_digest(model_path)[:16]
+
+    # Forest ho to flattened engine aur generated module bhi - apps inhi se predict karte hain,
+    # sklearn model unpickle nahi hota
+    try:
+        flat_forest = FlatForest.from_sklearn(components['model'])
+        flat_forest.save(os.path.join(tmp_dir, 'forest'))
+        engine = 'forest'
+    except TypeError:
+        flat_forest = engine = None
+    row_predictor = None
+    if flat_forest is not None and codegen_max_nodes != 0:
+        # Module sirf single-row speedup hai - na ban sake (bahut bada/gehra forest) to bas wahi skip,
+        # training ka fitted model nahi jaata; row requests phir FlatForest par
+        try:
+            write_module(flat_forest, os.path.join(tmp_dir, 'forest_predictor.py'), model_version,
+                         max_nodes=codegen_max_nodes)
+            row_predictor = 'forest_predictor.py'
+        except (ValueError, RecursionError, MemoryError) as error:
+            print(f"Skipping generated row predictor: {error}")
+
+    crop_df = components['crop_database']
+    # Text columns fixed-width unicode arrays banti hain - load par pickle ki zaroorat nahi
+    np.savez(os.path.join(tmp_dir, 'crop_database.npz'),
+             **{column: crop_df[column].to_numpy(
+                 dtype=None if pd.api.types.is_numeric_dtype(crop_df[column]) else str)
+                for column in crop_df.columns})
+
+    manifest = {key: components.get(key) for key in METADATA_KEYS}
+    manifest.update({
+        'format_version': FORMAT_VERSION,
+        'model_version': model_version,
+        'model_class': type(components['model']).__name__,
+        'engine': engine,
+        'row_predictor': row_predictor,
+        'crop_columns': list(crop_df.columns),
+        'feature_importance': components['feature_importance'].to_dict('records')
+        if components.get('feature_importance') is not None else None,
+    })
+    with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, default=_json_default)
+
+    # Purana artifact hata ke naya rename kar do
+    if os.path.isdir(artifact_dir):
+        old_dir = f'{artifact_dir}.old-{os.getpid()}'
+        os.replace(artifact_dir, old_dir)
+        os.replace(tmp_dir, artifact_dir)
+        shutil.rmtree(old_dir)
+    else:
+        os.replace(tmp_dir, artifact_dir)
+    return manifest
+
+
+class ModelArtifact:
+    """
+    Artifact ka lazy view - dict jaisa access (components['model']) bhi chalta hai,
+    taaki purana app code same rahe. Har part pehle access par load hokar cache ho jata hai.
+    """
+
+    def __init__(self, artifact_dir=DEFAULT_ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+        self._parts = {}
+        with open(os.path.join(artifact_dir, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version', 0) > FORMAT_VERSION:
+            raise ValueError(f"Artifact format {self.manifest['format_version']} is newer than "
+                             f"this loader ({FORMAT_VERSION})")
+
+    @classmethod
+    def from_pickle(cls, pickle_path=LEGACY_PICKLE_PATH):
+        """Purane monolithic pickle ko same interface ke peeche wrap karta hai (eager load)"""
+        with open(pickle_path, 'rb') as f:
+            components = pickle.load(f)
+        artifact = cls.__new__(cls)
+        artifact.artifact_dir = None
+        artifact.manifest = {key: components.get(key) for key in METADATA_KEYS}
+        artifact.manifest['model_version'] = components.get('model_version') or _file_digest(pickle_path)[:16]
+        artifact._parts = dict(components)
+        try:
+            artifact._parts['predictor'] = FlatForest.from_sklearn(components['model'])
+        except TypeError:
+            artifact._parts['predictor'] = components['model']
+        artifact._parts['row_predictor'] = artifact._parts['predictor']
+        return artifact
+
+    # Lazy loaders
+    def _load_part(self, name):
+        if name in ('model', 'scaler'):
+            with open(os.path.join(self.artifact_dir, f'{name}.pkl'), 'rb') as f:
+                return pickle.load(f)
+        if name == 'crop_database':
+            with np.load(os.path.join(self.artifact_dir, 'crop_database.npz'), allow_pickle=False) as columns:
+                return pd.DataFrame({column: columns[column] for column in self.manifest['crop_columns']})
+        if name == 'feature_importance':
+            records = self.manifest.get('feature_importance')
+            return pd.DataFrame(records) if records is not None else None
+        if name == 'predictor':
+            # predict_proba wala object - engine ho to wahi (mmap arrays), warna sklearn model
+            engine = self.manifest.get('engine')
+            if engine:
+                # Bade batches sklearn model par - wo pehle bade batch par hi unpickle hota hai
+                return FlatForest.load(os.path.join(self.artifact_dir, engine),
+                                       fallback=functools.partial(self.__getitem__, 'model'))
+            return self['model']
+        if name == 'row_predictor':
+            # Single-row requests ke liye generated module (sirf stdlib), warna predictor
+            module_file = self.manifest.get('row_predictor')
+            if module_file:
+                return load_module(os.path.join(self.artifact_dir, module_file),
+                                   f"forest_predictor_{self.manifest['model_version']}")
+            return self['predictor']
+        if name == 'crop_index':
+            # Crop table class order mein aligned arrays - recommendations ka metadata join fancy indexing se
+            return CropMetadataIndex(self['crop_database'], self['crop_names'])
+        if name == 'crop_names':
+            # classes_ int16 codes hain - class_names se decode; purane models mein already names
+            classes = self['row_predictor'].classes_
+            class_names = self.manifest.get('class_names')
+            return np.asarray(class_names)[classes] if class_names is not None else classes
+        if name in self.manifest:
+            return self.manifest[name]
+        raise KeyError(name)
+
+    def __getitem__(self, name):
+        if name not in self._parts:
+            self._parts[name] = self._load_part(name)
+        return self._parts[name]
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def is_loaded(self, name):
+        return name in self._parts
+
+    @property
+    def version(self):
+        return self.manifest.get('model_version')
+
+    @property
+    def model(self):
+        return self['model']
+
+    @property
+    def predictor(self):
+        return self['predictor']
+
+    @property
+    def crop_database(self):
+        return self['crop_database']
+
+    @property
+    def crop_index(self):
+        return self['crop_index']
+
+    @property
+    def crop_names(self):
+        return self['crop_names']
+
+    @property
+    def accuracy(self):
+        return self.manifest['accuracy']
+
+
+def artifact_stamp(artifact_dir=DEFAULT_ARTIFACT_DIR, pickle_path=LEGACY_PICKLE_PATH):
+    """
+    Jo artifact load_model_components kholega uski pehchaan (path, mtime, inode) - retrain par save_artifact
+    nayi directory rename karta hai, to ye badal jaati hai. Long-running apps apna loaded model isi par
+    key karte hain; sirf ek stat() hai, har request par chala sakte hain. Kuch na mile to None
+    """
+    for path in (os.path.join(artifact_dir, MANIFEST_FILE), pickle_path):
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            continue
+        return path, info.st_mtime_ns, info.st_ino
+    return None
+
+
+def load_model_components(artifact_dir=DEFAULT_ARTIFACT_DIR, pickle_path=LEGACY_PICKLE_PATH):
+    """
+    Apps ke liye entry point - artifact directory ho to lazy ModelArtifact, warna purana pickle
+    Dono na mile to FileNotFoundError
+    """
+    if os.path.exists(os.path.join(artifact_dir, MANIFEST_FILE)):
+        return ModelArtifact(artifact_dir)
+    if os.path.exists(pickle_path):
+        return ModelArtifact.from_pickle(pickle_path)
+    raise FileNotFoundError(f"Neither '{artifact_dir}/' nor '{pickle_path}' found")
+
+
+def benchmark_cold_start(artifact_dir=DEFAULT_ARTIFACT_DIR, pickle_path=LEGACY_PICKLE_PATH, repeats=5):
+    """Pickle vs artifact - app load_model() time aur first prediction tak ka time"""
+    sample = np.array([[6.5, 25, 800, 120, 60, 60, 70, 7, 1, 2]])
+
+    def load_pickle():
+        with open(pickle_path, 'rb') as f:
+            components = pickle.load(f)
+        return components, lambda: components['model']
+
+    def load_artifact():
+        # Apps artifact se 'row_predictor' lete hain - lazy load isi pehle access par hota hai
+        artifact = ModelArtifact(artifact_dir)
+        return artifact, lambda: artifact['row_predictor']
+
+    print(f"{'loader':>10} {'load_model (ms)':>16} {'+ first predict (ms)':>21}")
+    for label, loader in (('pickle', load_pickle), ('artifact', load_artifact)):
+        load_times, first_predict_times = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            components, predictor = loader()
+            components['accuracy']
+            load_times.append(time.perf_counter() - start)
+            predictor().predict_proba(sample)
+            first_predict_times.append(time.perf_counter() - start)
+        print(f"{label:>10} {np.median(load_times) * 1000:16.1f} {np.median(first_predict_times) * 1000:21.1f}")
+
+
+if __name__ == "__main__":
+    # Purane pickle se artifact directory banao aur cold-start compare karo
+    with open(LEGACY_PICKLE_PATH, 'rb') as f:
+        components = pickle.load(f)
+    manifest = save_artifact(components, DEFAULT_ARTIFACT_DIR)
+    print(f"✅ Artifact written to '{DEFAULT_ARTIFACT_DIR}/' (model version {manifest['model_version']})")
+    benchmark_cold_start()
@@ -0,0 +1,145 @@
+# Concurrent Model Comparison - Crop Recommendation System
+# Saare candidate models alag worker processes mein parallel train hote hain,
+# har model ka apna wall-clock budget hai - budget cross hua to process cancel
+
+import os
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score
+
+from synthetic_data import _pool_context
+
+# Single-row latency itne rows par measure hoti hai (median liya jata hai)
+LATENCY_SAMPLES = 50
+
+
+def _single_row_latency(model, X_test):
+    """Ek-ek row par predict_proba ki median latency (ms) - interactive apps jaisa use"""
+    rows = X_test[:LATENCY_SAMPLES]
+    timings = []
+    for i in range(len(rows)):
+        row = rows[i:i + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def evaluate_candidate(name, model, X_train, y_train, X_test, y_test):
+    """Ek model fit karke accuracy, fit time aur predict latency return karta hai"""
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    return {
+        'name': name,
+        'status': 'ok',
+        'model': model,
+        'accuracy': accuracy_score(y_test, y_pred),
+        'predictions': y_pred,
+        'fit_time': fit_time,
+        'batch_predict_ms_per_1k': predict_time / len(X_test) * 1e6,
+        'single_row_ms': _single_row_latency(model, X_test),
+    }
+
+
+def _worker(conn, name, model, X_train, y_train, X_test, y_test):
+    """Child process entry point - result (ya error) pipe se parent ko bhejta hai"""
+    try:
+        conn.send(evaluate_candidate(name, model, X_train, y_train, X_test, y_test))
+    except Exception as e:
+        conn.send({'name': name, 'status': 'error', 'error': str(e)})
+    finally:
+        conn.close()
+
+
+def compare_models(models, X_train, y_train, X_test, y_test,
+                   X_train_scaled=None, X_test_scaled=None, scaled_models=(),
+                   time_budget=None, n_workers=None):
+    """
+    Candidate models ko parallel processes mein fit karta hai
+
+    models: {name: unfitted estimator} - dict order hi tie-break order hai
+    scaled_models: in models ko X_*_scaled milta hai, baaki ko raw features
+    time_budget: per-model wall-clock limit (seconds) - cross hua to process terminate
+    Returns (results, best_name). Timed-out/failed models results mein status ke saath rehte hain.
+    """
+    n_workers = n_workers or min(len(models), os.cpu_count() or 1)
+    X_train, X_test = np.asarray(X_train), np.asarray(X_test)
+    y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+    ctx = _pool_context()
+
+    pending = list(models.items())
+    running = {}
+    results = {}
+
+    while pending or running:
+        # Free slots mein naye candidates start karo
+        while pending and len(running) < n_workers:
+            name, model = pending.pop(0)
+            if name in scaled_models:
+                data = (X_train_scaled, y_train, X_test_scaled, y_test)
+            else:
+                data = (X_train, y_train, X_test, y_test)
+
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_worker, args=(child_conn, name, model) + data, daemon=True)
+            process.start()
+            child_conn.close()
+            running[name] = (process, parent_conn, time.perf_counter())
+
+        for name, (process, conn, started) in list(running.items()):
+            elapsed = time.perf_counter() - started
+            if conn.poll():
+                try:
+                    results[name] = conn.recv()
+                except EOFError:
+                    results[name] = {'name': name, 'status': 'error', 'error': 'worker exited unexpectedly'}
+                results[name]['wall_time'] = elapsed
+            elif not process.is_alive():
+                results[name] = {'name': name, 'status': 'error', 'wall_time': elapsed,
+                                 'error': f'worker exited with code {process.exitcode}'}
+            elif time_budget is not None and elapsed > time_budget:
+                # Budget khatam - model cancel kar do
+                process.terminate()
+                results[name] = {'name': name, 'status': 'timeout', 'wall_time': elapsed}
+            else:
+                continue
+
+            process.join()
+            conn.close()
+            del running[name]
+
+        if running:
+            time.sleep(0.01)
+
+    # Deterministic selection - highest accuracy, tie hone par models dict ka order
+    order = {name: i for i, name in enumerate(models)}
+    finished = [name for name in models if results[name]['status'] == 'ok']
+    if not finished:
+        raise RuntimeError("No candidate model finished within its time budget")
+    best_name = max(finished, key=lambda name: (results[name]['accuracy'], -order[name]))
+
+    return {name: results[name] for name in models}, best_name
+
+
+def summarize_results(results):
+    """Results ka chhota table (DataFrame) - print karne ke liye"""
+    rows = []
+    for name, result in results.items():
+        rows.append({
+            'model': name,
+            'status': result['status'],
+            'accuracy': result.get('accuracy', np.nan),
+            'fit_time_s': result.get('fit_time', np.nan),
+            'single_row_ms': result.get('single_row_ms', np.nan),
+            'batch_ms_per_1k': result.get('batch_predict_ms_per_1k', np.nan),
+            'wall_time_s': result['wall_time'],
+        })
+    return pd.DataFrame(rows).set_index('model')
@@ -0,0 +1,152 @@
+# Content-addressed Stage Cache - Crop Recommendation System
+# Har pipeline stage ka output disk par cache hota hai, key = hash(stage code + helper deps ka code + params +
+# upstream keys). Koi param ya helper module badla to sirf wo stage aur uske downstream stages dobara chalte hain.
+# On-disk .npy memmaps (streaming mode) cache file mein copy nahi hote - sirf unka path + mtime/size jata hai
+
+import os
+import json
+import time
+import hashlib
+import inspect
+import joblib
+import numpy as np
+
+DEFAULT_CACHE_DIR = '.pipeline_cache'
+
+
+def _stable_json(value):
+    """Params ko deterministic JSON string mein badalta hai (unknown objects ke liye repr)"""
+    return json.dumps(value, sort_keys=True, default=repr)
+
+
+def _source(obj):
+    """Function/module ka source - na mile (builtin, REPL) to qualified naam"""
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, '__qualname__', getattr(obj, '__name__', repr(obj)))
+
+
+class NpyRef:
+    """
+    Poori .npy file par khule memmap ki jagah cache mein jaane wala reference - path + mtime/size
+    File baad mein dobara likhi gayi (ya mit gayi) to reference stale hai aur stage dobara chalta hai
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.stamp = self._stamp()
+
+    def _stamp(self):
+        try:
+            info = os.stat(self.path)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def is_current(self):
+        return self.stamp is not None and self._stamp() == self.stamp
+
+    def open(self):
+        return np.load(self.path, mmap_mode='r')
+
+    @classmethod
+    def for_array(cls, value):
+        """value poori .npy file ka memmap ho to NpyRef, warna None (slices aur normal arrays copy hi hote hain)"""
+        filename = getattr(value, 'filename', None)
+        if not isinstance(value, np.memmap) or not filename or not filename.endswith('.npy'):
+            return None
+        value.flush()
+        whole = np.load(filename, mmap_mode='r')
+        if whole.shape != value.shape or whole.dtype != value.dtype or whole.offset != value.offset:
+            return None
+        return cls(filename)
+
+
+def _to_refs(output):
+    """Output dict (nested bhi) ke whole-file memmaps -> NpyRef"""
+    if isinstance(output, dict):
+        return {key: _to_refs(value) for key, value in output.items()}
+    ref = NpyRef.for_array(output)
+    return output if ref is None else ref
+
+
+def _from_refs(output):
+    """_to_refs ka ulta - (output, sab references current the ya nahi)"""
+    if isinstance(output, dict):
+        resolved, current = {}, True
+        for key, value in output.items():
+            resolved[key], ok = _from_refs(value)
+            current = current and ok
+        return resolved, current
+    if isinstance(output, NpyRef):
+        return (output.open(), True) if output.is_current() else (None, False)
+    return output, True
+
+
+class StageCache:
+    """
+    Stage outputs ko joblib files mein rakhta hai: <root>/<stage>-<key>.joblib
+    Load karte waqt numpy arrays mmap_mode='r' se khulte hain, isliye bade outputs copy nahi hote
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, enabled=True):
+        self.root = root
+        self.enabled = enabled
+        self.log = []
+        if enabled:
+            os.makedirs(root, exist_ok=True)
+
+    def stage_key(self, stage, func, params, upstream=(), deps=()):
+        """
+        Stage ki key - function ka source, deps (helper modules/functions jinhe stage bulata hai) ka source,
+        params aur upstream stages ki keys ka sha256
+        """
+        digest = hashlib.sha256()
+        digest.update(stage.encode())
+        digest.update(_source(func).encode())
+        for dep in deps:
+            digest.update(_source(dep).encode())
+        digest.update(_stable_json(params).encode())
+        for key in upstream:
+            digest.update(key.encode())
+        return digest.hexdigest()[:20]
+
+    def path_for(self, stage, key):
+        return os.path.join(self.root, f'{stage}-{key}.joblib')
+
+    def run(self, stage, func, params, inputs=None, upstream=(), validate=None, deps=()):
+        """
+        Cache hit ho to saved output load karta hai, warna func(**inputs, **params) chala ke save karta hai
+        inputs: upstream stages ke outputs (aur n_workers jaise execution-only knobs) - ye hash nahi hote,
+                upstream outputs ki jagah unki keys hash hoti hain
+        upstream: pehle wale stages ki keys - unke badalne par ye stage bhi invalidate
+        validate: optional check(output) -> bool; False aaya to cached output stale maana jata hai
+        deps: stage jin helper modules/functions par chalta hai - unka code badle to cache miss
+        Returns (key, output)
+        """
+        key = self.stage_key(stage, func, params, upstream, deps)
+        path = self.path_for(stage, key)
+        start = time.perf_counter()
+
+        if self.enabled and os.path.exists(path):
+            output, current = _from_refs(joblib.load(path, mmap_mode='r'))
+            if current and (validate is None or validate(output)):
+                self.log.append((stage, key, 'cached', time.perf_counter() - start))
+                return key, output
+
+        output = func(**(inputs or {}), **params)
+        if self.enabled:
+            # Pehle temp file, phir rename - adhoori file kabhi cache hit nahi banegi
+            tmp_path = f'{path}.tmp-{os.getpid()}'
+            joblib.dump(_to_refs(output), tmp_path)
+            os.replace(tmp_path, path)
+        self.log.append((stage, key, 'computed', time.perf_counter() - start))
+        return key, output
+
+    def summary(self):
+        """Har stage ka status (cached/computed) aur time"""
+        lines = []
+        for stage, key, status, elapsed in self.log:
+            lines.append(f"  {stage:<16} {key}  {status:<9} {elapsed:8.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,212 @@
+# Prediction Cache - Crop Recommendation System
+# Streamlit ke sliders discrete hain (pH 0.1, N/P/K 5, temperature 1, humidity 1, rainfall 50) aur Tk app ke
+# inputs bhi defaults ke aas-paas hi rehte hain - bahut saare users bilkul same feature vector bhejte hain.
+# Predictor ke aage in-process memoization: key = quantized field vector, bounded LRU, optional TTL.
+# Model artifact badla (model_version alag) to poora cache khali.
+# store (prediction_store.SharedPredictionStore) diya ho to local miss par pehle saare processes ka shared
+# on-disk store dekha jata hai, model sirf dono mein miss par chalta hai.
+
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from feature_engineering import FIELD_COLUMNS, build_features
+
+# Quantization grid - Streamlit sliders ke steps (FIELD_COLUMNS order)
+QUANTIZATION_STEPS = {
+    'soil_ph': 0.1,
+    'temperature': 1,
+    'rainfall': 50,
+    'nitrogen': 5,
+    'phosphorus': 5,
+    'potassium': 5,
+    'humidity': 1,
+    'month': 1,
+}
+
+# Free-form inputs (Tk app) ke liye - 2 decimal tak type kiye values bilkul wahi rehte hain
+FINE_QUANTIZATION_STEPS = dict.fromkeys(FIELD_COLUMNS, 0.01)
+
+DEFAULT_MAXSIZE = 4096
+
+
+class PredictionCache:
+    """
+    Field vectors (n x 8, FIELD_COLUMNS order) -> class probabilities, quantized LRU ke through
+    Har input pehle grid par snap hota hai aur model snapped vector par hi chalta hai - isliye cached answer
+    sirf key par depend karta hai (kaun sa user pehle aaya, is par nahi). Slider inputs already grid par hain,
+    unke results bina cache jaise hi rehte hain.
+    ttl: seconds (None = kabhi expire nahi); clock: time.monotonic (tests/benchmarks mein badal sakte hain)
+    store: optional shared second level (SharedPredictionStore) - TTL sirf local level par lagta hai
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=None, steps=None, clock=time.monotonic, store=None):
+        steps = QUANTIZATION_STEPS if steps is None else steps
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.steps = np.array([steps[column] for column in FIELD_COLUMNS], dtype=np.float64)
+        self.clock = clock
+        self.store = store
+        self.model_version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()   # Streamlit sessions alag threads mein chalte hain
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def quantize(self, fields):
+        """(n x 8) fields -> (n x 8) int64 grid coordinates"""
+        values = np.asarray(fields, dtype=np.float64).reshape(-1, len(FIELD_COLUMNS))
+        return np.rint(values / self.steps).astype(np.int64)
+
+    def snap(self, fields):
+        """Fields ko grid ke nearest point par (model isi par chalta hai)"""
+        return self.quantize(fields) * self.steps
+
+    def namespace(self, model_version):
+        """Shared store ka namespace - alag grids (Streamlit vs Tk) ke keys ek doosre se na takrayein"""
+        return f"{model_version}/" + ','.join(f'{step:g}' for step in self.steps)
+
+    def _check_version(self, model_version):
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.model_version = model_version
+
+    def predict_proba(self, components, fields):
+        """
+        components: load_model_components() ka artifact - 'row_predictor' aur version isi se
+        Returns (n x classes) probabilities; saare misses ek hi predictor call mein
+        """
+        grid = self.quantize(fields)
+        keys = [tuple(row) for row in grid.tolist()]
+        results = [None] * len(keys)
+        missing = {}
+        with self._lock:
+            self._check_version(components.version)
+            now = self.clock()
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl is not None and now - entry[0] > self.ttl:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    results[i] = entry[1]
+
+        if missing:
+            # Shared store aur model lock ke bahar - dusre sessions ke hits ruke nahi
+            computed = self._lookup_or_predict(components, list(missing))
+            with self._lock:
+                self._check_version(components.version)
+                now = self.clock()
+                for (key, rows), row_proba in zip(missing.items(), computed):
+                    for i in rows:
+                        results[i] = row_proba
+                    self._entries[key] = (now, row_proba)
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return np.array(results)
+
+    def _lookup_or_predict(self, components, keys):
+        """Local misses - shared store se, baaki model se (aur store mein likh ke); keys ke order mein"""
+        key_bytes = [np.asarray(key, dtype=np.int64).tobytes() for key in keys]
+        found = {}
+        if self.store is not None:
+            namespace = self.namespace(components.version)
+            found = self.store.get_many(namespace, key_bytes)
+        todo = [i for i, key in enumerate(key_bytes) if key not in found]
+        if todo:
+            snapped = np.array([keys[i] for i in todo], dtype=np.float64) * self.steps
+            proba = np.asarray(components['row_predictor'].predict_proba(build_features(snapped)), dtype=np.float64)
+            proba.flags.writeable = False
+            for i, row_proba in zip(todo, proba):
+                found[key_bytes[i]] = row_proba
+            if self.store is not None:
+                self.store.put_many(namespace, [(key_bytes[i], found[key_bytes[i]]) for i in todo])
+        return [found[key] for key in key_bytes]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Cache sizing ke liye counters"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+            'model_version': self.model_version,
+            'shared': self.store.stats() if self.store is not None else None,
+        }
+
+
+if __name__ == "__main__":
+    from model_artifact import load_model_components
+    from synthetic_data import DEFAULT_FIELD, per_call_us, random_fields, slider_requests
+
+    components = load_model_components()
+    predictor = components['row_predictor']
+    rng = np.random.default_rng(0)
+
+    # Streamlit jaisa traffic - user defaults se shuru karke 0-3 sliders kuch steps hilata hai
+    n_requests = 20_000
+    defaults = np.array(DEFAULT_FIELD, dtype=np.float64)
+    requests = slider_requests(rng, n_requests, [QUANTIZATION_STEPS[column] for column in FIELD_COLUMNS])
+
+    for maxsize in (256, 1024, 4096, 16384):
+        cache = PredictionCache(maxsize=maxsize)
+        cached = per_call_us(lambda field: cache.predict_proba(components, field), requests)
+        stats = cache.stats()
+        print(f"maxsize {maxsize:>6}: hit rate {stats['hit_rate']:.1%}, evictions {stats['evictions']:,}, "
+              f"{cached:.0f} us/request")
+
+    print(f"Cache hit: {per_call_us(lambda field: cache.predict_proba(components, field), [defaults] * 2000):.0f} "
+          f"us/request")
+    print(f"No cache: {per_call_us(lambda field: predictor.predict_proba(build_features(field)), requests[:2000]):.0f} "
+          f"us/request")
+
+    # Slider values grid par hain - cache ke saath bhi bilkul wahi probabilities
+    cache = PredictionCache()
+    expected = np.asarray(predictor.predict_proba(build_features(requests[:500])))
+    assert np.array_equal(cache.predict_proba(components, requests[:500]), expected)
+    assert np.array_equal(cache.predict_proba(components, requests[:500]), expected)
+    print("✅ Cached probabilities identical to the predictor for on-grid inputs")
+
+    # Off-grid (Tk app jaise free-form) inputs snap hote hain - top crop kitna badalta hai
+    free_form = random_fields(rng, 2000, on_grid=False)
+    exact = np.asarray(predictor.predict_proba(build_features(free_form))).argmax(axis=1)
+    snapped = PredictionCache().predict_proba(components, free_form).argmax(axis=1)
+    print(f"Off-grid inputs: top crop unchanged by snapping for {np.mean(exact == snapped):.1%} of 2,000 fields")
+    typed = free_form.round(2)
+    fine = PredictionCache(steps=FINE_QUANTIZATION_STEPS).predict_proba(components, typed)
+    assert np.array_equal(fine, np.asarray(predictor.predict_proba(build_features(typed))))
+    print("✅ FINE_QUANTIZATION_STEPS keeps 2-decimal inputs exact")
+
+    # TTL aur model change
+    now = [0.0]
+    cache = PredictionCache(ttl=60, clock=lambda: now[0])
+    cache.predict_proba(components, defaults)
+    now[0] = 61
+    cache.predict_proba(components, defaults)
+    assert cache.expirations == 1 and cache.misses == 2
+    cache.model_version = 'older-model'
+    cache.predict_proba(components, defaults)
+    assert cache.invalidations == 1 and cache.misses == 3
+    print(f"✅ TTL expiry and model-version invalidation: {cache.stats()}")
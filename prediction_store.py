@@ -0,0 +1,207 @@
+# Shared Prediction Store - Crop Recommendation System
+# Load balancer ke peeche kai Streamlit processes chalte hain - har process same recommendations dobara
+# compute karta hai aur restart par in-process cache (prediction_cache) khali ho jata hai.
+# Ye ek on-disk SQLite (WAL mode) store hai jo saare processes share karte hain:
+#   key = namespace (model version + quantization grid) + quantized field vector
+#   value = poore class probabilities (top-k kuch bhi ho, isi se ban jata hai - Streamlit top 8, Tk top 5)
+# WAL mein readers writers ko block nahi karte; writes chhote transactions mein batch hote hain.
+# Size bound: insertion order (id) se sabse purani entries delete - reads par koi write nahi hota.
+# Purane model version ki entries kabhi hit nahi hoti aur isi eviction se nikal jaati hain (rolling deploy
+# mein dono versions ke processes ek saath chal sakte hain, isliye version change par eager delete nahi).
+
+import os
+import time
+import sqlite3
+import threading
+import numpy as np
+
+DEFAULT_STORE_PATH = 'prediction_cache.sqlite3'
+DEFAULT_MAX_ENTRIES = 200_000
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    key BLOB NOT NULL,
+    proba BLOB NOT NULL,
+    created REAL NOT NULL,
+    UNIQUE (namespace, key)
+)
+'''
+
+
+def open_connection(path):
+    """WAL mode SQLite connection (autocommit, busy timeout) - is file ke saare tables isi tarah khulte hain"""
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+    connection.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+    connection.execute('PRAGMA journal_mode = WAL')
+    # WAL ke saath NORMAL durable hai process crash par; power loss par aakhri kuch writes ja sakte hain
+    # - cache ke liye theek hai
+    connection.execute('PRAGMA synchronous = NORMAL')
+    return connection
+
+
+class SharedPredictionStore:
+    """
+    Cross-process (namespace, key) -> probabilities store
+    Har thread ka apna SQLite connection (Streamlit sessions alag threads mein) - connections share nahi hote
+    max_entries: isse zyada rows hon to sabse purani (insertion order) evict
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.evictions = 0
+        self._connect()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        # Fork ke baad parent ka connection child mein use nahi karna chahiye - naya kholte hain
+        if connection is None or self._local.pid != os.getpid():
+            connection = open_connection(self.path)
+            connection.execute(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, name, value):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def get_many(self, namespace, keys):
+        """keys: bytes ki list -> {key: probabilities (read-only array)} sirf mile hue keys ke liye"""
+        if not keys:
+            return {}
+        connection = self._connect()
+        found = {}
+        # SQLite ke host parameter limit ke andar chunks
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = connection.execute(
+                f'SELECT key, proba FROM predictions WHERE namespace = ? AND key IN ({",".join("?" * len(chunk))})',
+                [namespace, *chunk]).fetchall()
+            for key, proba in rows:
+                found[key] = np.frombuffer(proba, dtype=np.float64)
+        self._count('hits', len(found))
+        self._count('misses', len(keys) - len(found))
+        return found
+
+    def put_many(self, namespace, items):
+        """items: (key bytes, probabilities) pairs - ek transaction, phir size bound ke hisaab se eviction"""
+        if not items:
+            return
+        connection = self._connect()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.executemany(
+                'INSERT OR REPLACE INTO predictions (namespace, key, proba, created) VALUES (?, ?, ?, ?)',
+                [(namespace, key, np.asarray(proba, dtype=np.float64).tobytes(), now) for key, proba in items])
+            # Count se bound - id arithmetic nahi: INSERT OR REPLACE purani row hata ke naya id deta hai,
+            # ids mein gaps bante hain aur max(id) - max_entries zaroorat se zyada rows uda deta.
+            # Sabse naye max_entries rows mein aakhri wale ka id dhoondh ke usse purane sab delete
+            # (itne rows hi na hon to subquery NULL - kuch delete nahi)
+            evicted = connection.execute(
+                'DELETE FROM predictions WHERE id < '
+                '(SELECT id FROM predictions ORDER BY id DESC LIMIT 1 OFFSET ?)',
+                [self.max_entries - 1]).rowcount
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self._count('writes', len(items))
+        self._count('evictions', evicted)
+
+    def __len__(self):
+        return self._connect().execute('SELECT count(*) FROM predictions').fetchone()[0]
+
+    def clear(self):
+        self._connect().execute('DELETE FROM predictions')
+
+    def stats(self):
+        """Is process ke counters (store ka size saare processes ka)"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'file_mb': os.path.getsize(self.path) / 1e6 if os.path.exists(self.path) else 0.0,
+        }
+
+
+def _serve_requests(args):
+    """Benchmark worker - ek app process jaisa: apna local LRU, shared store sabke saath"""
+    path, requests, local_size = args
+    from model_artifact import load_model_components
+    from prediction_cache import PredictionCache
+
+    from synthetic_data import per_call_us
+
+    components = load_model_components()
+    cache = PredictionCache(maxsize=local_size, store=SharedPredictionStore(path))
+    us_per_request = per_call_us(lambda field: cache.predict_proba(components, field), requests)
+    stats = cache.stats()
+    return us_per_request, stats['hits'], stats['shared']['hits'], stats['shared']['writes']
+
+
+if __name__ == "__main__":
+    import tempfile
+    import multiprocessing
+    from model_artifact import load_model_components
+    from prediction_cache import PredictionCache, QUANTIZATION_STEPS
+    from feature_engineering import FIELD_COLUMNS, build_features
+    from synthetic_data import slider_requests
+
+    # Slider-jaisa traffic (prediction_cache ke benchmark jaisa) - defaults se 0-3 sliders hile hue
+    rng = np.random.default_rng(0)
+    n_requests = 4000
+    steps = np.array([QUANTIZATION_STEPS[column] for column in FIELD_COLUMNS])
+    requests = slider_requests(rng, n_requests, steps)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'predictions.sqlite3')
+        n_processes = 4
+        # Load balancer har process ko traffic ka alag hissa deta hai - sab concurrently read/write karte hain
+        shares = [(path, requests[p::n_processes], 256) for p in range(n_processes)]
+        with multiprocessing.get_context('fork').Pool(n_processes) as pool:
+            results = pool.map(_serve_requests, shares)
+        model_calls = sum(writes for _, _, _, writes in results)
+        grid = np.rint(requests / steps).astype(np.int64)
+        per_process = sum(len({tuple(row) for row in grid[p::n_processes].tolist()}) for p in range(n_processes))
+        distinct = len({tuple(row) for row in grid.tolist()})
+        print(f"{n_processes} processes, {n_requests:,} requests: local hits {sum(r[1] for r in results):,}, "
+              f"shared hits {sum(r[2] for r in results):,}, model calls {model_calls:,} "
+              f"(distinct inputs {distinct:,}; unbounded per-process caches alone would need {per_process:,})")
+
+        # Restart - naya process, local LRU khali, shared store garam
+        us_per_request, _, shared_hits, writes = _serve_requests((path, requests[:1000], 256))
+        print(f"Restarted process: {shared_hits:,} shared hits, {writes} model calls on 1,000 requests "
+              f"({us_per_request:.0f} us/request)")
+
+        # Store se aaye probabilities model jaise hi
+        components = load_model_components()
+        cache = PredictionCache(store=SharedPredictionStore(path))
+        expected = np.asarray(components['row_predictor'].predict_proba(build_features(requests[:500])))
+        assert np.array_equal(cache.predict_proba(components, requests[:500]), expected)
+        assert cache.store.hits == len({tuple(row) for row in cache.quantize(requests[:500]).tolist()})
+        print("✅ Shared-store probabilities identical to the predictor")
+
+        # Size bound
+        small = SharedPredictionStore(os.path.join(tmp_dir, 'small.sqlite3'), max_entries=1000)
+        for batch in range(50):
+            small.put_many('bench', [(np.int64(batch * 100 + i).tobytes(), np.zeros(20)) for i in range(100)])
+        assert len(small) == 1000 and small.evictions == 4000
+        assert small.get_many('bench', [np.int64(4999).tobytes(), np.int64(0).tobytes()]).keys() == \
+            {np.int64(4999).tobytes()}
+        # Replace se ids mein gaps - bound phir bhi poore max_entries rows rakhta hai
+        for _ in range(3):
+            small.put_many('bench', [(np.int64(4900 + i).tobytes(), np.ones(20)) for i in range(100)])
+        assert len(small) == 1000 and small.evictions == 4000
+        print(f"✅ Size bound: {small.stats()}")
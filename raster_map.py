@@ -0,0 +1,337 @@
+# Raster Suitability Mapping - Crop Recommendation System
+# District-wide maps ke liye gridded mode: har field ka ek co-registered .npy grid (same shape, same pixels)
+#   grids/soil_ph.npy, temperature.npy, rainfall.npy, nitrogen.npy, phosphorus.npy, potassium.npy, humidity.npy
+#   python raster_map.py grids/ maps/ --month 11 --tile-size 256 --workers 4
+# Month poore region ke liye ek hi hai (planting month). Grids mmap se khulte hain aur spatial tiles mein
+# padhe jaate hain - har tile ke pixels model se (bulk_score ka ChunkScorer, process pool) score hote hain
+# aur output grids mein seedhe likhe jaate hain:
+#   maps/top_crop.npy   - int16, crop index (metadata.json ki 'crops' list mein), -1 = no data
+#   maps/top_score.npy  - float32, top crop ki confidence (0-1), NaN = no data
+#   maps/metadata.json  - crop legend, month, model version, shape, optional lat/lon transform
+# Memory tile size par depend karti hai, region size par nahi: har tile ke liye mmap naya khulta aur band
+# hota hai (padhe hue pages process mein jama nahi hote), aur max 2 x workers tiles in flight rehte hain.
+
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+import numpy as np
+
+from model_artifact import load_model_components, DEFAULT_ARTIFACT_DIR
+from feature_engineering import FIELD_COLUMNS, validate_fields
+from bulk_score import ChunkScorer
+
+# Month ke alawa saare fields grids se aate hain
+GRID_FIELDS = [column for column in FIELD_COLUMNS if column != 'month']
+DEFAULT_TILE_SIZE = 256
+DEFAULT_MAP_DIR = 'suitability_map'
+TOP_CROP_FILE = 'top_crop.npy'
+TOP_SCORE_FILE = 'top_score.npy'
+METADATA_FILE = 'metadata.json'
+NO_DATA_CROP = -1
+
+
+def grid_paths(grid_dir, overrides=None):
+    """Field -> .npy path (grid_dir/<field>.npy, overrides {field: path} se badal sakte hain)"""
+    paths = {field: os.path.join(grid_dir, f'{field}.npy') for field in GRID_FIELDS}
+    paths.update(overrides or {})
+    missing = [field for field, path in paths.items() if not os.path.exists(path)]
+    if missing:
+        raise ValueError(f"Missing grids: {', '.join(f'{field} ({paths[field]})' for field in missing)}")
+    return paths
+
+
+def grid_shape(paths):
+    """Saare grids ka common (rows, cols) - shape alag ho to error (grids co-registered hone chahiye)"""
+    shapes = {field: np.load(path, mmap_mode='r').shape for field, path in paths.items()}
+    distinct = set(shapes.values())
+    if len(distinct) != 1 or len(next(iter(distinct))) != 2:
+        raise ValueError(f"Grids must be 2-D with the same shape, got {shapes}")
+    return distinct.pop()
+
+
+def iter_tiles(shape, tile_size=DEFAULT_TILE_SIZE):
+    """Row-major (row slice, col slice) windows - kinaare wali tiles chhoti ho sakti hain"""
+    if tile_size < 1 or int(tile_size) != tile_size:
+        raise ValueError(f"Tile size must be a positive integer, got {tile_size}")
+    n_rows, n_cols = shape
+    for row in range(0, n_rows, tile_size):
+        for col in range(0, n_cols, tile_size):
+            yield slice(row, min(row + tile_size, n_rows)), slice(col, min(col + tile_size, n_cols))
+
+
+def read_tile(paths, window, month, nodata=None):
+    """
+    Ek tile ke pixels -> (n x 8) fields (FIELD_COLUMNS order) aur validate_fields ke error messages
+    Har call mmap khol ke band karta hai - sirf is tile ke pages touch hote hain
+    nodata: grids ka sentinel value (jaise -9999) - NaN jaisa hi treat hota hai
+    """
+    rows, cols = window
+    n_pixels = (rows.stop - rows.start) * (cols.stop - cols.start)
+    fields = np.empty((n_pixels, len(FIELD_COLUMNS)), dtype=np.float64)
+    for field, path in paths.items():
+        grid = np.load(path, mmap_mode='r')
+        fields[:, FIELD_COLUMNS.index(field)] = grid[rows, cols].ravel()
+        del grid
+    fields[:, FIELD_COLUMNS.index('month')] = month
+    if nodata is not None:
+        fields[fields == nodata] = np.nan
+    return fields, validate_fields(fields)
+
+
+def create_outputs(output_dir, shape):
+    """Poore region ke output grids disk par (no-data se bhare) - tiles baad mein r+ mmap se likhti hain"""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, dtype, fill in ((TOP_CROP_FILE, np.int16, NO_DATA_CROP), (TOP_SCORE_FILE, np.float32, np.nan)):
+        grid = np.lib.format.open_memmap(os.path.join(output_dir, name), mode='w+', dtype=dtype, shape=shape)
+        # Row blocks mein fill - poora grid ek saath dirty pages nahi banta
+        for start in range(0, shape[0], DEFAULT_TILE_SIZE):
+            grid[start:start + DEFAULT_TILE_SIZE] = fill
+            grid.flush()
+        del grid
+
+
+def write_tile(output_dir, window, valid, top_idx, confidence):
+    """Ek tile ka result output grids mein - invalid pixels no-data hi rehte hain"""
+    rows, cols = window
+    tile_shape = (rows.stop - rows.start, cols.stop - cols.start)
+    crops = np.full(valid.shape, NO_DATA_CROP, dtype=np.int16)
+    scores = np.full(valid.shape, np.nan, dtype=np.float32)
+    crops[valid] = top_idx[:, 0]
+    scores[valid] = confidence[:, 0]
+    for name, values in ((TOP_CROP_FILE, crops), (TOP_SCORE_FILE, scores)):
+        grid = np.load(os.path.join(output_dir, name), mmap_mode='r+')
+        grid[rows, cols] = values.reshape(tile_shape)
+        grid.flush()
+        del grid
+
+
+def map_region(grid_dir, output_dir, month, tile_size=DEFAULT_TILE_SIZE, n_workers=0, nodata=None,
+               transform=None, overrides=None, artifact_dir=DEFAULT_ARTIFACT_DIR, progress=None):
+    """
+    Poore region ka suitability map banata hai; returns summary dict (pixels, valid, tiles, seconds)
+    transform: optional {'north': lat, 'west': lon, 'pixel_size': degrees} - pixel (0, 0) ka upper-left
+    corner; metadata mein likha jata hai taaki lat/lon se pixel dhoondha ja sake (pixel_for)
+    """
+    if not 1 <= month <= 12 or int(month) != month:
+        raise ValueError("Month must be between 1 and 12")
+    # create_outputs se pehle check - warna galat tile_size par khaali grids disk par reh jaate
+    if tile_size < 1 or int(tile_size) != tile_size:
+        raise ValueError(f"Tile size must be a positive integer, got {tile_size}")
+    if transform is not None and not transform['pixel_size'] > 0:
+        raise ValueError(f"Pixel size must be positive, got {transform['pixel_size']}")
+    paths = grid_paths(grid_dir, overrides)
+    shape = grid_shape(paths)
+    components = load_model_components(artifact_dir)
+    create_outputs(output_dir, shape)
+
+    scorer = ChunkScorer(artifact_dir, n_workers)
+    start = time.perf_counter()
+    summary = {'pixels': shape[0] * shape[1], 'valid': 0, 'tiles': 0}
+
+    def jobs():
+        for window in iter_tiles(shape, tile_size):
+            fields, errors = read_tile(paths, window, month, nodata)
+            valid = errors == ''
+            yield fields[valid], (window, valid)
+
+    try:
+        for (window, valid), top_idx, confidence in scorer.map(jobs(), 1):
+            write_tile(output_dir, window, valid, top_idx, confidence)
+            summary['valid'] += int(valid.sum())
+            summary['tiles'] += 1
+            if progress is not None:
+                progress(summary)
+    finally:
+        scorer.close()
+
+    metadata = {
+        'crops': components['crop_names'].tolist(),
+        'month': int(month),
+        'model_version': components.version,
+        'shape': list(shape),
+        'tile_size': tile_size,
+        'transform': transform,
+        'no_data_crop': NO_DATA_CROP,
+    }
+    with open(os.path.join(output_dir, METADATA_FILE), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def load_map(output_dir):
+    """(top_crop, top_score, metadata) - grids mmap se (read-only), poora map memory mein nahi aata"""
+    with open(os.path.join(output_dir, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    return (np.load(os.path.join(output_dir, TOP_CROP_FILE), mmap_mode='r'),
+            np.load(os.path.join(output_dir, TOP_SCORE_FILE), mmap_mode='r'), metadata)
+
+
+def pixel_for(metadata, latitude, longitude):
+    """Lat/lon -> (row, col) map ke transform se; transform na ho ya point map ke bahar ho to None"""
+    transform = metadata.get('transform')
+    if not transform:
+        return None
+    row = int(np.floor((transform['north'] - latitude) / transform['pixel_size']))
+    col = int(np.floor((longitude - transform['west']) / transform['pixel_size']))
+    n_rows, n_cols = metadata['shape']
+    if 0 <= row < n_rows and 0 <= col < n_cols:
+        return row, col
+    return None
+
+
+def lookup_location(latitude, longitude, output_dir=DEFAULT_MAP_DIR):
+    """Bane hue map mein is location ka (top crop, score, month) - map, transform ya data na ho to None"""
+    if not os.path.exists(os.path.join(output_dir, METADATA_FILE)):
+        return None
+    crops, scores, metadata = load_map(output_dir)
+    pixel = pixel_for(metadata, latitude, longitude)
+    if pixel is None or crops[pixel] == NO_DATA_CROP:
+        return None
+    return metadata['crops'][crops[pixel]], float(scores[pixel]), metadata['month']
+
+
+def write_sample_grids(grid_dir, shape, seed=0):
+    """
+    Benchmark ke liye district jaisi smooth grids (low-frequency patterns + noise), row blocks mein likhi
+    Kuch pixels NaN (river/urban mask jaisa)
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(grid_dir, exist_ok=True)
+    ranges = {'soil_ph': (4.5, 8.5), 'temperature': (10, 40), 'rainfall': (200, 2500), 'nitrogen': (20, 280),
+              'phosphorus': (10, 180), 'potassium': (20, 230), 'humidity': (35, 95)}
+    grids = {field: np.lib.format.open_memmap(os.path.join(grid_dir, f'{field}.npy'), mode='w+',
+                                              dtype=np.float32, shape=shape) for field in GRID_FIELDS}
+    phases = {field: rng.uniform(0, 2 * np.pi, 4) for field in GRID_FIELDS}
+    cols = np.linspace(0, 1, shape[1])
+    for start in range(0, shape[0], DEFAULT_TILE_SIZE):
+        rows = np.linspace(0, 1, shape[0])[start:start + DEFAULT_TILE_SIZE, None]
+        mask = np.sin(9 * rows + 4 * cols) > 0.97
+        for field, (low, high) in ranges.items():
+            a, b, c, d = phases[field]
+            pattern = (np.sin(3 * rows + a) * np.cos(2 * cols + b) + 0.5 * np.sin(7 * rows + 5 * cols + c)
+                       + 0.3 * np.cos(11 * cols + d)) / 1.8
+            values = low + (high - low) * (0.5 + 0.5 * pattern) + rng.normal(0, 0.02 * (high - low), pattern.shape)
+            grids[field][start:start + DEFAULT_TILE_SIZE] = np.where(mask, np.nan, values)
+    for grid in grids.values():
+        grid.flush()
+    del grids
+
+
+def _peak_rss_run(queue, grid_dir, output_dir, tile_size, artifact_dir):
+    import resource
+    map_region(grid_dir, output_dir, 11, tile_size, artifact_dir=artifact_dir)
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def benchmark(side=2000, tile_size=DEFAULT_TILE_SIZE):
+    """Throughput (workers ke saath), peak memory (tile size vs region size) aur direct model se equality"""
+    import tempfile
+
+    artifact_dir = os.path.abspath(DEFAULT_ARTIFACT_DIR)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        small, big = os.path.join(tmp_dir, 'small'), os.path.join(tmp_dir, 'big')
+        write_sample_grids(small, (side // 2, side // 2))
+        write_sample_grids(big, (side, side))
+        print(f"Region: {side:,} x {side:,} ({side * side:,} pixels), tiles {tile_size} x {tile_size}")
+
+        for n_workers in sorted({0, os.cpu_count(), 2}):
+            summary = map_region(big, os.path.join(tmp_dir, f'map_{n_workers}'), 11, tile_size, n_workers,
+                                 artifact_dir=artifact_dir)
+            print(f"workers={n_workers}: {summary['pixels'] / summary['seconds']:,.0f} pixels/s "
+                  f"({summary['seconds']:.1f}s, {summary['tiles']} tiles, {summary['valid']:,} valid)")
+        reference = np.load(os.path.join(tmp_dir, 'map_0', TOP_CROP_FILE))
+        for n_workers in sorted({os.cpu_count(), 2}):
+            assert np.array_equal(np.load(os.path.join(tmp_dir, f'map_{n_workers}', TOP_CROP_FILE)), reference)
+
+        # Peak RSS - har run ek fresh process mein; region 4x bada, tile size wahi
+        context = multiprocessing.get_context('spawn')
+        for grid_dir, label, size in ((small, 'region 1/4', tile_size), (big, 'full region', tile_size),
+                                      (big, 'full region', tile_size * 2)):
+            queue = context.Queue()
+            process = context.Process(target=_peak_rss_run,
+                                      args=(queue, grid_dir, os.path.join(tmp_dir, 'rss'), size, artifact_dir))
+            process.start()
+            peak = queue.get()
+            process.join()
+            print(f"Peak RSS, {label}, tile {size}: {peak / 1024:.0f} MB")
+
+        # Tiled map == poore region ka ek saath model predict (chhote crop par)
+        crops, scores, metadata = load_map(os.path.join(tmp_dir, 'map_0'))
+        window = (slice(side // 8, side // 3), slice(side // 2, side - side // 10))
+        fields, errors = read_tile(grid_paths(big), window, 11)
+        valid = errors == ''
+        model = load_model_components(artifact_dir)['model']
+        from feature_engineering import build_features
+        proba = model.predict_proba(build_features(fields[valid]))
+        expected = np.full(len(fields), NO_DATA_CROP)
+        expected[valid] = np.argsort(-proba, axis=1, kind='stable')[:, 0]
+        assert np.array_equal(crops[window].ravel(), expected)
+        assert np.allclose(scores[window].ravel()[valid], proba.max(axis=1))
+        assert np.isnan(scores[window].ravel()[~valid]).all()
+        shares = np.bincount(reference[reference >= 0], minlength=len(metadata['crops'])) / (reference >= 0).sum()
+        top = np.argsort(-shares)[:5]
+        print("✅ Tiled map matches the model; most suitable crops by area: " +
+              ', '.join(f"{metadata['crops'][i]} {shares[i]:.0%}" for i in top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-pixel crop suitability maps from gridded soil/weather data")
+    parser.add_argument('grid_dir', nargs='?', help="Directory with " + ', '.join(f'{f}.npy' for f in GRID_FIELDS))
+    parser.add_argument('output_dir', nargs='?', help="Where top_crop.npy, top_score.npy and metadata.json go")
+    parser.add_argument('--month', type=int, help="Planting month (1-12) for the whole region")
+    parser.add_argument('--grid', action='append', default=[], metavar='FIELD=PATH',
+                        help="Use PATH for one field instead of grid_dir/FIELD.npy")
+    parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Scoring processes (0 = score in this process)")
+    parser.add_argument('--nodata', type=float, help="Sentinel value marking missing pixels (NaN always is)")
+    parser.add_argument('--origin', type=float, nargs=2, metavar=('NORTH_LAT', 'WEST_LON'),
+                        help="Latitude/longitude of the upper-left corner of pixel (0, 0)")
+    parser.add_argument('--pixel-size', type=float, help="Pixel size in degrees (with --origin)")
+    parser.add_argument('--artifact-dir', default=DEFAULT_ARTIFACT_DIR)
+    parser.add_argument('--quiet', action='store_true')
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Throughput, peak memory and correctness check on generated grids")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+    if not args.grid_dir or not args.output_dir or args.month is None:
+        parser.error("grid_dir, output_dir and --month are required")
+    if (args.origin is None) != (args.pixel_size is None):
+        parser.error("--origin and --pixel-size go together")
+    if args.tile_size < 1:
+        parser.error("--tile-size must be at least 1")
+    if args.pixel_size is not None and not args.pixel_size > 0:
+        parser.error("--pixel-size must be positive")
+    transform = None
+    if args.origin is not None:
+        transform = {'north': args.origin[0], 'west': args.origin[1], 'pixel_size': args.pixel_size}
+    overrides = {}
+    for item in args.grid:
+        field, _, path = item.partition('=')
+        if field not in GRID_FIELDS or not path:
+            parser.error(f"--grid expects FIELD=PATH with FIELD one of {', '.join(GRID_FIELDS)}")
+        overrides[field] = path
+
+    def progress(summary):
+        print(f"\r{summary['tiles']:,} tiles, {summary['valid']:,} pixels scored", end='', file=sys.stderr)
+
+    try:
+        summary = map_region(args.grid_dir, args.output_dir, args.month, args.tile_size, args.workers, args.nodata,
+                             transform, overrides, args.artifact_dir, None if args.quiet else progress)
+    except (ValueError, FileNotFoundError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        sys.exit(2)
+    if not args.quiet:
+        print(f"\n✅ {summary['pixels']:,} pixels ({summary['valid']:,} with data) in {summary['seconds']:.1f}s "
+              f"-> {args.output_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
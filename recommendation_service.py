@@ -0,0 +1,524 @@
+# Recommendation Service - Crop Recommendation System
+# Local HTTP/JSON inference service (sirf asyncio, koi web framework nahi):
+#   POST /recommend  {"soil_ph": 6.5, "temperature": 25, ..., "month": 7, "top_k": 3}
+#   GET  /health     model version aur batching stats
+# Concurrent requests ek micro-batch mein jama hote hain (max batch size / max wait ms) aur ek hi
+# vectorized predict_proba call mein score hote hain - har request ka alag model call nahi.
+
+import re
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from model_artifact import load_model_components
+from feature_engineering import FIELD_COLUMNS, build_features, validate_fields
+from suitability import SuitabilityReport
+from synthetic_data import random_fields
+from worker_pool import WorkerPool, pool_memory
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH_SIZE = 64
+# 0 = wait nahi - model ke busy rehte jitne requests queue mein aa gaye wahi agla batch. Kam load par
+# per-request jitni latency, zyada load par apne aap bade batches (benchmark() dekho)
+DEFAULT_MAX_WAIT_MS = 0.0
+# Ek batch ka model call isse zyada chale (ya worker process mar jaye) to batch ke requests 500 paate hain
+# aur in-flight slot free ho jata hai - warna service hamesha ke liye atak jati
+DEFAULT_BATCH_TIMEOUT_S = 30.0
+MAX_TOP_K = 20
+MAX_BODY_BYTES = 64 * 1024
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def parse_field(payload):
+    """
+    Request JSON -> (field values list, top_k) - bulk_score wale hi checks (validate_fields)
+    Galat input par ValueError (HTTP 400) - JSON ke Infinity/NaN aur float range se bade ints bhi
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    missing = [column for column in FIELD_COLUMNS if column not in payload]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    field = []
+    for column in FIELD_COLUMNS:
+        value = payload[column]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"'{column}' must be a number")
+        try:
+            finite = np.isfinite(float(value))
+        except OverflowError:   # float range se bada int
+            finite = False
+        if not finite:
+            raise ValueError(f"'{column}' must be a finite number")
+        field.append(value)
+    error = validate_fields(field)[0]
+    if error:
+        raise ValueError(error)
+    top_k = payload.get('top_k', 3)
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or not (1 <= top_k <= MAX_TOP_K):
+        raise ValueError(f"'top_k' must be an integer between 1 and {MAX_TOP_K}")
+    return field, top_k
+
+
+class RecommendationEngine:
+    """
+    CropRecommendationSystem.recommend_crop jaisa output, lekin fields ke poore batch ke liye ek model call
+    Ek row ho to generated row predictor (sabse kam per-call overhead), warna flat forest engine
+    """
+
+    def __init__(self, components):
+        self.components = components
+        self.batch_predictor = components['predictor']
+        self.row_predictor = components['row_predictor']
+        self.crop_index = components['crop_index']
+
+    def warm_up(self):
+        """Dono predictors aur crop index pehle request se pehle hi load - pehle client ki latency mein unpickle na gine"""
+        field = [6.5, 25, 800, 120, 60, 60, 70, 7]
+        self.recommend([(field, 1)] * 2)
+        self.recommend([(field, 1)])
+
+    def recommend(self, requests):
+        """requests: (field, top_k) pairs -> har request ka response dict (same order)"""
+        fields = [field for field, _ in requests]
+        features = build_features(fields)
+        predictor = self.row_predictor if len(fields) == 1 else self.batch_predictor
+        proba = np.asarray(predictor.predict_proba(features), dtype=np.float64)
+
+        # recommend_crop jaisa order - confidence descending, barabar ho to class order (stable sort)
+        top_k = max(k for _, k in requests)
+        top_idx = np.argsort(-proba, axis=1, kind='stable')[:, :top_k]
+        suitability = SuitabilityReport(self.crop_index, fields, crop_idx=top_idx, display_values=fields)
+        info = self.crop_index.take(top_idx)
+        crop_names = self.crop_index.crop_names[top_idx]
+
+        responses = []
+        for row, (field, k) in enumerate(requests):
+            responses.append({
+                'recommendations': [{
+                    'crop': str(crop_names[row, j]),
+                    'confidence': float(proba[row, top_idx[row, j]]),
+                    'suitability_score': float(proba[row, top_idx[row, j]] * 100),
+                    'expected_yield': float(info['expected_yield'][row, j]),
+                    'crop_duration': float(info['crop_duration'][row, j]),
+                    'suitability_factors': suitability.factors(row, j),
+                } for j in range(k)],
+                'input_analysis': {
+                    'soil_ph': field[0],
+                    'temperature': field[1],
+                    'rainfall': field[2],
+                    'season': int(features[row, 8]),
+                    'soil_type': int(features[row, 9]),
+                    'month': field[7],
+                },
+            })
+        return responses
+
+
+class MicroBatcher:
+    """
+    Concurrent submit() calls ko batches mein jama karta hai
+    Pehla item aate hi max_wait_ms ka clock shuru; batch bhar gaya ya clock khatam - jo pehle ho.
+    Model call ek worker thread mein chalta hai taaki event loop naye requests padhta rahe.
+    workers (worker_pool.WorkerPool) diya ho to batches unke processes mein jaate hain - jitne workers,
+    utne batches ek saath in flight.
+    batch_timeout: har model call ka await isse zyada nahi (None = bina limit). In-process mode mein timeout
+    sirf requests ko fail karta hai - executor thread ko roka nahi ja sakta, isliye slot tabhi free hota hai
+    jab wo call sach mein khatam ho (tab tak naye batches queue mein rukte hain, executor ke peeche nahi)
+    """
+
+    def __init__(self, process_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 workers=None, batch_timeout=DEFAULT_BATCH_TIMEOUT_S):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self.batch_timeout = batch_timeout
+        self.batches = 0
+        self.items = 0
+        self.timeouts = 0
+        self._queue = None
+        self._task = None
+        self._slots = None
+        # Chal rahe _dispatch tasks - loop sirf weak reference rakhta hai, bina iske task GC ho sakta hai
+        self._dispatches = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model')
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers.size if self.workers is not None else 1)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        # In-flight batches poore hone do (batch_timeout tak), phir jo queue mein reh gaye unhe fail karo
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Service is shutting down"))
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Pehle jo already queue mein hai, bina wait ke
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Free worker milne tak naya batch shuru nahi - tab tak requests queue mein jama hote rehte hain
+            await self._slots.acquire()
+            batch = await self._collect()
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch):
+        items = [item for item, _ in batch]
+        running = None
+        try:
+            if self.workers is not None:
+                results = await self.workers.run(items, self.batch_timeout)
+            else:
+                running = asyncio.get_running_loop().run_in_executor(self._executor, self.process_batch, items)
+                # shield - timeout par wait_for executor future ko cancel na kare, uska done hona hi slot free karta hai
+                results = await asyncio.wait_for(asyncio.shield(running), self.batch_timeout)
+        except Exception as error:
+            if isinstance(error, asyncio.TimeoutError):
+                self.timeouts += 1
+                error = RuntimeError(f"Model batch timed out after {self.batch_timeout} s")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            if running is not None and not running.done():
+                running.add_done_callback(self._release_after_timeout)
+            else:
+                self._slots.release()
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():   # client chala gaya to future cancel ho chuka hoga
+                future.set_result(result)
+
+    def _release_after_timeout(self, running):
+        """Timed-out in-process call aakhir khatam hua - result/exception phenk ke slot free"""
+        if not running.cancelled():
+            running.exception()
+        self._slots.release()
+
+    def stats(self):
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'requests': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'timeouts': self.timeouts,
+        }
+
+
+class RecommendationService:
+    """HTTP/1.1 (keep-alive) server - asyncio streams par seedha"""
+
+    def __init__(self, components, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                 workers=0, share_model=True, batch_timeout=DEFAULT_BATCH_TIMEOUT_S):
+        self.components = components
+        self.engine = RecommendationEngine(components)
+        self.engine.warm_up()
+        # workers > 0: pre-fork pool - event loop shuru hone se pehle, warm engine ke saath fork
+        self.workers = WorkerPool(self.engine, workers, share_model) if workers else None
+        self.batcher = MicroBatcher(self.engine.recommend, max_batch_size, max_wait_ms, self.workers, batch_timeout)
+        self._server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.batcher.stop()
+
+    def close(self):
+        if self.workers is not None:
+            self.workers.close()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    # Headers stream ki limit (64 KiB) se bade
+                    await self._respond(writer, 413, {'error': 'Request headers too large'}, keep_alive=False)
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                method, path, _ = (request_line.split(' ') + ['', ''])[:3]
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = headers.get('content-length', '') or '0'
+                # Sirf ASCII digits - int() '-5', ' 1_0 ' ya unicode digits bhi maan leta
+                if not re.fullmatch(r'[0-9]+', length):
+                    await self._respond(writer, 400, {'error': 'Invalid Content-Length'}, keep_alive=False)
+                    break
+                if len(length) > len(str(MAX_BODY_BYTES)) or int(length) > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'Request body too large'}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(int(length))
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    # Client Content-Length se kam bytes bhej ke chala gaya
+                    break
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == '/health':
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}
+            return 200, {'status': 'ok', 'model_version': self.components.version,
+                         'batching': self.batcher.stats(),
+                         'workers': self.workers.pids() if self.workers is not None else []}
+        if path == '/recommend':
+            if method != 'POST':
+                return 405, {'error': 'Use POST'}
+            try:
+                request = parse_field(json.loads(body or b'null'))
+            except ValueError as error:   # json.JSONDecodeError bhi ValueError hai
+                return 400, {'error': str(error)}
+            try:
+                return 200, await self.batcher.submit(request)
+            except Exception as error:
+                return 500, {'error': f"An error occurred: {error}"}
+        return 404, {'error': f"Unknown path {path}"}
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+
+def create_service(max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS, workers=0,
+                   share_model=True, batch_timeout=DEFAULT_BATCH_TIMEOUT_S):
+    """Artifact load + warm up (+ workers fork) - asyncio.run se pehle bulana hai"""
+    return RecommendationService(load_model_components(), max_batch_size, max_wait_ms, workers, share_model,
+                                 batch_timeout)
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    """Service chalao jab tak cancel na ho; ready (multiprocessing.Event) listen shuru hone par set hota hai"""
+    server = await service.start(host, port)
+    workers = f", {service.workers.size} workers" if service.workers is not None else ""
+    print(f"Serving on http://{host}:{port} (max batch {service.batcher.max_batch_size}, "
+          f"max wait {service.batcher.max_wait * 1000} ms{workers})")
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.batcher.stop()
+
+
+# Load generator - concurrent keep-alive clients, har client requests ek ke baad ek bhejta hai
+async def _client(host, port, bodies, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            writer.write(f"POST /recommend HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+            response = await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b'HTTP/1.1 200'):
+                raise RuntimeError(response.decode())
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, fields, concurrency):
+    """fields ko concurrency clients mein baant ke bhejta hai - (latencies seconds, total elapsed)"""
+    bodies = [json.dumps(dict(zip(FIELD_COLUMNS, field))).encode() for field in fields]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, bodies[c::concurrency], latencies) for c in range(concurrency)])
+    return np.array(latencies), time.perf_counter() - start
+
+
+def _benchmark_fields(n_requests):
+    """Slider ranges mein random requests (synthetic_data.random_fields) - JSON mein pH float, baaki int"""
+    fields = random_fields(np.random.default_rng(0), n_requests).tolist()
+    return [[float(v) if i == 0 else int(v) for i, v in enumerate(field)] for field in fields]
+
+
+def _benchmark_run(host, port, fields, concurrency, serve_args, start_timeout, measure_memory=False):
+    """
+    Service alag (spawn) process mein chala ke load bhejta hai - returns (p50 ms, p99 ms, req/s, health, memory)
+    serve_args: _serve_process ke (max_batch_size, max_wait_ms[, workers, share_model]); memory load ke baad
+    parent + workers ka pool_memory (measure_memory par, warna None)
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    ready = context.Event()
+    process = context.Process(target=_serve_process, args=(host, port, *serve_args[:2], ready, *serve_args[2:]))
+    process.start()
+    try:
+        if not ready.wait(start_timeout):
+            raise RuntimeError("Service did not start")
+        latencies, elapsed = asyncio.run(run_load(host, port, fields, concurrency))
+        health = asyncio.run(_get_health(host, port))
+        memory = pool_memory([process.pid] + health['workers']) if measure_memory else None
+    finally:
+        process.terminate()
+        process.join()
+    latencies_ms = latencies * 1000
+    return (np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99), len(fields) / elapsed,
+            health, memory)
+
+
+def benchmark(host=DEFAULT_HOST, port=DEFAULT_PORT, n_requests=5000, concurrency_levels=(4, 64)):
+    """
+    Per-request inference (batch size 1) vs micro-batching - har config ka server alag process mein
+    Kam concurrency par batch bharta nahi aur max wait seedha latency mein judta hai - dono levels dikhate hain
+    """
+    fields = _benchmark_fields(n_requests)
+    print(f"{n_requests:,} requests per run")
+    print(f"{'clients':>7} {'mode':>24} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'mean batch':>11}")
+    configs = (('per-request', 1, 0.0), ('micro-batch 64 / 0 ms', 64, 0.0),
+               ('micro-batch 64 / 2 ms', 64, 2.0), ('micro-batch 256 / 5 ms', 256, 5.0))
+    for concurrency, (label, max_batch_size, max_wait_ms) in (
+            (concurrency, config) for concurrency in concurrency_levels for config in configs):
+        p50, p99, throughput, health, _ = _benchmark_run(host, port, fields, concurrency,
+                                                          (max_batch_size, max_wait_ms), 60)
+        print(f"{concurrency:>7} {label:>24} {p50:8.1f} {p99:8.1f} {throughput:8.0f} "
+              f"{health['batching']['mean_batch_size']:11.1f}")
+
+
+def benchmark_workers(host=DEFAULT_HOST, port=DEFAULT_PORT, n_requests=5000, concurrency=64, worker_counts=None):
+    """
+    Pre-fork pool scaling - workers 1..N (fork, shared model) vs har worker apna model load kare (spawn)
+    Memory load ke baad parent + workers ki: RSS shared pages har process mein ginta hai, PSS unhe baant deta hai
+    """
+    import os
+
+    n_cores = os.cpu_count()
+    worker_counts = worker_counts or sorted({1, 2, 4, n_cores})
+    fields = _benchmark_fields(n_requests)
+    print(f"{n_requests:,} requests, {concurrency} clients, {n_cores} CPU core(s)")
+    print(f"{'workers':>7} {'model':>14} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'RSS MB':>8} {'PSS MB':>8}")
+    runs = [(0, True)] + [(n, share) for n in worker_counts for share in (True, False)]
+    for workers, share_model in runs:
+        p50, p99, throughput, _, memory = _benchmark_run(
+            host, port, fields, concurrency, (DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, workers, share_model),
+            120, measure_memory=True)
+        label = 'in-process' if not workers else ('forked (CoW)' if share_model else 'loaded each')
+        rss, pss = (f"{memory['rss'] / 1024:8.0f}", f"{memory['pss'] / 1024:8.0f}") if memory else ('-', '-')
+        print(f"{workers:>7} {label:>14} {throughput:8.0f} {p50:8.1f} {p99:8.1f} {rss:>8} {pss:>8}")
+
+
+def _serve_process(host, port, max_batch_size, max_wait_ms, ready, workers=0, share_model=True):
+    import contextlib
+    import io
+    import signal
+    import sys
+    # terminate() par bhi finally chale - worker pool band ho, orphan processes na bachein
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    service = create_service(max_batch_size, max_wait_ms, workers, share_model)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(serve(service, host, port, ready))
+    finally:
+        service.close()
+
+
+async def _get_health(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop recommendation HTTP/JSON service")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Pre-forked model worker processes sharing the loaded model (0 = in-process)")
+    parser.add_argument('--batch-timeout', type=float, default=DEFAULT_BATCH_TIMEOUT_S, metavar='SECONDS',
+                        help="Fail a model batch (HTTP 500) that takes longer than this")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="Per-request vs micro-batching latency/throughput under a local load generator")
+    parser.add_argument('--benchmark-workers', action='store_true',
+                        help="Throughput and memory of the pre-fork worker pool from 1 to N workers")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.host, args.port)
+    elif args.benchmark_workers:
+        benchmark_workers(args.host, args.port)
+    else:
+        service = create_service(args.max_batch_size, args.max_wait_ms, args.workers,
+                                 batch_timeout=args.batch_timeout)
+        try:
+            asyncio.run(serve(service, args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
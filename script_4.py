@@ -1,42 +1,26 @@
+from feature_engineering import season_from_month, soil_type_from_nutrients, build_features
+from crop_metadata import CropMetadataIndex
+from suitability import SuitabilityReport
+from feasibility import FeasibilityIndex, NO_VIABLE_CROP, prefilter_stats
+
 class CropRecommendationSystem:
     def __init__(self, model, scaler, crop_database, feature_names):
         self.model = model
         self.scaler = scaler
         self.crop_db = crop_database
         self.feature_names = feature_names
+        # Crop metadata model ke class order mein - recommendations ka join bina DataFrame scan ke
+        self.crop_index = CropMetadataIndex(crop_database, model.classes_)
+        # Crop ranges (+ training margins) ke hard-constraint envelopes - recommend_batch(prefilter=True)
+        self.feasibility = FeasibilityIndex(self.crop_index)
         
-    def get_season_from_month(self, month):
-        """Convert month to season"""
-        if month in [6, 7, 8, 9]:
-            return 1  # Kharif
-        elif month in [10, 11, 12, 1]:
-            return 2  # Rabi
-        elif month in [3, 4, 5]:
-            return 3  # Zaid
-        else:
-            return 2  # Default to Rabi
-    
-    def determine_soil_type(self, soil_ph, nitrogen, phosphorus, potassium):
-        """Determine soil type based on nutrient content"""
-        # Simple heuristic based on nutrient levels
-        if nitrogen > 150 and phosphorus > 80 and potassium > 100:
-            return 4  # Alluvial (very fertile)
-        elif nitrogen > 100 and phosphorus > 60:
-            return 5  # Black soil (cotton belt)
-        elif nitrogen < 80 and phosphorus < 40:
-            return 1  # Sandy (low nutrients)
-        elif soil_ph > 7.0:
-            return 3  # Clay (alkaline)
-        else:
-            return 2  # Loamy (balanced)
-    
     def recommend_crop(self, soil_ph, temperature, rainfall, nitrogen, 
                       phosphorus, potassium, humidity, month, latitude=None, longitude=None):
         """
         Recommend the best crop based on input parameters
         """
-        season = self.get_season_from_month(month)
-        soil_type = self.determine_soil_type(soil_ph, nitrogen, phosphorus, potassium)
+        season = season_from_month(month)
+        soil_type = soil_type_from_nutrients(soil_ph, nitrogen, phosphorus, potassium)
         
         input_data = np.array([[
             soil_ph, temperature, rainfall, nitrogen, phosphorus, 
@@ -50,20 +34,21 @@ class CropRecommendationSystem:
         for i, crop in enumerate(crop_names):
             recommendations.append({
                 'crop': crop,
+                'class_index': i,
                 'confidence': probabilities[i],
                 'suitability_score': probabilities[i] * 100
             })
         
         recommendations = sorted(recommendations, key=lambda x: x['confidence'], reverse=True)
         
+        # Saari crops ke ranges ek pass mein; factor strings sirf top 3 ke liye bante hain
+        field = [soil_ph, temperature, rainfall, nitrogen, phosphorus, potassium, humidity, month]
+        suitability = SuitabilityReport(self.crop_index, [field], display_values=[field])
+        
         top_recommendations = []
         for rec in recommendations[:3]:
-            crop_info = self.crop_db[self.crop_db['crop_name'] == rec['crop']].iloc[0]
-            
-            suitability_factors = self._analyze_suitability(
-                soil_ph, temperature, rainfall, nitrogen, phosphorus, 
-                potassium, humidity, month, crop_info
-            )
+            crop_info = self.crop_index.row(rec['class_index'])
+            suitability_factors = suitability.factors(0, rec['class_index'])
             
             top_recommendations.append({
                 'crop': rec['crop'],
@@ -86,37 +71,81 @@ class CropRecommendationSystem:
             }
         }
     
-    def _analyze_suitability(self, soil_ph, temperature, rainfall, nitrogen, 
-                           phosphorus, potassium, humidity, month, crop_info):
-        """Analyze why a crop is suitable"""
-        factors = []
-        
-        if crop_info['soil_ph_min'] <= soil_ph <= crop_info['soil_ph_max']:
-            factors.append(f"Soil pH ({soil_ph:.1f}) is optimal")
-        else:
-            factors.append(f"Soil pH ({soil_ph:.1f}) needs adjustment")
-        
-        if crop_info['temp_min'] <= temperature <= crop_info['temp_max']:
-            factors.append(f"Temperature ({temperature}°C) is suitable")
-        else:
-            factors.append(f"Temperature ({temperature}°C) may be challenging")
-        
-        if crop_info['rainfall_min'] <= rainfall <= crop_info['rainfall_max']:
-            factors.append(f"Rainfall ({rainfall}mm) is adequate")
-        else:
-            factors.append(f"Rainfall ({rainfall}mm) may need irrigation/drainage")
-        
-        if crop_info['nitrogen_min'] <= nitrogen <= crop_info['nitrogen_max']:
-            factors.append("Nitrogen levels are good")
-        else:
-            factors.append("Nitrogen levels need adjustment")
-            
-        if crop_info['plant_month_start'] <= month <= crop_info['plant_month_end']:
-            factors.append("Good planting time")
+    def recommend_batch(self, fields, top_k=3, chunk_size=100000, include_suitability=False, prefilter=False):
+        """
+        Bahut saare fields ek saath - DataFrame (FIELD_COLUMNS wale columns) ya ndarray (n x 8, same order)
+        Season aur soil type vectorized nikalte hain, har chunk par ek hi predict_proba call,
+        top-k argpartition se. Result columnar dict hai - har key ek array:
+          crop, confidence, suitability_score, expected_yield, crop_duration: (n, top_k)
+          season, soil_type: (n,)
+        include_suitability=True par 'suitability' - top-k crops ka SuitabilityReport (n x top_k x params),
+        text sirf report.factors(row, j) par banta hai
+        prefilter=True par crop envelopes hard constraints hain: model sirf un rows par chalta hai jinke liye
+        koi crop feasible hai, aur sirf feasible crops recommend hoti hain. Baaki slots mein crop NO_VIABLE_CROP,
+        confidence 0, yield/duration NaN. Extra keys: 'feasible' (n, top_k), 'viable' (n,) aur
+        'prefilter' - prefilter_stats() (kitni rows/crop pairs model se bache)
+        """
+        features = build_features(fields)
+        n_fields = len(features)
+
+        crop_names = self.model.classes_
+        top_k = min(top_k, len(crop_names))
+        top_idx = np.zeros((n_fields, top_k), dtype=np.intp)
+        confidence = np.zeros((n_fields, top_k))
+        if prefilter:
+            feasible = self.feasibility.feasible(features[:, :8])
+            scored = np.flatnonzero(feasible.any(axis=1))
         else:
-            factors.append("Consider different planting time")
-        
-        return factors
+            scored = np.arange(n_fields)
+
+        for start in range(0, len(scored), chunk_size):
+            rows = scored[start:start + chunk_size]
+            proba = self.model.predict_proba(features[rows])
+            if prefilter:
+                # Infeasible crops 0 probability wali feasible crops se bhi neeche rank hon
+                proba = np.where(feasible[rows], proba, -1.0)
+            top_idx[rows], confidence[rows] = self._top_k(proba, top_k)
+
+        info = self.crop_index.take(top_idx)
+        result = {
+            'crop': self.crop_index.crop_names[top_idx],
+            'confidence': confidence,
+            'suitability_score': confidence * 100,
+            'expected_yield': info['expected_yield'],
+            'crop_duration': info['crop_duration'],
+            'season': features[:, 8].astype(np.int64),
+            'soil_type': features[:, 9].astype(np.int64),
+        }
+        if prefilter:
+            # Non-viable rows model tak gaye hi nahi - unke saare slots (aur kam feasible crops wali rows ke
+            # bache slots) "no viable crop" result
+            slot_feasible = np.take_along_axis(feasible, top_idx, axis=1)
+            result['crop'] = np.where(slot_feasible, result['crop'], NO_VIABLE_CROP)
+            result['confidence'] = np.where(slot_feasible, confidence, 0.0)
+            result['suitability_score'] = result['confidence'] * 100
+            result['expected_yield'] = np.where(slot_feasible, info['expected_yield'], np.nan)
+            result['crop_duration'] = np.where(slot_feasible, info['crop_duration'], np.nan)
+            result['feasible'] = slot_feasible
+            result['viable'] = slot_feasible[:, 0]
+            result['prefilter'] = prefilter_stats(feasible)
+        if include_suitability:
+            result['suitability'] = SuitabilityReport(self.crop_index, features[:, :8], crop_idx=top_idx)
+        return result
+
+    @staticmethod
+    def _top_k(proba, top_k):
+        """Har row ki top-k (class indices, probabilities), confidence descending"""
+        # argpartition se har row ki k-th sabse badi confidence; usse badi saari crops, aur barabar wali
+        # crops mein se class order mein pehli - recommend_crop ka stable sort bhi yahi chunta hai
+        kth = np.take_along_axis(proba, np.argpartition(-proba, top_k - 1, axis=1)[:, top_k - 1:top_k], axis=1)
+        above = proba > kth
+        tied = proba == kth
+        chosen = above | (tied & (np.cumsum(tied, axis=1) <= top_k - above.sum(axis=1, keepdims=True)))
+        best = np.nonzero(chosen)[1].reshape(-1, top_k)
+        best_proba = np.take_along_axis(proba, best, axis=1)
+        # recommend_crop jaisa order: confidence descending, barabar ho to class order
+        order = np.lexsort((best, -best_proba), axis=1)
+        return np.take_along_axis(best, order, axis=1), np.take_along_axis(best_proba, order, axis=1)
 
 crop_system = CropRecommendationSystem(rf_model, scaler, crop_df, feature_names)
 
@@ -63,4 +63,56 @@ for i, rec in enumerate(recommendations['recommendations'], 1):
     print(f"\n{i}. {rec['crop']}")
     print(f"   Confidence: {rec['confidence']:.3f}")
     print(f"   Suitability Score: {rec['suitability_score']:.1f}%")
-    print(f"   Expected Yield: {rec['expected_yield']} quintals/hectare")
\ No newline at end of file
+    print(f"   Expected Yield: {rec['expected_yield']} quintals/hectare")
+
+print("\n" + "="*60)
+
+print("Test Case 4: Batch recommendations (soil health card batch)")
+import time
+
+# Random fields - sliders wali ranges mein
+rng = np.random.default_rng(0)
+n_fields = 100000
+fields = pd.DataFrame({
+    'soil_ph': rng.uniform(4.0, 9.0, n_fields).round(1),
+    'temperature': rng.integers(5, 46, n_fields),
+    'rainfall': rng.integers(100, 3001, n_fields),
+    'nitrogen': rng.integers(0, 301, n_fields),
+    'phosphorus': rng.integers(0, 201, n_fields),
+    'potassium': rng.integers(0, 251, n_fields),
+    'humidity': rng.integers(30, 101, n_fields),
+    'month': rng.integers(1, 13, n_fields),
+})
+
+start = time.perf_counter()
+batch = crop_system.recommend_batch(fields)
+batch_time = time.perf_counter() - start
+
+# Single-row API ko kuch hi rows par chalate hain - poore batch par bahut der lagti
+n_loop = 200
+start = time.perf_counter()
+for row in fields.head(n_loop).itertuples(index=False):
+    single = crop_system.recommend_crop(*row)
+loop_time = time.perf_counter() - start
+
+# Batch ka pehla result single-row API se match hona chahiye
+top_single = [rec['crop'] for rec in crop_system.recommend_crop(*fields.iloc[0])['recommendations']]
+print(f"First field - batch: {list(batch['crop'][0])}, single: {top_single}")
+print(f"recommend_batch: {n_fields:,} fields in {batch_time:.2f}s ({n_fields / batch_time:,.0f} fields/sec)")
+print(f"recommend_crop loop: {n_loop} fields in {loop_time:.2f}s ({n_loop / loop_time:,.0f} fields/sec)")
+
+print("\n" + "="*60)
+
+print("Test Case 5: Hard-constraint prefilter (same batch)")
+start = time.perf_counter()
+filtered = crop_system.recommend_batch(fields, prefilter=True)
+filtered_time = time.perf_counter() - start
+
+stats = filtered['prefilter']
+print(f"Fields with no viable crop: {stats['fields_skipped']:,} of {stats['fields']:,} "
+      f"({stats['skipped_fraction']:.1%}) - model skipped for these")
+print(f"Crop pairs pruned: {stats['pairs_pruned_fraction']:.1%}")
+print(f"recommend_batch(prefilter=True): {filtered_time:.2f}s vs {batch_time:.2f}s without")
+viable = np.flatnonzero(filtered['viable'])
+if len(viable):
+    print(f"First viable field: {list(filtered['crop'][viable[0]])}")
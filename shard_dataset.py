@@ -0,0 +1,182 @@
+# Out-of-core Synthetic Dataset - Crop Recommendation System
+# Data ko fixed-size chunks mein generate karke disk par .npy shards mein likhta hai
+# Har shard memory-map ho sakta hai, isliye RAM se bade training sets bhi ban sakte hain
+
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from synthetic_data import FEATURE_NAMES, LABEL_DTYPE, crop_parameter_arrays, plan_tasks, _run_task
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def iter_synthetic_chunks(crop_df, samples_per_crop=300, chunk_size=10000, seed=42):
+    """
+    Synthetic data ko chunks mein yield karta hai - (X_chunk float32, y_chunk int16 label codes)
+
+    Chunk k mein har crop ke k-th task ke rows hote hain (shuffled), isliye har chunk
+    mein saari crops equal proportion mein hoti hain. Rows wahi hain jo
+    generate_synthetic_data(..., chunk_size=chunk_size) deta hai, sirf order alag hai.
+    Memory peak ~ n_crops * chunk_size rows.
+    """
+    params = crop_parameter_arrays(crop_df)
+    n_crops = len(crop_df)
+    tasks = plan_tasks(n_crops, samples_per_crop, chunk_size)
+    n_chunks = len(tasks) // n_crops
+
+    # spawn() ke children index se decide hote hain - pehle len(tasks) data streams
+    # in-memory generator jaise hi hain, baaki shuffle ke liye
+    children = np.random.SeedSequence(seed).spawn(len(tasks) + n_chunks)
+
+    for chunk_idx in range(n_chunks):
+        blocks, labels = [], []
+        for crop_idx in range(n_crops):
+            task_idx = crop_idx * n_chunks + chunk_idx
+            _, _, n_samples = tasks[task_idx]
+            blocks.append(_run_task((params, children[task_idx], crop_idx, n_samples)))
+            labels.append(np.full(n_samples, crop_idx, dtype=LABEL_DTYPE))
+
+        X_chunk = np.concatenate(blocks).astype(np.float32)
+        y_chunk = np.concatenate(labels)
+        order = np.random.default_rng(children[len(tasks) + chunk_idx]).permutation(len(X_chunk))
+        yield X_chunk[order], y_chunk[order]
+
+
+def write_shards(crop_df, out_dir, samples_per_crop=300, chunk_size=10000, seed=42):
+    """
+    Har chunk ko ek shard (shard_XXXXX_X.npy + shard_XXXXX_y.npy) mein likhta hai
+    aur manifest.json banata hai (manifest['classes'][code] = crop name). Returns ShardedDataset.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    shards = []
+
+    for shard_idx, (X_chunk, y_chunk) in enumerate(
+            iter_synthetic_chunks(crop_df, samples_per_crop, chunk_size, seed)):
+        name = f'shard_{shard_idx:05d}'
+        np.save(os.path.join(out_dir, f'{name}_X.npy'), X_chunk)
+        np.save(os.path.join(out_dir, f'{name}_y.npy'), y_chunk)
+        shards.append({'name': name, 'rows': len(X_chunk)})
+
+    manifest = {
+        'feature_names': list(FEATURE_NAMES),
+        'classes': crop_df['crop_name'].tolist(),
+        'samples_per_crop': samples_per_crop,
+        'chunk_size': chunk_size,
+        'seed': seed,
+        'total_rows': sum(shard['rows'] for shard in shards),
+        'shards': shards,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return ShardedDataset(out_dir)
+
+
+class ShardedDataset:
+    """Disk par rakhe shards ka read-only view - arrays mmap_mode='r' mein khulte hain"""
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        self.feature_names = self.manifest['feature_names']
+        self.shards = self.manifest['shards']
+
+    def __len__(self):
+        return self.manifest['total_rows']
+
+    def load_shard(self, shard_idx):
+        """Ek shard ke (X, y) memory-mapped arrays"""
+        name = self.shards[shard_idx]['name']
+        X = np.load(os.path.join(self.root, f'{name}_X.npy'), mmap_mode='r')
+        y = np.load(os.path.join(self.root, f'{name}_y.npy'), mmap_mode='r')
+        return X, y
+
+    def split(self, test_size=0.2):
+        """
+        train_test_split ki jagah har shard ke andar row ranges par split - har shard ke aakhri
+        test_size hisse ke rows test set. Shard ke rows shuffled hain aur har shard mein saari crops barabar,
+        isliye test set random aur lagbhag stratified hai; test_size kitne bhi shards par sahi (ek par bhi)
+        Train ya test khali reh jaye to ValueError
+        Returns (train_ranges, test_ranges) - (shard_idx, start, stop) ki lists
+        """
+        if not 0 < test_size < 1:
+            raise ValueError(f"test_size must be between 0 and 1, got {test_size}")
+        train_ranges, test_ranges = [], []
+        for shard_idx, shard in enumerate(self.shards):
+            n_rows = shard['rows']
+            cut = n_rows - int(round(n_rows * test_size))
+            if cut > 0:
+                train_ranges.append((shard_idx, 0, cut))
+            if cut < n_rows:
+                test_ranges.append((shard_idx, cut, n_rows))
+        if not test_ranges or not train_ranges:
+            raise ValueError(f"test_size={test_size} leaves an empty train or test set for "
+                             f"{len(self)} rows in {len(self.shards)} shards")
+        return train_ranges, test_ranges
+
+    def _row_range(self, part):
+        """Shard index (poora shard) ya (shard_idx, start, stop) -> (shard_idx, start, stop)"""
+        if isinstance(part, (int, np.integer)):
+            return int(part), 0, self.shards[part]['rows']
+        return part
+
+    def iter_batches(self, parts):
+        """Shards (ya shard row ranges) ko ek-ek karke yield karta hai - mini-batch training ke liye"""
+        for part in parts:
+            shard_idx, start, stop = self._row_range(part)
+            X, y = self.load_shard(shard_idx)
+            yield X[start:stop], y[start:stop]
+
+    def num_rows(self, parts):
+        return sum(stop - start for _, start, stop in map(self._row_range, parts))
+
+    def materialize(self, parts, prefix):
+        """
+        Diye gaye shards / shard row ranges ko ek contiguous on-disk .npy (X aur y) mein jodta hai aur memmap
+        return karta hai. Copy shard-by-shard hoti hai, isliye RAM peak ek shard jitna hi rehta hai
+        """
+        if not parts:
+            raise ValueError("No shards to materialize")
+        n_rows = self.num_rows(parts)
+        first_X, first_y = self.load_shard(self._row_range(parts[0])[0])
+        X_out = np.lib.format.open_memmap(f'{prefix}_X.npy', mode='w+',
+                                          dtype=first_X.dtype, shape=(n_rows, first_X.shape[1]))
+        y_out = np.lib.format.open_memmap(f'{prefix}_y.npy', mode='w+',
+                                          dtype=first_y.dtype, shape=(n_rows,))
+
+        offset = 0
+        for X_shard, y_shard in self.iter_batches(parts):
+            X_out[offset:offset + len(X_shard)] = X_shard
+            y_out[offset:offset + len(y_shard)] = y_shard
+            offset += len(X_shard)
+
+        X_out.flush()
+        y_out.flush()
+        return X_out, y_out
+
+
+if __name__ == "__main__":
+    import tempfile
+    import tracemalloc
+
+    crop_df = pd.read_csv('crop_database.csv')
+    samples_per_crop, chunk_size = 50000, 5000
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        tracemalloc.start()
+        start = time.perf_counter()
+        dataset = write_shards(crop_df, out_dir, samples_per_crop=samples_per_crop, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        full_size = len(dataset) * len(FEATURE_NAMES) * 4
+        print(f"✅ Wrote {len(dataset):,} rows in {len(dataset.shards)} shards ({elapsed:.2f}s)")
+        print(f"📦 Full X matrix would be {full_size / 1e6:.1f} MB, streaming peak was {peak / 1e6:.1f} MB")
+
+        train_ranges, test_ranges = dataset.split(test_size=0.2)
+        print(f"✅ Train rows: {dataset.num_rows(train_ranges):,}, Test rows: {dataset.num_rows(test_ranges):,}")
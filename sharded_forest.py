@@ -0,0 +1,170 @@
+# Sharded Forest Training - Crop Recommendation System
+# Bade synthetic sets par har worker process ek alag data shard + alag seed par sub-forest train karta hai,
+# phir saare sub-forests ek RandomForestClassifier mein merge ho jaate hain (estimators_ concat).
+# Merged model normal sklearn forest hai - apps bina kisi change ke load kar lete hain.
+
+import time
+import resource
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import RandomForestClassifier
+
+from synthetic_data import _pool_context
+
+# Worker processes ko data fork ke through milta hai (pickle copy nahi)
+_WORKER_DATA = {}
+
+
+def _init_worker(X, y):
+    _WORKER_DATA['X'] = X
+    _WORKER_DATA['y'] = y
+
+
+def _proc_status_mb(field):
+    """/proc/self/status se VmRSS / VmHWM (MB) - Linux only, warna None"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _start_memory_probe():
+    """
+    Peak RSS counter reset karke baseline RSS return karta hai
+    Forked worker ke RSS mein parent ke shared pages bhi gine jaate hain, isliye hum
+    sirf fit ke dauran badhi hui memory (peak - baseline) report karte hain
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    return _proc_status_mb('VmRSS')
+
+
+def _fit_memory_mb(baseline):
+    """Fit ke dauran is process ki extra peak memory (MB)"""
+    peak = _proc_status_mb('VmHWM')
+    if baseline is None or peak is None:
+        # /proc nahi hai (non-Linux) - poora peak RSS hi de dete hain
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return peak - baseline
+
+
+def _fit_subforest(args):
+    """Ek contiguous shard [start, stop) par sub-forest train karta hai"""
+    start, stop, n_estimators, seed, forest_params = args
+    baseline = _start_memory_probe()
+    X_shard = np.asarray(_WORKER_DATA['X'][start:stop])
+    y_shard = np.asarray(_WORKER_DATA['y'][start:stop])
+
+    began = time.perf_counter()
+    forest = RandomForestClassifier(n_estimators=n_estimators, random_state=seed, **forest_params)
+    forest.fit(X_shard, y_shard)
+    return forest, {'rows': stop - start, 'fit_s': time.perf_counter() - began,
+                    'fit_memory_mb': _fit_memory_mb(baseline)}
+
+
+def shard_ranges(n_rows, n_shards):
+    """Rows ko n_shards contiguous ranges mein baant-ta hai"""
+    bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def merge_forests(forests):
+    """
+    Sub-forests ko ek forest mein jodta hai - sabke classes_ same hone chahiye
+    """
+    base = forests[0]
+    for forest in forests[1:]:
+        if not np.array_equal(forest.classes_, base.classes_):
+            raise ValueError("Sub-forests have different classes_ - every shard must contain every class")
+        if forest.n_features_in_ != base.n_features_in_:
+            raise ValueError("Sub-forests were trained on different feature counts")
+
+    base.estimators_ = [tree for forest in forests for tree in forest.estimators_]
+    base.n_estimators = len(base.estimators_)
+    return base
+
+
+def fit_sharded_forest(X_train, y_train, n_shards=4, n_estimators=100, n_workers=None,
+                       random_state=42, **forest_params):
+    """
+    Disjoint contiguous shards par sub-forests parallel train karke merge karta hai
+
+    X_train shuffled hona chahiye (train_test_split aur shard_dataset dono shuffled dete hain),
+    taaki har shard mein saari crops aayein. Har worker sirf apna shard padhta hai, isliye
+    memmap input par per-process memory shard size par depend karti hai.
+    Returns (model, stats)
+    """
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    ranges = shard_ranges(len(y_train), n_shards)
+    all_classes = np.unique(y_train)
+    for start, stop in ranges:
+        if len(np.unique(y_train[start:stop])) != len(all_classes):
+            raise ValueError("A shard is missing some classes - shuffle X_train/y_train or use fewer shards")
+
+    # Trees aur seeds shards mein baante - SeedSequence se har shard ka independent seed
+    trees = np.full(n_shards, n_estimators // n_shards)
+    trees[:n_estimators % n_shards] += 1
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(random_state).spawn(n_shards)]
+    jobs = [(start, stop, int(n_trees), seed, forest_params)
+            for (start, stop), n_trees, seed in zip(ranges, trees, seeds)]
+
+    began = time.perf_counter()
+    n_workers = n_workers or n_shards
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=_pool_context(),
+                             initializer=_init_worker, initargs=(X_train, y_train)) as executor:
+        outputs = list(executor.map(_fit_subforest, jobs))
+    wall_time = time.perf_counter() - began
+
+    model = merge_forests([forest for forest, _ in outputs])
+    stats = {'wall_s': wall_time, 'shards': [shard_stats for _, shard_stats in outputs]}
+    return model, stats
+
+
+def _fit_monolithic(args):
+    """Benchmark ke liye - poora X_train ek process mein"""
+    n_estimators, random_state, X_test, y_test = args
+    baseline = _start_memory_probe()
+    X, y = np.asarray(_WORKER_DATA['X']), np.asarray(_WORKER_DATA['y'])
+    began = time.perf_counter()
+    forest = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state).fit(X, y)
+    return time.perf_counter() - began, _fit_memory_mb(baseline), forest.score(X_test, y_test)
+
+
+def benchmark(X_train, y_train, X_test, y_test, n_shards=4, n_estimators=100):
+    """Monolithic fit vs sharded fit - wall time aur per-process fit memory"""
+    # Monolithic bhi alag (forked) process mein, taaki memory fair compare ho
+    began = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=_pool_context(),
+                             initializer=_init_worker, initargs=(X_train, y_train)) as executor:
+        _, mono_memory, mono_accuracy = executor.submit(
+            _fit_monolithic, (n_estimators, 42, X_test, y_test)).result()
+    mono_wall = time.perf_counter() - began
+
+    sharded, stats = fit_sharded_forest(X_train, y_train, n_shards=n_shards, n_estimators=n_estimators)
+    sharded_memory = max(shard['fit_memory_mb'] for shard in stats['shards'])
+
+    print(f"{'mode':>10} {'wall (s)':>9} {'fit memory/process (MB)':>24} {'accuracy':>9}")
+    print(f"{'monolith':>10} {mono_wall:9.2f} {mono_memory:24.0f} {mono_accuracy:9.4f}")
+    print(f"{'sharded':>10} {stats['wall_s']:9.2f} {sharded_memory:24.0f} {sharded.score(X_test, y_test):9.4f}")
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import pandas as pd
+    from shard_dataset import write_shards
+
+    crop_df = pd.read_csv('crop_database.csv')
+    with tempfile.TemporaryDirectory() as out_dir:
+        dataset = write_shards(crop_df, out_dir, samples_per_crop=25000, chunk_size=5000)
+        train_ranges, test_ranges = dataset.split(test_size=0.2)
+        X_train, y_train = dataset.materialize(train_ranges, os.path.join(out_dir, 'train'))
+        X_test, y_test = dataset.materialize(test_ranges, os.path.join(out_dir, 'test'))
+        benchmark(X_train, y_train, np.asarray(X_test), np.asarray(y_test), n_shards=4, n_estimators=40)
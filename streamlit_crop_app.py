@@ -2,12 +2,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from model_artifact import load_model_components, artifact_stamp
+from prediction_cache import PredictionCache
+from prediction_store import SharedPredictionStore
+from raster_map import lookup_location
+from field_index import FieldRecordStore
+from feature_engineering import season_from_month, soil_type_from_nutrients, SEASON_NAMES, SOIL_TYPE_NAMES
+
 # Page configuration
 st.set_page_config(
     page_title="Smart Crop Recommendation System",
@@ -47,42 +53,37 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_model():
-    """Load the pre-trained model and components"""
+@st.cache_resource(max_entries=1)
+def _load_model(stamp):
+    """Load the model artifact (lazy) - ek hi object saare reruns/sessions share karte hain, jab tak stamp same"""
     try:
-        with open('crop_recommendation_model.pkl', 'rb') as f:
-            components = pickle.load(f)
-        return components
+        return load_model_components()
     except FileNotFoundError:
-        st.error("Model file not found. Please ensure 'crop_recommendation_model.pkl' is available.")
+        st.error("Model not found. Please ensure 'crop_recommendation_model/' or "
+                 "'crop_recommendation_model.pkl' is available.")
         return None
 
-def get_season_from_month(month):
-    """Convert month to season"""
-    if month in [6, 7, 8, 9]:
-        return 1, "Kharif (Monsoon)"
-    elif month in [10, 11, 12, 1]:
-        return 2, "Rabi (Winter)"
-    elif month in [3, 4, 5]:
-        return 3, "Zaid (Summer)"
-    else:
-        return 2, "Rabi (Winter)"
-
-def determine_soil_type(soil_ph, nitrogen, phosphorus, potassium):
-    """Determine soil type based on nutrient content"""
-    soil_types = {1: "Sandy", 2: "Loamy", 3: "Clay", 4: "Alluvial", 5: "Black"}
-
-    if nitrogen > 150 and phosphorus > 80 and potassium > 100:
-        return 4, soil_types[4]
-    elif nitrogen > 100 and phosphorus > 60:
-        return 5, soil_types[5]
-    elif nitrogen < 80 and phosphorus < 40:
-        return 1, soil_types[1]
-    elif soil_ph > 7.0:
-        return 3, soil_types[3]
-    else:
-        return 2, soil_types[2]
+def load_model():
+    """
+    Har rerun par artifact ka stamp dekhte hain - retrain ke baad naya artifact (naya version) load hota hai,
+    aur prediction cache version change dekh ke khud khali ho jata hai; app restart ki zaroorat nahi
+    """
+    return _load_model(artifact_stamp())
+
+@st.cache_resource
+def load_prediction_cache():
+    """
+    Saare sessions ka shared prediction cache - slider values quantization grid par hi hain
+    Local miss par saare server processes ka on-disk store (restart ke baad bhi garam)
+    """
+    return PredictionCache(store=SharedPredictionStore())
+
+@st.cache_resource
+def load_field_records():
+    """Location ke saath score hue fields (saare server processes ka shared store) - spatial index per process"""
+    return FieldRecordStore()
+
+NEARBY_RADIUS_KM = 5
 
 def create_radar_chart(soil_params):
     """Create radar chart for soil analysis"""
@@ -131,8 +132,6 @@ def main():
     if components is None:
         st.stop()
 
-    model = components['model']
-    crop_db = components['crop_database']
     accuracy = components['accuracy']
 
     # Sidebar for input parameters
@@ -160,38 +159,54 @@ def main():
 
     # Additional location input (optional)
     st.sidebar.subheader("📍 Location (Optional)")
-    latitude = st.sidebar.number_input("Latitude", value=26.8467, help="Optional: For future enhancements")
-    longitude = st.sidebar.number_input("Longitude", value=80.9462, help="Optional: For future enhancements")
+    # Location tabhi use hoti hai jab user khud de - default coordinates par record/lookup nahi
+    use_location = st.sidebar.checkbox("My field's location is known",
+                                       help="Records this analysis with the location, shows what was recommended "
+                                            "for nearby fields and looks up the regional suitability map")
+    latitude = longitude = None
+    if use_location:
+        latitude = st.sidebar.number_input("Latitude", min_value=-90.0, max_value=90.0, value=26.8467)
+        longitude = st.sidebar.number_input("Longitude", min_value=-180.0, max_value=180.0, value=80.9462)
 
     # Analysis button
     if st.sidebar.button("🔍 Analyze & Recommend", type="primary"):
         # Determine season and soil type
-        season_num, season_name = get_season_from_month(month)
-        soil_type_num, soil_type_name = determine_soil_type(soil_ph, nitrogen, phosphorus, potassium)
-
-        # Prepare input data
-        input_data = np.array([[
-            soil_ph, temperature, rainfall, nitrogen, phosphorus, 
-            potassium, humidity, month, season_num, soil_type_num
-        ]])
-
-        # Get predictions
-        probabilities = model.predict_proba(input_data)[0]
-        crop_names = model.classes_
-
-        # Create recommendations
-        recommendations = []
-        for i, crop in enumerate(crop_names):
-            crop_info = crop_db[crop_db['crop_name'] == crop]
-            if not crop_info.empty:
-                crop_info = crop_info.iloc[0]
-                recommendations.append({
-                    'crop': crop,
-                    'confidence': probabilities[i],
-                    'suitability_score': probabilities[i] * 100,
-                    'expected_yield': crop_info['expected_yield'],
-                    'crop_duration': crop_info['crop_duration']
-                })
+        season_num = season_from_month(month)
+        season_name = SEASON_NAMES[season_num]
+        soil_type_num = soil_type_from_nutrients(soil_ph, nitrogen, phosphorus, potassium)
+        soil_type_name = SOIL_TYPE_NAMES[soil_type_num]
+
+        # Get predictions - cache miss par hi model chalta hai; engine aur crop table pehle button press par load
+        field = [soil_ph, temperature, rainfall, nitrogen, phosphorus, potassium, humidity, month]
+        probabilities = load_prediction_cache().predict_proba(components, field)[0]
+        crop_index = components['crop_index']
+
+        # Aas-paas ke pehle score hue fields (doosre processes ke naye records refresh se), phir ye field record -
+        # same location aur inputs dobara submit hon to ek hi record
+        nearby = regional = None
+        if use_location:
+            field_records = load_field_records()
+            field_records.refresh()
+            nearby = field_records.near(latitude, longitude, NEARBY_RADIUS_KM)
+            ranked = np.argsort(-probabilities, kind='stable')[:8]
+            field_records.add(components.version, [latitude], [longitude], [field], [ranked],
+                              [probabilities[ranked]],
+                              sources=[f"{components.version}:{latitude:.5f},{longitude:.5f}:" +
+                                       ','.join(map(str, field))])
+            regional = lookup_location(latitude, longitude)
+
+        # Create recommendations - metadata class order mein aligned hai, ek fancy-index join
+        classes = np.flatnonzero(crop_index.known)
+        info = crop_index.take(classes)
+        recommendations = [{
+            'crop': crop,
+            'confidence': confidence,
+            'suitability_score': confidence * 100,
+            'expected_yield': expected_yield,
+            'crop_duration': crop_duration
+        } for crop, confidence, expected_yield, crop_duration in zip(
+            crop_index.crop_names[classes], probabilities[classes].tolist(),
+            info['expected_yield'].tolist(), info['crop_duration'].tolist())]
 
         # Sort by confidence
         recommendations = sorted(recommendations, key=lambda x: x['confidence'], reverse=True)
@@ -251,6 +266,20 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
 
+            # Regional map (gridded soil/weather data) mein is location ka top crop
+            if regional is not None:
+                crop, score, map_month = regional
+                st.caption(f"📍 Regional suitability map ({datetime(2023, map_month, 1):%B} planting): "
+                           f"{crop.replace('_', ' ').title()} at {score:.0%} for this location")
+
+            # Aas-paas ke fields ko kya recommend hua tha
+            if nearby is not None and len(nearby['id']):
+                counts = np.bincount(nearby['crop'], minlength=len(crop_index.crop_names))
+                common = [crop_index.crop_names[i].replace('_', ' ').title() for i in np.argsort(-counts)[:3]
+                          if counts[i]]
+                st.caption(f"🗺️ {len(nearby['id'])} fields scored within {NEARBY_RADIUS_KM} km "
+                           f"(nearest {nearby['distance_km'][0]:.1f} km away); most recommended: {', '.join(common)}")
+
         # Detailed analysis
         st.subheader("📈 Detailed Analysis")
 
@@ -277,9 +306,14 @@ def main():
         with info_col1:
             st.metric("Model Accuracy", f"{accuracy:.1%}")
         with info_col2:
-            st.metric("Crops in Database", len(crop_db))
+            st.metric("Crops in Database", len(components['crop_database']))
         with info_col3:
             st.metric("Features Used", "10")
+        cache_stats = load_prediction_cache().stats()
+        st.caption(f"Prediction cache: {cache_stats['hit_rate']:.0%} hit rate "
+                   f"({cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                   f"{cache_stats['evictions']} evictions, {cache_stats['size']}/{cache_stats['maxsize']} entries); "
+                   f"shared store: {cache_stats['shared']['hits']} hits, {cache_stats['shared']['size']} entries")
 
         # Recommendations and tips
         st.subheader("💡 Agricultural Tips")
@@ -0,0 +1,121 @@
+# Suitability Analysis - Crop Recommendation System
+# Har field ke har parameter ko har crop ki (min, max) range se ek broadcasted pass mein compare karte hain:
+# (fields x crops x params) in-range mask aur deviation tensor. "Soil pH (6.5) is optimal" jaise strings
+# sirf un (field, crop) pairs ke liye bante hain jo UI sach mein dikhata hai.
+
+import numpy as np
+
+from crop_metadata import RANGE_COLUMNS
+
+SUITABILITY_PARAMS = list(RANGE_COLUMNS)
+
+# UI factors - (param, in-range text, out-of-range text); purane _analyze_suitability wale hi 5 factors
+FACTOR_TEMPLATES = [
+    ('soil_ph', "Soil pH ({value:.1f}) is optimal", "Soil pH ({value:.1f}) needs adjustment"),
+    ('temperature', "Temperature ({value}°C) is suitable", "Temperature ({value}°C) may be challenging"),
+    ('rainfall', "Rainfall ({value}mm) is adequate", "Rainfall ({value}mm) may need irrigation/drainage"),
+    ('nitrogen', "Nitrogen levels are good", "Nitrogen levels need adjustment"),
+    ('month', "Good planting time", "Consider different planting time"),
+]
+
+
+def suitability_tensor(values, low, high):
+    """
+    values: (fields x params), low/high: (crops x params) ya (fields x crops x params)
+    Returns (in_range, deviation) - dono (fields x crops x params):
+      in_range  - low <= value <= high
+      deviation - range se bahar kitna: negative = min se neeche, positive = max se upar, 0 = andar
+    """
+    values = np.asarray(values, dtype=np.float64)[:, None, :]
+    in_range = (low <= values) & (values <= high)
+    deviation = np.minimum(values - low, 0) + np.maximum(values - high, 0)
+    return in_range, deviation
+
+
+class SuitabilityReport:
+    """
+    Fields x crops suitability - tensors turant, text lazily (factors())
+    crop_idx: None = saari crops (crop_index order), ya (fields x k) class indices (jaise top-k)
+    display_values: rendering ke liye original inputs (jaise user ke int/float) - default values
+    """
+
+    def __init__(self, crop_index, values, crop_idx=None, display_values=None):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.display_values = display_values if display_values is not None else self.values
+        self.crop_idx = crop_idx
+        if crop_idx is None:
+            self.crop_names = crop_index.crop_names
+            low, high = crop_index.range_min, crop_index.range_max
+        else:
+            self.crop_names = crop_index.crop_names[crop_idx]
+            low, high = crop_index.range_min[crop_idx], crop_index.range_max[crop_idx]
+        self.in_range, self.deviation = suitability_tensor(self.values, low, high)
+        self.relative_deviation = self.deviation / np.maximum(high - low, 1e-9)
+
+    def params_in_range(self):
+        """(fields x crops) - kitne params range mein hain"""
+        return self.in_range.sum(axis=2)
+
+    def fully_suitable(self):
+        """(fields x crops) - saare params range mein"""
+        return self.in_range.all(axis=2)
+
+    def factors(self, field, crop):
+        """Ek (field, crop) pair ke UI strings - crop yahan crop axis ka position hai"""
+        row = self.display_values[field]
+        return [(ok if self.in_range[field, crop, SUITABILITY_PARAMS.index(param)] else bad)
+                .format(value=row[SUITABILITY_PARAMS.index(param)])
+                for param, ok, bad in FACTOR_TEMPLATES]
+
+
+if __name__ == "__main__":
+    import time
+    import pandas as pd
+    from crop_metadata import CropMetadataIndex
+    from synthetic_data import random_fields
+
+    # Purana scalar version (script_4 ka _analyze_suitability) - equivalence check ke liye
+    def legacy_analyze(soil_ph, temperature, rainfall, nitrogen, phosphorus, potassium, humidity, month, crop_info):
+        factors = []
+        factors.append(f"Soil pH ({soil_ph:.1f}) is optimal" if crop_info['soil_ph_min'] <= soil_ph <= crop_info['soil_ph_max']
+                       else f"Soil pH ({soil_ph:.1f}) needs adjustment")
+        factors.append(f"Temperature ({temperature}°C) is suitable" if crop_info['temp_min'] <= temperature <= crop_info['temp_max']
+                       else f"Temperature ({temperature}°C) may be challenging")
+        factors.append(f"Rainfall ({rainfall}mm) is adequate" if crop_info['rainfall_min'] <= rainfall <= crop_info['rainfall_max']
+                       else f"Rainfall ({rainfall}mm) may need irrigation/drainage")
+        factors.append("Nitrogen levels are good" if crop_info['nitrogen_min'] <= nitrogen <= crop_info['nitrogen_max']
+                       else "Nitrogen levels need adjustment")
+        factors.append("Good planting time" if crop_info['plant_month_start'] <= month <= crop_info['plant_month_end']
+                       else "Consider different planting time")
+        return factors
+
+    crop_df = pd.read_csv('crop_database.csv')
+    index = CropMetadataIndex(crop_df, crop_df['crop_name'].to_numpy())
+
+    rng = np.random.default_rng(0)
+    n_fields = 100_000
+    fields = random_fields(rng, n_fields)
+
+    start = time.perf_counter()
+    report = SuitabilityReport(index, fields)
+    vectorized = time.perf_counter() - start
+    print(f"{n_fields:,} fields x {len(index)} crops x {len(SUITABILITY_PARAMS)} params: {vectorized * 1000:.0f} ms "
+          f"(best crop has {report.params_in_range().max(axis=1).mean():.1f} params in range on average)")
+
+    # Purana loop - har field x har crop (Series rows ke saath), kuch fields par extrapolate
+    rows = [crop_df.iloc[i] for i in range(len(crop_df))]
+    n_loop = 200
+    start = time.perf_counter()
+    for field in fields[:n_loop].tolist():
+        for crop_info in rows:
+            legacy_analyze(*field, crop_info)
+    loop = (time.perf_counter() - start) * n_fields / n_loop
+    print(f"Scalar loop: ~{loop:.0f} s (extrapolated from {n_loop} fields)")
+
+    # Strings wahi hone chahiye
+    display = [[float(v) if i == 0 else int(v) for i, v in enumerate(field)] for field in fields[:500].tolist()]
+    small = SuitabilityReport(index, fields[:500], display_values=display)
+    for f in range(500):
+        for c in range(len(index)):
+            assert small.factors(f, c) == legacy_analyze(*display[f], rows[c]), (f, c)
+    print("✅ Rendered factors match the old _analyze_suitability on 500 fields x 20 crops")
@@ -0,0 +1,321 @@
+# Synthetic Training Data Generator - Crop Recommendation System
+# Har crop ka poora sample block ek hi baar mein draw hota hai - no per-sample Python loop!
+
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+FEATURE_NAMES = ['soil_ph', 'temperature', 'rainfall', 'nitrogen', 'phosphorus',
+                 'potassium', 'humidity', 'month', 'season', 'soil_type']
+
+# Compact representation: continuous -> float32, categorical -> int8, labels -> int16 codes
+CONTINUOUS_FEATURES = FEATURE_NAMES[:7]
+CATEGORICAL_FEATURES = FEATURE_NAMES[7:]
+LABEL_DTYPE = np.int16
+
+# Continuous features: (crop_database column prefix, noise sigma, clip margin)
+# Ye wahi numbers hain jo purane loop mein hard-coded the
+CONTINUOUS_SPECS = [
+    ('soil_ph', 0.3, 0.5),
+    ('temp', 3, 5),
+    ('rainfall', 100, 200),
+    ('nitrogen', 10, 20),
+    ('phosphorus', 5, 10),
+    ('potassium', 5, 10),
+    ('humidity', 5, 10),
+]
+
+
+def crop_parameter_arrays(crop_df):
+    """
+    Crop table se (crops x params) arrays banata hai - means, sigmas aur clip bounds
+    """
+    mins = crop_df[[f'{prefix}_min' for prefix, _, _ in CONTINUOUS_SPECS]].to_numpy(dtype=np.float64)
+    maxs = crop_df[[f'{prefix}_max' for prefix, _, _ in CONTINUOUS_SPECS]].to_numpy(dtype=np.float64)
+    sigmas = np.array([sigma for _, sigma, _ in CONTINUOUS_SPECS], dtype=np.float64)
+    margins = np.array([margin for _, _, margin in CONTINUOUS_SPECS], dtype=np.float64)
+
+    return {
+        'mean': (mins + maxs) / 2,
+        'sigma': sigmas,
+        'low': mins - margins,
+        'high': maxs + margins,
+        'month_start': crop_df['plant_month_start'].to_numpy(dtype=np.int64),
+        'month_end': crop_df['plant_month_end'].to_numpy(dtype=np.int64),
+        'season': crop_df['season'].to_numpy(dtype=np.float64),
+        'soil_type': crop_df['soil_type'].to_numpy(dtype=np.float64),
+        'crop_name': crop_df['crop_name'].to_numpy(),
+    }
+
+
+def generate_crop_block(rng, params, crop_idx, n_samples):
+    """
+    Ek crop ke n_samples rows ek saath generate karta hai (n_samples x 10 array)
+    """
+    n_cont = len(CONTINUOUS_SPECS)
+    block = np.empty((n_samples, len(FEATURE_NAMES)), dtype=np.float64)
+
+    # Saare continuous features ek hi normal draw mein, phir clip
+    cont = rng.normal(params['mean'][crop_idx], params['sigma'], size=(n_samples, n_cont))
+    np.clip(cont, params['low'][crop_idx], params['high'][crop_idx], out=block[:, :n_cont])
+
+    # Month - planting window ke andar uniformly
+    block[:, n_cont] = rng.integers(params['month_start'][crop_idx],
+                                    params['month_end'][crop_idx] + 1, size=n_samples)
+    block[:, n_cont + 1] = params['season'][crop_idx]
+    block[:, n_cont + 2] = params['soil_type'][crop_idx]
+    return block
+
+
+def plan_tasks(n_crops, samples_per_crop, chunk_size=None):
+    """
+    Generation ko (crop, chunk) tasks mein todta hai - order hamesha fixed rehta hai
+    Returns list of (crop_idx, row_offset, n_samples)
+    """
+    chunk_size = chunk_size or samples_per_crop
+    tasks = []
+    for crop_idx in range(n_crops):
+        for start in range(0, samples_per_crop, chunk_size):
+            n_samples = min(chunk_size, samples_per_crop - start)
+            tasks.append((crop_idx, crop_idx * samples_per_crop + start, n_samples))
+    return tasks
+
+
+def _run_task(args):
+    """Worker process mein ek (crop, chunk) block banata hai apni child stream se"""
+    params, child_seed, crop_idx, n_samples = args
+    rng = np.random.default_rng(child_seed)
+    return generate_crop_block(rng, params, crop_idx, n_samples)
+
+
+def _pool_context():
+    """Fork available ho to wahi use karo - training script ko child mein dobara import nahi karna padta"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _generate_matrix(crop_df, params, samples_per_crop, seed, n_workers, chunk_size, dtype):
+    """Saare (crop, chunk) tasks chala ke (n_rows x 10) feature matrix bharta hai"""
+    n_crops = len(crop_df)
+    tasks = plan_tasks(n_crops, samples_per_crop, chunk_size)
+    child_seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    jobs = [(params, child_seed, crop_idx, n_samples)
+            for child_seed, (crop_idx, _, n_samples) in zip(child_seeds, tasks)]
+
+    X = np.empty((n_crops * samples_per_crop, len(FEATURE_NAMES)), dtype=dtype)
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=_pool_context()) as executor:
+            # executor.map results ko submission order mein hi deta hai - shards fixed order mein judte hain
+            blocks = executor.map(_run_task, jobs, chunksize=max(1, len(jobs) // (4 * n_workers)))
+            for (_, offset, n_samples), block in zip(tasks, blocks):
+                X[offset:offset + n_samples] = block
+    else:
+        for job, (_, offset, n_samples) in zip(jobs, tasks):
+            X[offset:offset + n_samples] = _run_task(job)
+    return X
+
+
+def generate_synthetic_data(crop_df, samples_per_crop=300, seed=42, n_workers=1, chunk_size=None):
+    """
+    Har crop ke liye realistic synthetic data banata hai (vectorized version)
+    Same distribution as the old loop, lekin deterministic np.random.Generator se
+
+    Har (crop, chunk) task ko SeedSequence(seed).spawn() se apni independent stream milti hai,
+    isliye output bit-for-bit same rehta hai chahe n_workers kitne bhi ho.
+    Note: chunk_size badalne se streams badal jaati hain (aur output bhi).
+    """
+    params = crop_parameter_arrays(crop_df)
+    X = _generate_matrix(crop_df, params, samples_per_crop, seed, n_workers, chunk_size, np.float64)
+    y = np.repeat(params['crop_name'], samples_per_crop)
+    return X, y
+
+
+def make_compact_frame(X):
+    """
+    Feature matrix ko compact DataFrame mein badalta hai - float32 continuous, int8 categorical
+    """
+    columns = {}
+    for i, name in enumerate(FEATURE_NAMES):
+        dtype = np.float32 if name in CONTINUOUS_FEATURES else np.int8
+        columns[name] = X[:, i].astype(dtype, copy=False)
+    return pd.DataFrame(columns)
+
+
+def generate_compact_data(crop_df, samples_per_crop=300, seed=42, n_workers=1, chunk_size=None):
+    """
+    generate_synthetic_data jaisa hi data, lekin compact dtypes mein
+    Returns (features DataFrame, int16 label codes, class_names) - code i = class_names[i]
+    """
+    params = crop_parameter_arrays(crop_df)
+    X = _generate_matrix(crop_df, params, samples_per_crop, seed, n_workers, chunk_size, np.float32)
+    codes = np.repeat(np.arange(len(crop_df), dtype=LABEL_DTYPE), samples_per_crop)
+    return make_compact_frame(X), codes, crop_df['crop_name'].tolist()
+
+
+def decode_labels(codes, class_names):
+    """int16 label codes ko wapas crop names mein badalta hai"""
+    return np.asarray(class_names)[np.asarray(codes)]
+
+
+# Benchmarks ke liye request traffic (FIELD_COLUMNS order) - service, cache aur store sab isi se
+# generate karte hain taaki unke numbers same traffic par compare ho sakein
+DEFAULT_FIELD = [6.5, 25, 800, 120, 60, 60, 70, 7]
+FIELD_RANGES = [(4, 9), (5, 45), (100, 3000), (0, 300), (0, 200), (0, 250), (30, 100), (1, 12)]
+
+
+def random_fields(rng, n, on_grid=True):
+    """
+    n x 8 fields, Streamlit slider ranges mein uniform
+    on_grid: pH 0.1 steps aur baaki integers (slider values); False = free-form floats (month integer hi)
+    """
+    columns = []
+    for i, (low, high) in enumerate(FIELD_RANGES):
+        if i == 0 and on_grid:
+            columns.append(rng.uniform(low, high, n).round(1))
+        elif on_grid or i == len(FIELD_RANGES) - 1:
+            columns.append(rng.integers(low, high + 1, n))
+        else:
+            columns.append(rng.uniform(low, high, n))
+    return np.column_stack(columns).astype(np.float64)
+
+
+def slider_requests(rng, n, steps):
+    """Streamlit jaisa traffic - user DEFAULT_FIELD se shuru karke 0-3 sliders kuch grid steps hilata hai"""
+    n_columns = len(DEFAULT_FIELD)
+    n_moved = rng.choice(4, size=n, p=[0.3, 0.35, 0.25, 0.1])
+    moved = rng.random((n, n_columns)).argsort(axis=1) < n_moved[:, None]
+    offsets = rng.integers(-6, 7, (n, n_columns))
+    requests = np.array(DEFAULT_FIELD, dtype=np.float64) + np.where(moved, offsets, 0) * np.asarray(steps)
+    requests[:, 7] = np.clip(requests[:, 7], 1, 12)
+    return requests
+
+
+def per_call_us(func, items):
+    """func(item) har item par ek-ek karke - microseconds per call"""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def generate_synthetic_data_loop(crop_df, samples_per_crop=300):
+    """
+    Purana per-sample loop - sirf benchmark aur distribution comparison ke liye rakha hai
+    """
+    data = []
+    labels = []
+
+    for idx, crop in crop_df.iterrows():
+        for _ in range(samples_per_crop):
+            row = []
+            for prefix, sigma, margin in CONTINUOUS_SPECS:
+                low, high = crop[f'{prefix}_min'], crop[f'{prefix}_max']
+                value = np.random.normal((low + high)/2, sigma)
+                row.append(np.clip(value, low - margin, high + margin))
+
+            month = np.random.randint(crop['plant_month_start'], crop['plant_month_end']+1)
+            data.append(row + [month, crop['season'], crop['soil_type']])
+            labels.append(crop['crop_name'])
+
+    return np.array(data), np.array(labels)
+
+
+def benchmark(crop_df, sizes=(300, 3000, 50000), loop_limit=3000):
+    """Vectorized generator vs purana loop - timing aur per-feature mean/std comparison"""
+    print("⏱️ Synthetic data generation benchmark")
+    print(f"{'samples/crop':>14} {'rows':>10} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>9}")
+
+    for samples_per_crop in sizes:
+        start = time.perf_counter()
+        X_vec, _ = generate_synthetic_data(crop_df, samples_per_crop=samples_per_crop, seed=42)
+        vec_time = time.perf_counter() - start
+
+        if samples_per_crop <= loop_limit:
+            np.random.seed(42)
+            start = time.perf_counter()
+            generate_synthetic_data_loop(crop_df, samples_per_crop=samples_per_crop)
+            loop_time = time.perf_counter() - start
+            speedup = f"{loop_time / vec_time:8.1f}x"
+            loop_str = f"{loop_time:10.3f}"
+        else:
+            loop_str, speedup = f"{'skipped':>10}", f"{'-':>9}"
+
+        print(f"{samples_per_crop:>14} {len(X_vec):>10} {loop_str} {vec_time:15.3f} {speedup}")
+
+    # Distribution check - smallest size par dono generators compare karte hain
+    X_loop, _ = generate_synthetic_data_loop(crop_df, samples_per_crop=min(sizes[0], loop_limit))
+    X_vec, _ = generate_synthetic_data(crop_df, samples_per_crop=min(sizes[0], loop_limit), seed=42)
+    comparison = pd.DataFrame({
+        'loop_mean': X_loop.mean(axis=0), 'vec_mean': X_vec.mean(axis=0),
+        'loop_std': X_loop.std(axis=0), 'vec_std': X_vec.std(axis=0),
+    }, index=FEATURE_NAMES)
+    print("\n📊 Distribution comparison (all crops pooled):")
+    print(comparison.round(3))
+
+
+def benchmark_workers(crop_df, samples_per_crop=50000, chunk_size=10000, max_workers=None):
+    """1..N workers ke saath scaling efficiency report karta hai aur reproducibility check karta hai"""
+    max_workers = max_workers or multiprocessing.cpu_count()
+    n_rows = len(crop_df) * samples_per_crop
+    print(f"\n⚙️ Process-pool scaling ({n_rows:,} rows, chunk_size={chunk_size})")
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>9} {'efficiency':>11} {'identical':>10}")
+
+    reference, base_time = None, None
+    for n_workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        X, _ = generate_synthetic_data(crop_df, samples_per_crop=samples_per_crop, seed=42,
+                                       n_workers=n_workers, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference, base_time = X, elapsed
+        speedup = base_time / elapsed
+        identical = np.array_equal(X, reference)
+        print(f"{n_workers:>8} {elapsed:10.3f} {speedup:8.2f}x {speedup / n_workers:10.0%} {str(identical):>10}")
+
+
+def benchmark_compact(crop_df, sizes=(300, 30000, 300000), fit_limit=600000):
+    """
+    Purana float64 + string labels layout vs compact dtypes - memory, split time aur RF fit time
+    Default sizes = 6k, 600k aur 6M rows (20 crops). fit_limit se bade sets par fit skip hota hai.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.ensemble import RandomForestClassifier
+
+    print("\n🗜️ Compact dtypes comparison")
+    print(f"{'rows':>10} {'layout':>8} {'memory (MB)':>12} {'split (s)':>10} {'RF fit (s)':>11}")
+
+    for samples_per_crop in sizes:
+        X, y = generate_synthetic_data(crop_df, samples_per_crop=samples_per_crop, seed=42)
+        legacy_df = pd.DataFrame(X, columns=FEATURE_NAMES)
+        legacy_df['crop'] = y
+        del X, y
+
+        compact_df, codes, _ = generate_compact_data(crop_df, samples_per_crop=samples_per_crop, seed=42)
+        compact_df['crop'] = codes
+
+        for layout, frame in (('float64', legacy_df), ('compact', compact_df)):
+            memory = frame.memory_usage(deep=True).sum() / 1e6
+            start = time.perf_counter()
+            X_train, _, y_train, _ = train_test_split(frame.drop('crop', axis=1), frame['crop'], test_size=0.2,
+                                                      random_state=42, stratify=frame['crop'])
+            split_time = time.perf_counter() - start
+
+            fit_str = f"{'skipped':>11}"
+            if len(frame) <= fit_limit:
+                start = time.perf_counter()
+                RandomForestClassifier(n_estimators=20, random_state=42, n_jobs=-1).fit(X_train, y_train)
+                fit_str = f"{time.perf_counter() - start:11.2f}"
+
+            print(f"{len(frame):>10} {layout:>8} {memory:12.1f} {split_time:10.3f} {fit_str}")
+        del legacy_df, compact_df
+
+
+if __name__ == "__main__":
+    crop_df = pd.read_csv('crop_database.csv')
+    benchmark(crop_df)
+    benchmark_workers(crop_df)
+    benchmark_compact(crop_df)
@@ -0,0 +1,116 @@
+# Pre-fork Worker Pool - Crop Recommendation System
+# GIL ki wajah se ek process mein tree traversal ek hi core par chalta hai, aur N processes mein
+# artifact alag-alag load karna memory N guna kar deta hai. Yahan parent ek baar model load karta hai,
+# phir workers fork hote hain - forest arrays (mmap), generated predictor ka bytecode aur crop index
+# copy-on-write pages mein sabke saath share rehte hain. Service ka dispatcher har micro-batch ko jo
+# worker free ho use deta hai (multiprocessing.Pool ki shared task queue).
+
+import gc
+import asyncio
+import multiprocessing
+
+# Fork se pehle parent isme engine rakhta hai - workers ko ye global inherit hota hai, pickle nahi hota
+_WORKER_ENGINE = None
+
+
+def _recommend_in_worker(requests):
+    return _WORKER_ENGINE.recommend(requests)
+
+
+def _load_worker_engine(loaded):
+    """Spawn mode (fork na ho jaise Windows/macOS default) - har worker apna artifact load karta hai"""
+    global _WORKER_ENGINE
+    from model_artifact import load_model_components
+    from recommendation_service import RecommendationEngine
+    _WORKER_ENGINE = RecommendationEngine(load_model_components())
+    _WORKER_ENGINE.warm_up()
+    loaded.release()
+
+
+def fork_available():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+class WorkerPool:
+    """
+    n_workers model processes; run(requests) asyncio se await hota hai
+    share_model=True: engine parent mein load (aur warm) hona chahiye - fork ke baad pages shared
+    share_model=False: spawn, har worker apna artifact load karta hai (memory comparison / non-fork platforms)
+    Pool event loop shuru hone se pehle banana chahiye - chalte threads ke saath fork safe nahi
+    """
+
+    def __init__(self, engine, n_workers, share_model=True):
+        global _WORKER_ENGINE
+        self.size = n_workers
+        self.share_model = share_model and fork_available()
+        if self.share_model:
+            _WORKER_ENGINE = engine
+            # Parent ke saare objects GC ki permanent generation mein - warna workers ka GC un par
+            # refcount/flags likh ke shared pages copy kar deta hai
+            gc.collect()
+            gc.freeze()
+            self._pool = multiprocessing.get_context('fork').Pool(n_workers)
+        else:
+            context = multiprocessing.get_context('spawn')
+            loaded = context.Semaphore(0)
+            self._pool = context.Pool(n_workers, initializer=_load_worker_engine, initargs=(loaded,))
+            # Saare workers ka model load hone tak ruko - warna pehle requests load time mein phanste hain
+            for _ in range(n_workers):
+                loaded.acquire()
+
+    async def run(self, requests, timeout=None):
+        """
+        Ek batch kisi free worker par; timeout (seconds) mein result na aaye to asyncio.TimeoutError
+        Worker process mar jaye (OOM kill, segfault) to Pool na callback deta na error_callback - bina
+        timeout ke ye await hamesha atka rehta
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def deliver(setter, value):
+            if not future.done():
+                setter(value)
+
+        # Callbacks pool ke result-handler thread mein aate hain - loop par wapas bhejte hain
+        self._pool.apply_async(
+            _recommend_in_worker, (requests,),
+            callback=lambda result: loop.call_soon_threadsafe(deliver, future.set_result, result),
+            error_callback=lambda error: loop.call_soon_threadsafe(deliver, future.set_exception, error))
+        return await asyncio.wait_for(future, timeout)
+
+    def pids(self):
+        return [process.pid for process in self._pool._pool]
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+        if self.share_model:
+            gc.unfreeze()
+
+
+def process_memory(pid):
+    """
+    Linux /proc/<pid>/smaps_rollup se (kB): rss, pss (shared pages processes mein baante hue)
+    aur private (sirf is process ke) - doosre platforms par None
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            # Pehli line mapping ka header hai, baaki "Name:   123 kB"
+            fields = dict(line.split(':', 1) for line in f.read().splitlines()[1:])
+    except OSError:
+        return None
+    value = lambda name: int(fields.get(name, '0 kB').split()[0])
+    return {'rss': value('Rss'), 'pss': value('Pss'),
+            'private': value('Private_Clean') + value('Private_Dirty')}
+
+
+def pool_memory(pids):
+    """Parent + workers ka total (kB) - rss shared pages ko har process mein ginta hai, pss nahi"""
+    totals = {'rss': 0, 'pss': 0, 'private': 0}
+    for pid in pids:
+        memory = process_memory(pid)
+        if memory is None:
+            return None
+        for name in totals:
+            totals[name] += memory[name]
+    return totals